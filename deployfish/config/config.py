@@ -1,5 +1,7 @@
+import json
 import os
 import sys
+import tempfile
 from copy import deepcopy
 from typing import Any, Literal, cast
 
@@ -9,12 +11,14 @@ except ImportError:
     from typing import Final  # type: ignore
 import boto3
 import click
-import yaml
 
+from deployfish import get_version
+from deployfish.core.utils import file_digest, load_config_file
 from deployfish.exceptions import (
     ConfigProcessingFailed,
     NoSuchConfigSection,
     NoSuchConfigSectionItem,
+    StaleCompiledConfig,
 )
 
 from .processors import ConfigProcessor
@@ -43,6 +47,13 @@ class Config:
         raw_config: if, supplied, use this as our config data instead of loading
             if from ``filename``
 
+    Interpolation is done either eagerly, over the whole config, when the
+    ``Config`` is built by :py:meth:`new`, or lazily (``Config.new(lazy=True)``),
+    one item at a time, the first time each item is asked for by
+    :py:meth:`get_section_item` or :py:meth:`get_section`.  In lazy mode,
+    :py:meth:`interpolate` will interpolate everything that's left, for things
+    like validation that need the whole config.
+
     """
 
     class NoSuchSectionError(NoSuchConfigSection):
@@ -51,9 +62,15 @@ class Config:
     class NoSuchSectionItemError(NoSuchConfigSectionItem):
         pass
 
+    class StaleCompiledConfigError(StaleCompiledConfig):
+        pass
+
     #: The default name of our config file
     DEFAULT_DEPLOYFISH_CONFIG_FILE: Final[str] = "deployfish.yml"
 
+    #: Bump this whenever the format of compiled configs changes
+    COMPILED_CONFIG_VERSION: Final[int] = 1
+
     #: The list of sections in our config file that will be processed
     #: by our :py:class:`deployfish.config.processors.ConfigProcessor`
     processable_sections: list[str] = [
@@ -70,15 +87,75 @@ class Config:
         if filename is None:
             filename = cls.DEFAULT_DEPLOYFISH_CONFIG_FILE
         config = cls(filename=filename, raw_config=kwargs.pop("raw_config", None))
+        lazy = kwargs.pop("lazy", False)
         if kwargs.pop("interpolate", True):
             try:
                 processor = ConfigProcessor(config, kwargs)
-                processor.process()
+                if lazy:
+                    # Set up the processors now so that we report problems
+                    # with our context (e.g. a missing env_file) right away
+                    processor.get_processors()
+                    config.processor = processor
+                else:
+                    processor.process()
             except ConfigProcessingFailed as e:
                 click.secho(str(e))
                 sys.exit(1)
         return config
 
+    @classmethod
+    def load_compiled(cls, compiled_filename: str, **kwargs) -> "Config":
+        """
+        Load a config compiled by :py:meth:`write_compiled`, without parsing
+        YAML, reading env files, downloading Terraform state or interpolating
+        anything, after checking that it's still up to date.
+
+        The compiled config is up to date if ``deployfish.yml`` is byte for
+        byte the same, each ``env_file`` is too, and each Terraform state file
+        is still at the same version (S3 ``ETag`` or Terraform Enterprise
+        ``serial``).  Checking the state files costs a ``HeadObject`` per S3
+        state file, or one API call for Terraform Enterprise.
+
+        Args:
+            compiled_filename: the path to the compiled config
+
+        Keyword Args:
+            filename: the path to our ``deployfish.yml``
+            **kwargs: the same context that :py:meth:`new` takes, e.g. ``env_file``
+
+        Raises:
+            Config.StaleCompiledConfigError: the compiled config can't be used
+
+        Returns:
+            The fully interpolated config.
+
+        """
+        filename: str = kwargs.pop("filename", None) or cls.DEFAULT_DEPLOYFISH_CONFIG_FILE
+        for key in ("lazy", "interpolate", "raw_config"):
+            kwargs.pop(key, None)
+        try:
+            with open(compiled_filename, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise cls.StaleCompiledConfigError(f"Could not read compiled config {compiled_filename}: {e}")
+        if not isinstance(data, dict) or data.get("version") != cls.COMPILED_CONFIG_VERSION:
+            raise cls.StaleCompiledConfigError(f"{compiled_filename} is not a compiled config we understand")
+        if data["filename"] != os.path.abspath(filename):
+            raise cls.StaleCompiledConfigError(f"{compiled_filename} was compiled from {data['filename']}")
+        if data["fingerprints"]["config"] != file_digest(filename):
+            raise cls.StaleCompiledConfigError(f"{filename} has changed since {compiled_filename} was compiled")
+        config = cls(filename=filename, raw_config=data["raw"])
+        config.__cooked = data["cooked"]
+        try:
+            fresh = ConfigProcessor(config, kwargs).check_fingerprints(data["fingerprints"]["processors"])
+        except ConfigProcessingFailed:
+            fresh = False
+        if not fresh:
+            raise cls.StaleCompiledConfigError(
+                f"The env files or Terraform state used by {compiled_filename} have changed"
+            )
+        return config
+
     @classmethod
     def add_processable_section(cls, section_name: str) -> None:
         """
@@ -103,6 +180,12 @@ class Config:
         self.filename: str = filename
         self.__raw: dict[str, Any] = raw_config if raw_config else self.load_config(filename)
         self.__cooked: dict[str, Any] = deepcopy(self.__raw)
+        #: If set, we interpolate items lazily with this processor
+        self.processor: ConfigProcessor | None = None
+        #: The ``(section name, id(item))`` of the items we've lazily interpolated
+        self.__interpolated: set[tuple[str, int]] = set()
+        #: Our section indexes; see :py:meth:`get_section_index`
+        self.__indexes: dict[tuple[str, str], tuple[list[dict[str, Any]], int, dict[str, int]]] = {}
 
     @property
     def raw(self) -> dict[str, Any]:
@@ -124,15 +207,143 @@ class Config:
 
     @property
     def tasks(self) -> list[dict[str, Any]]:
-        return self.cooked.get("tasks", [])
+        return self.get_section("tasks") if "tasks" in self.cooked else []
 
     @property
     def services(self) -> list[dict[str, Any]]:
-        return self.cooked.get("services", [])
+        return self.get_section("services") if "services" in self.cooked else []
+
+    def interpolate_item(self, section_name: str, item: dict[str, Any]) -> dict[str, Any]:
+        """
+        If we're interpolating lazily, interpolate ``item`` from the section
+        named ``section_name`` in place, unless we already have.
+
+        Args:
+            section_name: the name of the section ``item`` is from
+            item: an item from :py:attr:`cooked`
+
+        Raises:
+            ConfigProcessingFailed: interpolation failed
+
+        Returns:
+            ``item``
+
+        """
+        if self.processor is None or section_name not in self.processable_sections:
+            return item
+        key = (section_name, id(item))
+        if key not in self.__interpolated:
+            # Mark the item first: processors may ask us for this same item
+            # while they're working on it
+            self.__interpolated.add(key)
+            try:
+                self.processor.process_item(section_name, item)
+            except Exception:
+                self.__interpolated.discard(key)
+                raise
+        return item
+
+    def interpolate(self) -> None:
+        """
+        Interpolate any items we haven't yet interpolated.  Use this when you
+        need the whole config to be interpolated, e.g. to validate it.
+
+        Raises:
+            ConfigProcessingFailed: interpolation failed
+
+        """
+        self.prefetch([
+            (section_name, item)
+            for section_name in self.processable_sections
+            for item in self.cooked.get(section_name, [])
+        ])
+        for section_name in self.processable_sections:
+            for item in self.cooked.get(section_name, []):
+                self.interpolate_item(section_name, item)
+
+    def compile(self) -> dict[str, Any]:
+        """
+        Interpolate everything, and return our fully cooked config along with
+        fingerprints of everything it was built from: ``deployfish.yml``
+        itself, any env files, and the versions of any Terraform state files.
+
+        This only works on configs built with ``Config.new(lazy=True)``, since
+        we need the processor to ask it for its fingerprints.
+
+        Raises:
+            ConfigProcessingFailed: interpolation failed, or we're not lazy
+
+        Returns:
+            A JSON serializable dict for :py:meth:`load_compiled`.
+
+        """
+        if self.processor is None:
+            raise ConfigProcessingFailed("Only configs loaded with Config.new(lazy=True) can be compiled")
+        self.interpolate()
+        return {
+            "version": self.COMPILED_CONFIG_VERSION,
+            "deployfish": get_version(),
+            "filename": os.path.abspath(self.filename),
+            "fingerprints": {
+                "config": file_digest(self.filename),
+                "processors": self.processor.get_fingerprints(),
+            },
+            "raw": self.raw,
+            "cooked": self.cooked,
+        }
+
+    def write_compiled(self, compiled_filename: str) -> None:
+        """
+        Write the output of :py:meth:`compile` to ``compiled_filename`` as JSON.
+
+        .. warning::
+
+            The file holds fully interpolated values, including ``${env.*}``
+            and Terraform derived values, which are often secrets.  It is
+            created readable only by its owner; keep it out of version control.
+
+        Args:
+            compiled_filename: the path to write to
+
+        Raises:
+            ConfigProcessingFailed: interpolation failed, or we're not lazy
+
+        """
+        data = self.compile()
+        directory = os.path.dirname(os.path.abspath(compiled_filename))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, compiled_filename)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def prefetch(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        """
+        If we're interpolating lazily, let our processors fetch whatever they
+        need to interpolate ``items`` all at once, before we interpolate them
+        one by one.  Items we've already interpolated are ignored.
+
+        Args:
+            items: a list of ``(section_name, item)`` tuples
+        """
+        if self.processor is None:
+            return
+        items = [
+            (section_name, item) for section_name, item in items
+            if (section_name, id(item)) not in self.__interpolated
+        ]
+        if len(items) > 1:
+            self.processor.prefetch(items)
 
     def load_config(self, filename: str) -> dict[str, Any]:
         """
         Read our deployfish.yml file from disk and return it as parsed YAML.
+        The file is parsed once per process and shared with
+        :py:meth:`deployfish.core.aws.AWSSessionBuilder.load_config`; see
+        :py:func:`deployfish.core.utils.load_config_file`.
 
         Args:
             filename: the path to our deployfish.yml file
@@ -147,8 +358,7 @@ class Config:
             raise ConfigProcessingFailed(
                 f"Deployfish config file '{filename}' exists but is not readable"
             )
-        with open(filename, encoding="utf-8") as f:
-            return yaml.load(f, Loader=yaml.FullLoader)
+        return load_config_file(filename)
 
     def get_service(self, service_name: str) -> dict[str, Any]:
         """
@@ -184,7 +394,60 @@ class Config:
             The post-interpolation contents of the section named ``section_name``.
 
         """
-        return self.cooked[section_name]
+        section = self.cooked[section_name]
+        if self.processor is not None and section_name in self.processable_sections:
+            self.prefetch([(section_name, item) for item in section])
+            for item in section:
+                self.interpolate_item(section_name, item)
+        return section
+
+    def get_section_for_lookup(
+        self,
+        section_name: str,
+        keys: tuple[str, ...] = ("name", "environment")
+    ) -> list[dict[str, Any]]:
+        """
+        Return the contents of a whole top level section from our
+        deployfish.yml file, like :py:meth:`get_section`, but when we're
+        interpolating lazily, interpolate only the items whose ``keys`` need
+        interpolation.  Use this when you only need to look items up by those
+        keys; interpolate any item you actually use with
+        :py:meth:`interpolate_item`.
+
+        Args:
+            section_name: The name of the top level section to retrieve
+
+        Keyword Args:
+            keys: the keys of each item we need to be interpolated
+
+        Returns:
+            The contents of the section named ``section_name``, or an empty
+            list if there is no such section.
+
+        """
+        self.__interpolate_keys(section_name, keys)
+        return self.cooked.get(section_name, [])
+
+    def __interpolate_keys(self, section_name: str, keys: tuple[str, ...]) -> bool:
+        """
+        Interpolate the items in the section named ``section_name`` whose
+        ``keys`` still have variables in them.
+
+        Returns:
+            ``True`` if we interpolated anything.
+
+        """
+        if self.processor is None or section_name not in self.processable_sections:
+            return False
+        items = [
+            item for item in self.cooked.get(section_name, [])
+            if (section_name, id(item)) not in self.__interpolated
+            and any("${" in str(item.get(key, "")) for key in keys)
+        ]
+        self.prefetch([(section_name, item) for item in items])
+        for item in items:
+            self.interpolate_item(section_name, item)
+        return bool(items)
 
     def get_section_item(self, section_name: str, item_name: str) -> dict[str, Any]:
         """
@@ -214,15 +477,7 @@ class Config:
             ``section_name`` from the post-interpolation version of the config.
 
         """
-        if section_name in self.cooked:
-            for item in self.cooked[section_name]:
-                if item["name"] == item_name:
-                    return item
-                if "environment" in item and item["environment"] == item_name:
-                    return item
-        else:
-            raise self.NoSuchSectionError(section_name)
-        raise self.NoSuchSectionItemError(section_name, item_name)
+        return self.interpolate_item(section_name, self.__find_item("cooked", section_name, item_name))
 
     def get_raw_section_item(self, section_name: str, item_name: str) -> dict[str, Any]:
         """
@@ -252,15 +507,82 @@ class Config:
             ``section_name`` from the pre-interpolation version of the config.
 
         """
-        if section_name in self.raw:
-            for item in self.raw[section_name]:
-                if item["name"] == item_name:
-                    return item
-                if "environment" in item and item["environment"] == item_name:
-                    return item
-        else:
+        return self.__find_item("raw", section_name, item_name)
+
+    def get_section_index(self, section_name: str, source: Literal["cooked", "raw"] = "cooked") -> dict[str, int]:
+        """
+        Return an index of the section named ``section_name`` that maps both
+        the ``name`` and the ``environment`` of each item to that item's
+        position in the section.  As with a scan of the section, the first
+        item with a matching ``name`` or ``environment`` wins.
+
+        The index is built once, and rebuilt if the section is replaced or
+        changes length; call :py:meth:`invalidate_indexes` after changing the
+        ``name`` or ``environment`` of an item in place.
+
+        Args:
+            section_name: The name of the top level section to index
+
+        Keyword Args:
+            source: ``cooked`` to index :py:attr:`cooked`, ``raw`` to index
+                :py:attr:`raw`
+
+        Raises:
+            KeyError: no section named ``section_name`` exists in the config.
+
+        Returns:
+            A dict mapping item names and environments to positions in the section.
+
+        """
+        section = self.cooked[section_name] if source == "cooked" else self.raw[section_name]
+        cached = self.__indexes.get((source, section_name))
+        if cached is None or cached[0] is not section or cached[1] != len(section):
+            index: dict[str, int] = {}
+            for i, item in enumerate(section):
+                index.setdefault(item["name"], i)
+                if "environment" in item:
+                    index.setdefault(item["environment"], i)
+            cached = (section, len(section), index)
+            self.__indexes[(source, section_name)] = cached
+        return cached[2]
+
+    def invalidate_indexes(self) -> None:
+        """
+        Throw away our section indexes, so that they get rebuilt on next use.
+        """
+        self.__indexes.clear()
+
+    def __find_item(self, source: Literal["cooked", "raw"], section_name: str, item_name: str) -> dict[str, Any]:
+        data = self.cooked if source == "cooked" else self.raw
+        if section_name not in data:
             raise self.NoSuchSectionError(section_name)
-        raise self.NoSuchSectionItemError(section_name, item_name)
+        item = self.__lookup_item(source, section_name, item_name)
+        if item is None and source == "cooked" and self.__interpolate_keys(section_name, ("name", "environment")):
+            # We're interpolating lazily, and the item we want may be one
+            # whose name or environment we hadn't interpolated yet
+            self.__indexes.pop((source, section_name), None)
+            item = self.__lookup_item(source, section_name, item_name)
+        if item is None:
+            raise self.NoSuchSectionItemError(section_name, item_name)
+        return item
+
+    def __lookup_item(
+        self,
+        source: Literal["cooked", "raw"],
+        section_name: str,
+        item_name: str
+    ) -> dict[str, Any] | None:
+        section = self.cooked[section_name] if source == "cooked" else self.raw[section_name]
+        for _ in range(2):
+            i = self.get_section_index(section_name, source=source).get(item_name)
+            if i is not None:
+                item = section[i]
+                if item["name"] == item_name or ("environment" in item and item["environment"] == item_name):
+                    return item
+            # Either there's no such item, or an item was changed in place
+            # since we built our index.  Rebuild it and look once more.
+            self.__indexes.pop((source, section_name), None)
+        return None
 
     def get_global_config(self, section: str) -> dict[str, Any]:
         if "deployfish" in self.cooked:
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Type
+import re
+from typing import TYPE_CHECKING, Any
 
 from deployfish.exceptions import ConfigProcessingFailed, SkipConfigProcessing
 
@@ -11,6 +12,26 @@ if TYPE_CHECKING:
 
 
 class ConfigProcessor:
+    """
+    Run each of our registered processors over the items in our
+    ``deployfish.yml``, in registration order.
+
+    Rather than have each processor walk each item separately, we walk each
+    item once: consecutive processors that declare a
+    :py:attr:`AbstractConfigProcessor.PATTERN` are fused into a single
+    compiled pattern, so a string that no processor cares about costs us one
+    regex search.  Strings that do match are handed to each processor in turn,
+    so that the result is the same as if the processors had run one after
+    another: a terraform output that contains ``${env.FOO}`` still gets
+    ``${env.FOO}`` replaced, but an environment value containing
+    ``${terraform.foo}`` does not get looked up in terraform.
+
+    Args:
+        config: the :py:class:`deployfish.config.Config` object we're working
+            with
+        context: a dict of additional data that our processors might use
+
+    """
 
     class ProcessingFailed(ConfigProcessingFailed):
         pass
@@ -24,17 +45,228 @@ class ConfigProcessor:
     def __init__(self, config: "Config", context: dict[str, Any]):
         self.config = config
         self.context = context
+        self.processors: list[AbstractConfigProcessor] | None = None
+        self.segments: list[tuple[re.Pattern | None, list[tuple[AbstractConfigProcessor, str]]]] | None = None
+
+    def get_processors(self) -> list[AbstractConfigProcessor]:
+        """
+        Instantiate each of our processor classes, skipping any that don't
+        apply to our config, and return them.  We only do this once.
+
+        Raises:
+            ConfigProcessor.ProcessingFailed: a processor could not be set up
+
+        Returns:
+            The list of processors, in the order they should run.
+
+        """
+        if self.processors is None:
+            processors = []
+            for processor_class in self.processor_classes:
+                try:
+                    processors.append(processor_class(self.config, self.context))
+                except SkipConfigProcessing:
+                    continue
+                except ConfigProcessingFailed as e:
+                    raise self.ProcessingFailed(str(e))
+            self.processors = processors
+        return self.processors
+
+    def get_segments(self) -> list[tuple[re.Pattern | None, list[tuple[AbstractConfigProcessor, str]]]]:
+        """
+        Group our processors into the stages of our single pass over each item.
+
+        Each segment is a tuple of ``(pattern, stages)``.  For a run of
+        consecutive processors that have a
+        :py:attr:`AbstractConfigProcessor.PATTERN`, ``pattern`` is a combined
+        pattern with one named group per processor, and ``stages`` is the list
+        of ``(processor, group name)`` pairs.  Processors without a ``PATTERN``
+        get a segment to themselves, with ``pattern`` set to ``None``.
+
+        Returns:
+            The list of segments, in the order they should run.
+
+        """
+        if self.segments is None:
+            segments: list[tuple[re.Pattern | None, list[tuple[AbstractConfigProcessor, str]]]] = []
+            fusable: list[AbstractConfigProcessor] = []
+
+            def fuse() -> None:
+                if fusable:
+                    stages = [(processor, f"_s{i}") for i, processor in enumerate(fusable)]
+                    # Our per-processor groups are the only named groups in the
+                    # combined pattern; each processor re-matches with its own
+                    # PATTERN to get its own groups back.
+                    alternatives = [
+                        "(?P<{}>{})".format(
+                            group,
+                            re.sub(r"\(\?P<\w+>", "(?:", processor.PATTERN.pattern)  # type: ignore[union-attr]
+                        )
+                        for processor, group in stages
+                    ]
+                    segments.append((re.compile("|".join(alternatives)), stages))
+                    fusable.clear()
+
+            for processor in self.get_processors():
+                if processor.PATTERN is not None:
+                    fusable.append(processor)
+                else:
+                    fuse()
+                    segments.append((None, [(processor, "")]))
+            fuse()
+            self.segments = segments
+        return self.segments
+
+    def __walk(
+        self,
+        pattern: re.Pattern,
+        stages: list[tuple[AbstractConfigProcessor, str]],
+        obj: Any,
+        key: str | int,
+        value: Any,
+        section_name: str,
+        item_name: str
+    ) -> None:
+        """
+        Do the replacements for the fused ``stages`` on ``value``, the value of
+        ``obj[key]``, recursing into lists and dicts.
+
+        Args:
+            pattern: the combined pattern for ``stages``
+            stages: the ``(processor, group name)`` pairs for ``pattern``
+            obj: a value from an item from a ``deployfish.yml``
+            key: the name of the key (if ``obj`` is a dict) or index (if ``obj``
+                is a list``) in ``obj``
+            value: the value of ``obj[key]``
+            section_name: the section name ``obj`` came from
+            item_name: the name of the item in ``section_name`` that ``obj``
+                came from
+
+        """
+        if isinstance(value, dict):
+            for k, v in list(value.items()):
+                self.__walk(pattern, stages, value, k, v, section_name, item_name)
+        elif isinstance(value, (list, tuple)):
+            for i, v in enumerate(value):
+                self.__walk(pattern, stages, value, i, v, section_name, item_name)
+        elif isinstance(value, str) and pattern.search(value):
+            for i, (processor, group) in enumerate(stages):
+                value = processor.substitute(pattern, group, obj, value, section_name, item_name)
+                if not isinstance(value, str):
+                    # A processor replaced our string with a structure; the
+                    # later processors should walk it, as they would have had
+                    # they run separately
+                    for later, _ in stages[i + 1:]:
+                        later.process_value(obj, key, value, section_name, item_name)
+                    break
+            obj[key] = value
+
+    def process_item(self, section_name: str, item: dict[str, Any]) -> None:
+        """
+        Run all our processors, in order, over just ``item`` from the section
+        named ``section_name``.  This is what
+        :py:meth:`deployfish.config.Config.get_section_item` uses to interpolate
+        items on demand.
+
+        The keys that processors derive their replacements from (see
+        :py:attr:`AbstractConfigProcessor.ITEM_KEYS`) are processed by each
+        processor in turn first; then we make one pass over the rest of
+        ``item`` per segment from :py:meth:`get_segments`.
+
+        Args:
+            section_name: the name of the section ``item`` is from
+            item: the item to process, in place
+
+        Raises:
+            ConfigProcessor.ProcessingFailed: something went wrong
+
+        """
+        processors = self.get_processors()
+        item_keys = {key for processor in processors for key in processor.ITEM_KEYS if key in item}
+        try:
+            raw_name = item["name"]
+            for processor in processors:
+                # Each processor keys its replacements by the item's name as it
+                # was when it extracted them
+                item_name = item["name"]
+                processor.extract_item_replacements(section_name, item)
+                for key in item_keys:
+                    processor.process_value(item, key, item[key], section_name, item_name)
+            if item["name"] != raw_name:
+                # The name itself was interpolated: key everyone's replacements
+                # by the final name for the rest of the item
+                for processor in processors:
+                    processor.extract_item_replacements(section_name, item)
+            for pattern, stages in self.get_segments():
+                for key, value in list(item.items()):
+                    if key in item_keys:
+                        continue
+                    if pattern is None:
+                        stages[0][0].process_value(item, key, value, section_name, item["name"])
+                    else:
+                        self.__walk(pattern, stages, item, key, value, section_name, item["name"])
+        except ConfigProcessingFailed as e:
+            raise self.ProcessingFailed(str(e))
+
+    def prefetch(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        """
+        Give each of our processors the chance to fetch, all at once, any remote
+        data it will need to process ``items``.
+
+        Args:
+            items: a list of ``(section_name, item)`` tuples we're about to
+                process
+        """
+        for processor in self.get_processors():
+            processor.prefetch(items)
+
+    def get_fingerprints(self) -> dict[str, Any]:
+        """
+        Return the fingerprints of each of our processors' inputs; see
+        :py:meth:`AbstractConfigProcessor.get_fingerprints`.
+
+        Returns:
+            A dict of fingerprints, keyed by processor class name.
+
+        """
+        return {processor.__class__.__name__: processor.get_fingerprints() for processor in self.get_processors()}
+
+    def check_fingerprints(self, fingerprints: dict[str, Any]) -> bool:
+        """
+        Return ``True`` if ``fingerprints``, from :py:meth:`get_fingerprints`,
+        still describe our processors' inputs.
+
+        Args:
+            fingerprints: the fingerprints to check
+
+        Returns:
+            ``True`` if nothing has changed.
+
+        """
+        processors = {processor.__class__.__name__: processor for processor in self.get_processors()}
+        if set(processors) != set(fingerprints):
+            return False
+        return all(processors[name].check_fingerprints(fingerprints[name]) for name in processors)
 
     def process(self) -> None:
-        for processor_class in self.processor_classes:
-            try:
-                current_processor = processor_class(self.config, self.context)
-            except SkipConfigProcessing:
-                continue
-            try:
-                current_processor.process()
-            except ConfigProcessingFailed as e:
-                raise self.ProcessingFailed(str(e))
+        """
+        Run all our processors over every item in each of
+        :py:attr:`deployfish.config.Config.processable_sections`, in place in
+        :py:attr:`deployfish.config.Config.cooked`.
+
+        Raises:
+            ConfigProcessor.ProcessingFailed: something went wrong
+
+        """
+        cooked = self.config.cooked
+        self.prefetch([
+            (section_name, item)
+            for section_name in self.config.processable_sections
+            for item in cooked.get(section_name, [])
+        ])
+        for section_name in self.config.processable_sections:
+            for item in cooked.get(section_name, []):
+                self.process_item(section_name, item)
 
 
 ConfigProcessor.register(TerraformStateConfigProcessor)
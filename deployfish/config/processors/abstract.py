@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Any
+import re
+from typing import TYPE_CHECKING, Any, cast
 
 from deployfish.exceptions import ConfigProcessingFailed
 from deployfish.exceptions import SkipConfigProcessing as BaseSkipConfigProcessing
@@ -36,6 +37,17 @@ class AbstractConfigProcessor:
         "{cluster-name}"
     ]
 
+    #: If set, the pattern that matches the strings we replace.  Processors
+    #: that set this and implement :py:meth:`resolve` get the default
+    #: :py:meth:`replace`, and :py:class:`deployfish.config.processors.ConfigProcessor`
+    #: can fuse them with other such processors into a single pass over the config.
+    PATTERN: re.Pattern | None = None
+
+    #: The top level keys of an item that our replacements depend on.  These
+    #: get fully processed by each processor in turn before the rest of the
+    #: item; see :py:meth:`deployfish.config.processors.ConfigProcessor.process_item`.
+    ITEM_KEYS: tuple[str, ...] = ("name", "environment", "cluster")
+
     def __init__(self, config: "Config", context: dict[str, Any]):
         #: The :py:class:`deployfish.config.Config` we are processing
         self.config = config
@@ -55,15 +67,28 @@ class AbstractConfigProcessor:
             self.deployfish_lookups[section_name] = {}
             section = self.config.cooked.get(section_name, {})
             for item in section:
-                self.deployfish_lookups[section_name][item["name"]] = {}
-                self.deployfish_lookups[section_name][item["name"]]["{name}"] = item["name"]
-                if section_name == "services":
-                    self.deployfish_lookups[section_name][item["name"]]["{service-name}"] = item["name"]
-                if section_name == "tasks":
-                    self.deployfish_lookups[section_name][item["name"]]["{task-name}"] = item["name"]
-                self.deployfish_lookups[section_name][item["name"]]["{environment}"] = item.get("environment", "prod")
-                if "cluster" in item:
-                    self.deployfish_lookups[section_name][item["name"]]["{cluster-name}"] = item["cluster"]
+                self.extract_item_replacements(section_name, item)
+
+    def extract_item_replacements(self, section_name: str, item: dict[str, Any]) -> None:
+        """
+        Populate the :py:attr:`deployfish_lookups` entry for ``item`` in
+        section ``section_name`` from the current contents of ``item``.
+
+        Args:
+            section_name: the name of the top level section in ``deployfish.yml``
+            item: the item from ``section_name``
+
+        """
+        lookups = self.deployfish_lookups.setdefault(section_name, {})
+        lookups[item["name"]] = {}
+        lookups[item["name"]]["{name}"] = item["name"]
+        if section_name == "services":
+            lookups[item["name"]]["{service-name}"] = item["name"]
+        if section_name == "tasks":
+            lookups[item["name"]]["{task-name}"] = item["name"]
+        lookups[item["name"]]["{environment}"] = item.get("environment", "prod")
+        if "cluster" in item:
+            lookups[item["name"]]["{cluster-name}"] = item["cluster"]
 
     def get_deployfish_replacements(self, section_name: str, item_name: str) -> dict[str, str]:
         """
@@ -105,6 +130,122 @@ class AbstractConfigProcessor:
         """
         return self.deployfish_lookups[section_name][item_name]
 
+    def prefetch(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        """
+        Fetch, all at once, any remote data we will need to process ``items``,
+        so that processing them need not fetch it item by item.  By default we
+        do nothing.
+
+        This is purely an optimization: failures here should be ignored, and
+        left for :py:meth:`process_item` to report.
+
+        Args:
+            items: a list of ``(section_name, item)`` tuples we're about to
+                process
+        """
+
+    def get_fingerprints(self) -> dict[str, Any]:
+        """
+        Return fingerprints of the external inputs (files, remote state) that
+        our processing has depended on so far, so that a compiled config can
+        later tell whether it is stale.  By default we have none.
+
+        Returns:
+            A JSON serializable dict.
+
+        """
+        return {}
+
+    def check_fingerprints(self, fingerprints: dict[str, Any]) -> bool:
+        """
+        Return ``True`` if ``fingerprints``, from :py:meth:`get_fingerprints`
+        on the processor that compiled a config, still describe our inputs.
+
+        Args:
+            fingerprints: the fingerprints to check
+
+        Returns:
+            ``True`` if the inputs are unchanged.
+
+        """
+        return fingerprints == self.get_fingerprints()
+
+    def resolve(
+        self,
+        match: re.Match,
+        obj: list | dict,
+        section_name: str,
+        item_name: str
+    ) -> Any:
+        """
+        Return the value to replace ``match``, a match of :py:attr:`PATTERN`,
+        with.
+
+        Args:
+            match: the match to replace
+            obj: the list or dict whose value we matched
+            section_name: the section name ``obj`` came from
+            item_name: the name of the item in ``section_name`` that ``obj``
+                came from
+
+        Raises:
+            AbstractConfigProcessor.ProcessingFailed: we could not find a value
+
+        Returns:
+            The replacement.  If this is a list, tuple or dict, it replaces
+            the whole string value, not just the match.
+
+        """
+        raise NotImplementedError
+
+    def substitute(
+        self,
+        pattern: re.Pattern,
+        group: str | None,
+        obj: list | dict,
+        value: str,
+        section_name: str,
+        item_name: str
+    ) -> Any:
+        """
+        Replace every match of ours in ``value`` with its :py:meth:`resolve`
+        value, and return the result.
+
+        If any match resolves to a list, tuple or dict, that replaces all of
+        ``value`` instead.
+
+        Args:
+            pattern: the pattern to scan ``value`` with.  This is either our own
+                :py:attr:`PATTERN`, or a combined pattern in which our matches
+                are those for the named group ``group``.
+            group: the group in ``pattern`` for our matches, or ``None`` if
+                ``pattern`` is our :py:attr:`PATTERN`
+            obj: the list or dict ``value`` came from
+            value: the string to do replacements on
+            section_name: the section name ``obj`` came from
+            item_name: the name of the item in ``section_name`` that ``obj``
+                came from
+
+        Returns:
+            The new value.
+
+        """
+        structure: list[Any] = []
+
+        def replacement(m: re.Match) -> str:
+            if (group is not None and m.lastgroup != group) or structure:
+                return m.group(0)
+            if group is not None:
+                m = cast("re.Match", cast("re.Pattern", self.PATTERN).match(value, m.start()))
+            resolved = self.resolve(m, obj, section_name, item_name)
+            if isinstance(resolved, (list, tuple, dict)):
+                structure.append(resolved)
+                return m.group(0)
+            return str(resolved)
+
+        result = pattern.sub(replacement, value)
+        return structure[0] if structure else result
+
     def replace(
         self,
         obj: list | dict,
@@ -117,6 +258,9 @@ class AbstractConfigProcessor:
         Perform string replacements on ``value``, a string value in our
         ``deployfish.yml`` item.
 
+        By default, we replace every match of :py:attr:`PATTERN` in ``value``
+        with what :py:meth:`resolve` returns for it.
+
         Args:
             obj: a list or dict from an item from a ``deployfish.yml``
             key: the name of the key (if ``obj`` is a dict) or index (if ``obj``
@@ -127,7 +271,34 @@ class AbstractConfigProcessor:
                 came from
 
         """
-        raise NotImplementedError
+        if self.PATTERN is None:
+            raise NotImplementedError
+        if self.PATTERN.search(value):
+            obj[key] = self.substitute(self.PATTERN, None, obj, value, section_name, item_name)  # type: ignore[index]
+
+    def process_value(
+        self,
+        obj: Any,
+        key: str | int,
+        value: Any,
+        section_name: str,
+        item_name: str
+    ) -> None:
+        """
+        Process ``value``, the value of ``obj[key]``, doing our string
+        replacements on it and on anything nested inside it.
+
+        Args:
+            obj: a value from an item from a ``deployfish.yml``
+            key: the name of the key (if ``obj`` is a dict) or index (if ``obj``
+                is a list``) in ``obj``
+            value: the value of ``obj[key]``
+            section_name: the section name ``obj`` came from
+            item_name: the name of the item in ``section_name`` that ``obj``
+                came from
+
+        """
+        self.__process(obj, key, value, section_name, item_name)
 
     def __process(
         self,
@@ -195,6 +366,27 @@ class AbstractConfigProcessor:
         for key, value in list(obj.items()):
             self.__process(obj, key, value, section_name, item_name)
 
+    def process_item(self, section_name: str, item: dict[str, Any]) -> None:
+        """
+        Run our replacements on just ``item`` from the section named
+        ``section_name``.
+
+        We first refresh our :py:attr:`deployfish_lookups` for ``item``, so that
+        they reflect what any processors that ran before us did to it, just as
+        they would if we had been instantiated after those processors had
+        processed the whole config.
+
+        Args:
+            section_name: the name of the section ``item`` is from
+            item: the item to process, in place
+
+        Raises:
+            AbstractConfigProcessor.ProcessingFailed: something went wrong
+
+        """
+        self.extract_item_replacements(section_name, item)
+        self.__process_dict(item, section_name, item["name"])
+
     def process(self):
         """
         This is the method that :py:class:`ConfigProcessor` will execute as it
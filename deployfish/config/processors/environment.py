@@ -1,20 +1,117 @@
 import errno
+import hashlib
+import json
 import os
 import os.path
 import re
+import threading
 from typing import TYPE_CHECKING, Any
 
+from deployfish.core.utils import file_digest
+
 from .abstract import AbstractConfigProcessor
 
 if TYPE_CHECKING:
     from deployfish.config import Config
 
 
+# ------------------------
+# Env file cache
+# ------------------------
+
+class EnvFileCache:
+    """
+    A thread safe, process-wide cache of parsed ``env_file`` files, keyed by
+    absolute path, and invalidated when a file's mtime or size changes.
+
+    Many items in ``deployfish.yml`` often share the same ``env_file``; with
+    this cache we read and parse each file once no matter how many items or
+    :py:class:`EnvironmentConfigProcessor` instances use it.
+    """
+
+    def __init__(self) -> None:
+        self.loads: int = 0
+        self._files: dict[str, tuple[tuple[int, int], dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse(raw_lines: list[str]) -> dict[str, str]:
+        """
+        Parse the lines of an ``env_file`` into a dict.
+
+        Args:
+            raw_lines: the lines of the file
+
+        Returns:
+            The environment variables defined in the file.
+
+        """
+        # Strip the comments and empty lines
+        lines = [x.strip() for x in raw_lines if x.strip() and not x.strip().startswith("#")]
+        environment = {}
+        for line in lines:
+            # split on the first "="
+            parts = str.split(line, "=", 1)
+            if len(parts) == 2:
+                key = parts[0]
+                value = parts[1]
+                environment[key] = value
+        return environment
+
+    def get(self, filename: str, stat: os.stat_result) -> dict[str, str]:
+        """
+        Return the parsed contents of ``filename``.  The returned dict is shared,
+        so callers must not modify it.
+
+        Args:
+            filename: the path to the file
+            stat: the result of ``os.stat(filename)``
+
+        Raises:
+            OSError: we could not read the file
+
+        Returns:
+            The environment variables defined in the file.
+
+        """
+        path = os.path.abspath(filename)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if path in self._files and self._files[path][0] == key:
+                return self._files[path][1]
+        with open(path, encoding="utf-8") as f:
+            environment = self.parse(f.readlines())
+        with self._lock:
+            self._files[path] = (key, environment)
+            self.loads += 1
+        return environment
+
+    def clear(self) -> None:
+        """
+        Forget all the files we've parsed.
+        """
+        with self._lock:
+            self._files.clear()
+            self.loads = 0
+
+
+#: The process-wide cache of parsed ``env_file`` files
+env_file_cache = EnvFileCache()
+
+
+# ------------------------
+# Processor
+# ------------------------
+
 class EnvironmentConfigProcessor(AbstractConfigProcessor):
 
     ENVIRONMENT_RE = re.compile(r"\$\{env.(?P<key>[A-Za-z0-9-_]+)\}")
+    PATTERN = ENVIRONMENT_RE
+    ITEM_KEYS = (*AbstractConfigProcessor.ITEM_KEYS, "env_file")
 
     def __init__(self, config: "Config", context: dict[str, Any]):
+        #: The ``env_file`` for each item, by section name and item name
+        self.item_env_files: dict[str, dict[str, str | None]] = {}
         super().__init__(config, context)
         self.environ: dict[str, str] = {}
         self.per_item_environ: dict[str, Any] = {}
@@ -23,10 +120,33 @@ class EnvironmentConfigProcessor(AbstractConfigProcessor):
         if self.context.get("import_env"):
             self.environ.update(os.environ)
 
-    def _load_env_file(self, filename: str) -> dict[str, str]:
+    def extract_item_replacements(self, section_name: str, item: dict[str, Any]) -> None:
+        super().extract_item_replacements(section_name, item)
+        self.item_env_files.setdefault(section_name, {})[item["name"]] = item.get("env_file", None)
+
+    def get_fingerprints(self) -> dict[str, Any]:
+        filenames = {self.context.get("env_file")}
+        for section in self.item_env_files.values():
+            filenames.update(section.values())
+        fingerprints: dict[str, Any] = {
+            "ignore_missing_environment": bool(self.context.get("ignore_missing_environment", False)),
+            "env_files": {
+                os.path.abspath(filename): file_digest(filename)
+                for filename in sorted(f for f in filenames if f)
+            },
+        }
+        if self.context.get("import_env"):
+            fingerprints["environ"] = hashlib.sha256(
+                json.dumps(sorted(os.environ.items())).encode("utf-8")
+            ).hexdigest()
+        return fingerprints
+
+    def _load_env_file(self, filename: str | None) -> dict[str, str]:
         if not filename:
             return {}
-        if not os.path.exists(filename):
+        try:
+            stat = os.stat(filename)
+        except OSError:
             if not self.context.get("ignore_missing_environment", False):
                 raise self.ProcessingFailed(f'Environment file "{filename}" does not exist')
             return {}
@@ -35,53 +155,34 @@ class EnvironmentConfigProcessor(AbstractConfigProcessor):
                 raise self.ProcessingFailed(f'Environment file "{filename}" is not a regular file')
             return {}
         try:
-            with open(filename, encoding="utf-8") as f:
-                raw_lines = f.readlines()
+            return env_file_cache.get(filename, stat)
         except OSError as e:
             if e.errno == errno.EACCES:
                 if not self.context.get("ignore_missing_environment", False):
                     raise self.ProcessingFailed(f'Environment file "{filename}" is not readable')
                 return {}
-        # Strip the comments and empty lines
-        lines = [x.strip() for x in raw_lines if x.strip() and not x.strip().startswith("#")]
-        environment = {}
-        for line in lines:
-            # split on the first "="
-            parts = str.split(line, "=", 1)
-            if len(parts) == 2:
-                key = parts[0]
-                value = parts[1]
-                environment[key] = value
-        return environment
+            raise
 
     def load_per_item_environment(self, section_name: str, item_name: str) -> None:
         if section_name not in self.per_item_environ or item_name not in self.per_item_environ[section_name]:
-            filename = self.config.get_section_item(section_name, item_name).get("env_file", None)
-            if section_name not in self.per_item_environ:
-                self.per_item_environ[section_name] = {}
-            if item_name not in self.per_item_environ[section_name]:
-                self.per_item_environ[section_name][item_name] = {}
-            self.per_item_environ[section_name][item_name] = self._load_env_file(filename)
-
-    def replace(self, obj: Any, key: str | int, value: Any, section_name: str, item_name: str) -> None:
+            filename = self.item_env_files.get(section_name, {}).get(item_name, None)
+            self.per_item_environ.setdefault(section_name, {})[item_name] = self._load_env_file(filename)
+
+    def resolve(self, match: re.Match, obj: Any, section_name: str, item_name: str) -> str:
         self.load_per_item_environment(section_name, item_name)
         replacers = self.get_deployfish_replacements(section_name, item_name)
-        # FIXME: need to deal with multiple matches in the same line
-        m = self.ENVIRONMENT_RE.search(value)
-        if m:
-            envkey = m.group("key")
-            for replace_str, replace_value in list(replacers.items()):
-                envkey = envkey.replace(replace_str, replace_value)
-            envkey = envkey.upper().replace("-", "_")
+        envkey = match.group("key")
+        for replace_str, replace_value in list(replacers.items()):
+            envkey = envkey.replace(replace_str, replace_value)
+        envkey = envkey.upper().replace("-", "_")
+        try:
+            return self.per_item_environ[section_name][item_name][envkey]
+        except KeyError:
             try:
-                env_value = self.per_item_environ[section_name][item_name][envkey]
+                return self.environ[envkey]
             except KeyError:
-                try:
-                    env_value = self.environ[envkey]
-                except KeyError:
-                    if not self.context.get("ignore_missing_environment", False):
-                        raise self.ProcessingFailed(
-                            f'Config["{section_name}"]["{item_name}"]: Could not find value for ${{env.{envkey}}}'
-                        )
-                    env_value = "NOT-IN-ENVIRONMENT"
-            obj[key] = value.replace(m.group(0), env_value)
+                if not self.context.get("ignore_missing_environment", False):
+                    raise self.ProcessingFailed(
+                        f'Config["{section_name}"]["{item_name}"]: Could not find value for ${{env.{envkey}}}'
+                    )
+                return "NOT-IN-ENVIRONMENT"
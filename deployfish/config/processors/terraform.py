@@ -1,14 +1,22 @@
+import hashlib
 import json
 import os
 import os.path
 import re
-from typing import TYPE_CHECKING, Any, cast
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import IO, TYPE_CHECKING, Any, cast
 
 import boto3
 import botocore
 import requests
 
 from deployfish.core.aws import get_boto3_session
+from deployfish.core.utils import run_concurrently
+from deployfish.core.utils.config_files import config_cache_dir
+from deployfish.core.utils.json_stream import JSONStreamReader
 from deployfish.exceptions import (
     ConfigProcessingFailed,
     NoSuchTerraformStateFile,
@@ -21,6 +29,253 @@ if TYPE_CHECKING:
     from deployfish.config import Config
 
 
+# ------------------------
+# Outputs cache
+# ------------------------
+
+class TerraformOutputsCache:
+    """
+    A thread safe LRU cache of the outputs of Terraform state files, keyed by
+    the fully resolved URL of the state file.
+
+    A ``terraform.statefile`` with replacements in it (e.g.
+    ``s3://bucket/{environment}/terraform.tfstate``) resolves to a different
+    state file for different items in ``deployfish.yml``; with this cache, we
+    fetch and parse each of those at most once per process no matter how
+    interpolation interleaves the items.
+
+    Keyword Args:
+        maxsize: the maximum number of state files to keep outputs for
+
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._outputs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._versions: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        """
+        Return the cached outputs for the state file at ``url``, if any.
+
+        Args:
+            url: the resolved URL of the state file
+
+        Returns:
+            The outputs, or ``None`` if we don't have them.
+
+        """
+        with self._lock:
+            outputs = self._outputs.get(url)
+            if outputs is None:
+                self.misses += 1
+            else:
+                self._outputs.move_to_end(url)
+                self.hits += 1
+            return outputs
+
+    def version(self, url: str) -> str | None:
+        """
+        Return the version tag (S3 ``ETag`` or Terraform Enterprise ``serial``)
+        of the state file whose outputs we have cached for ``url``, if known.
+
+        Args:
+            url: the resolved URL of the state file
+
+        Returns:
+            The version, or ``None``.
+
+        """
+        with self._lock:
+            return self._versions.get(url)
+
+    def set(self, url: str, outputs: dict[str, Any], version: str | None = None) -> None:
+        """
+        Cache ``outputs`` as the outputs for the state file at ``url``,
+        evicting the least recently used state file if we're full.
+
+        Args:
+            url: the resolved URL of the state file
+            outputs: the outputs from that state file
+
+        Keyword Args:
+            version: the version tag of the state file, if known
+
+        """
+        with self._lock:
+            self._outputs[url] = outputs
+            self._versions[url] = version
+            self._outputs.move_to_end(url)
+            while len(self._outputs) > self.maxsize:
+                evicted, _ = self._outputs.popitem(last=False)
+                self._versions.pop(evicted, None)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._outputs
+
+    def clear(self) -> None:
+        """
+        Forget everything we've cached.
+        """
+        with self._lock:
+            self._outputs.clear()
+            self._versions.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+#: The process-wide cache of Terraform state file outputs
+terraform_outputs_cache = TerraformOutputsCache()
+
+
+# ------------------------
+# Disk cache
+# ------------------------
+
+class TerraformStateDiskCache:
+    """
+    An on-disk cache of the outputs of Terraform state files, so that we need
+    not download a whole state file every time ``deploy`` runs.
+
+    For each state file URL we store just the ``terraform_version`` and the
+    outputs from the state file, along with a version tag for the state file
+    (the S3 ``ETag`` or the Terraform Enterprise state version ``serial``) and
+    when we last checked it.  The cache lives in the ``terraform``
+    subdirectory of :py:func:`deployfish.core.utils.config_files.config_cache_dir`,
+    and is disabled along with it.
+
+    Normally we revalidate cached outputs with a conditional ``GetObject``
+    (``If-None-Match``) every time, which costs us an empty ``304 Not Modified``
+    response rather than the state file.  If ``$DEPLOYFISH_TERRAFORM_CACHE_TTL``
+    is set to a number of seconds, we instead use cached outputs younger than
+    that without asking S3 at all, which is useful when working offline.
+    """
+
+    #: Bump this whenever the format of our cache files changes
+    VERSION: int = 1
+
+    @property
+    def directory(self) -> str | None:
+        """
+        The directory our cache files live in, or ``None`` if we're disabled.
+        """
+        cache_dir = config_cache_dir()
+        if cache_dir is None:
+            return None
+        return os.path.join(cache_dir, "terraform")
+
+    @property
+    def ttl(self) -> float | None:
+        """
+        How many seconds to trust cached outputs without revalidating them, or
+        ``None`` to always revalidate.
+        """
+        try:
+            return float(os.environ["DEPLOYFISH_TERRAFORM_CACHE_TTL"])
+        except (KeyError, ValueError):
+            return None
+
+    def path(self, url: str) -> str | None:
+        """
+        Return the path to our cache file for ``url``, or ``None`` if we're
+        disabled.
+
+        Args:
+            url: the resolved URL of the state file
+
+        Returns:
+            The path to the cache file, or ``None``.
+
+        """
+        directory = self.directory
+        if directory is None:
+            return None
+        return os.path.join(directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def read(self, url: str) -> dict[str, Any] | None:
+        """
+        Return our cache entry for ``url``, if we have one.
+
+        The entry is a dict with keys ``url``, ``etag``, ``checked`` (the
+        ``time.time()`` when we last checked the state file in S3) and
+        ``state`` (the state file, minus everything but its
+        ``terraform_version`` and outputs).
+
+        Args:
+            url: the resolved URL of the state file
+
+        Returns:
+            The cache entry, or ``None``.
+
+        """
+        path = self.path(url)
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != self.VERSION or entry.get("url") != url:
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        """
+        Return ``True`` if we may use ``entry`` without revalidating it.
+
+        Args:
+            entry: a cache entry from :py:meth:`read`
+
+        Returns:
+            ``True`` if ``entry`` is younger than :py:attr:`ttl`.
+
+        """
+        ttl = self.ttl
+        return ttl is not None and time.time() - entry["checked"] < ttl
+
+    def write(self, url: str, etag: str, state: dict[str, Any]) -> None:
+        """
+        Cache ``state`` as the contents of the state file at ``url``, which
+        has S3 ETag ``etag``.
+
+        Args:
+            url: the resolved URL of the state file
+            etag: the S3 ``ETag`` of the state file
+            state: the ``terraform_version`` and outputs of the state file
+
+        """
+        path = self.path(url)
+        if path is None:
+            return
+        entry = {"version": self.VERSION, "url": url, "etag": etag, "checked": time.time(), "state": state}
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except Exception:  # noqa: BLE001,S110
+            # The cache is just an optimization; never fail a command over it
+            pass
+
+
+#: The process-wide on-disk cache of Terraform state file outputs
+terraform_state_disk_cache = TerraformStateDiskCache()
+
+
+# ------------------------
+# Terraform state
+# ------------------------
+
 class TerraformStateFactory:
 
     @staticmethod
@@ -43,10 +298,100 @@ class AbstractTerraformState:
         self.terraform_config: dict[str, Any] = terraform_config
         self.loaded: bool = False
         self.terraform_lookups: dict[str, dict[str, str]] = {}
+        #: The version tag (S3 ``ETag``, Terraform Enterprise ``serial``) of
+        #: each state file we've loaded outputs from, keyed by state file URL
+        self.versions: dict[str, str | None] = {}
+
+    @staticmethod
+    def read_state(stream: IO[bytes]) -> dict[str, Any]:
+        """
+        Read a Terraform state file from ``stream``, keeping only its
+        ``terraform_version`` and its root module outputs.
+
+        State files can be tens of megabytes, almost all of it resources we
+        don't care about, so rather than parse the whole thing we stream it
+        through :py:class:`deployfish.core.utils.json_stream.JSONStreamReader`,
+        materializing only the parts we need.  For Terraform 0.12+ state files,
+        whose ``outputs`` come before ``resources``, we stop reading as soon as
+        we have the outputs.
+
+        Args:
+            stream: a binary file-like object with the state file in it
+
+        Returns:
+            The state file, with everything but ``terraform_version`` and
+            ``outputs`` (or the ``path`` and ``outputs`` of the root module in
+            ``modules``, for pre-0.12 state files) left out.
+
+        """
+        reader = JSONStreamReader(stream)
+        state: dict[str, Any] = {}
+        for key in reader.iter_object():
+            if key in ("terraform_version", "outputs"):
+                state[key] = reader.read()
+                if "terraform_version" in state and "outputs" in state:
+                    break
+            elif key == "modules":
+                state["modules"] = []
+                for _ in reader.iter_array():
+                    module: dict[str, Any] = {}
+                    for module_key in reader.iter_object():
+                        if module_key in ("path", "outputs"):
+                            module[module_key] = reader.read()
+                        else:
+                            reader.skip()
+                    if module.get("path") == ["root"]:
+                        state["modules"].append(module)
+            else:
+                reader.skip()
+        return state
+
+    def get_outputs(self, tfstate: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return the root module outputs from ``tfstate``, a Terraform state
+        file.
+
+        Args:
+            tfstate: the Terraform state file, possibly as reduced by
+                :py:meth:`read_state`
+
+        Returns:
+            The outputs, keyed by output name.
+
+        """
+        major, minor, _ = tfstate["terraform_version"].split(".")
+        if int(major) >= 1 or (int(major) == 0 and int(minor) >= 12):
+            return self._load_post_version_12(tfstate)
+        return self._load_pre_version_12(tfstate)
+
+    def _load_pre_version_12(self, tfstate: dict[str, Any]) -> dict[str, Any]:
+        outputs: dict[str, Any] = {}
+        for i in tfstate["modules"]:
+            if i["path"] == ["root"]:
+                outputs.update(i["outputs"])
+        return outputs
+
+    def _load_post_version_12(self, tfstate: dict[str, Any]) -> dict[str, Any]:
+        return dict(tfstate["outputs"])
 
     def load(self, replacements: dict[str, str]) -> None:
         raise NotImplementedError
 
+    def get_current_version(self, url: str) -> str | None:
+        """
+        Ask the state backend for the current version tag of the state file
+        at ``url``, one of the keys of :py:attr:`versions`, without downloading
+        it.
+
+        Args:
+            url: the resolved URL of the state file
+
+        Returns:
+            The version tag, or ``None`` if the state file does not exist.
+
+        """
+        raise NotImplementedError
+
     def lookup(self, attr: str, replacements: dict[str, str]) -> str:
         lookup_key = self.terraform_config["lookups"][attr]
         for key, value in list(replacements.items()):
@@ -58,7 +403,24 @@ class TerraformS3State(AbstractTerraformState):
 
     def __init__(self, terraform_config: dict[str, Any], context: dict[str, Any]) -> None:
         super().__init__(terraform_config, context)
-        self.replacements: dict[str, str] = {}
+        #: The resolved URL of the state file in :py:attr:`terraform_lookups`
+        self.statefile_url: str | None = None
+        self._clients: dict[tuple[str | None, str | None], Any] = {}
+        #: The ``ETag`` of each state file :py:meth:`_get_state_file_from_s3` returned
+        self.etags: dict[str, str] = {}
+        self._clients_lock = threading.Lock()
+
+    def _get_s3_client(self, profile: str = None, region: str = None):
+        # boto3 clients are thread safe, but creating them is not, so we make
+        # one per profile and region and share it between threads
+        with self._clients_lock:
+            if (profile, region) not in self._clients:
+                if profile:
+                    session = boto3.session.Session(profile_name=profile, region_name=region)
+                else:
+                    session = get_boto3_session()
+                self._clients[(profile, region)] = session.client("s3")
+            return self._clients[(profile, region)]
 
     def _get_state_file_from_s3(
         self,
@@ -67,99 +429,329 @@ class TerraformS3State(AbstractTerraformState):
         region: str = None
     ) -> dict[str, Any]:
         """
-        Retrive our statefile from S3
+        Retrive our statefile from S3, or at least its ``terraform_version``
+        and outputs, which are all we use.
+
+        If we have the state file in :py:data:`terraform_state_disk_cache`, we
+        only download it again if its ``ETag`` has changed.
+
+        Args:
+            state_file_url: the ``s3://`` URL of the state file
+
+        Keyword Args:
+            profile: the AWS profile to use, if not the default
+            region: the AWS region to use, if not the default
+
+        Raises:
+            NoSuchTerraformStateFile: the state file does not exist
+
+        Returns:
+            The state file, reduced by :py:meth:`read_state`.
+
         """
-        if profile:
-            session = boto3.session.Session(profile_name=profile, region_name=region)
-        else:
-            session = get_boto3_session()
-        s3 = session.resource("s3")
+        entry = terraform_state_disk_cache.read(state_file_url)
+        if entry is not None and terraform_state_disk_cache.is_fresh(entry):
+            self.etags[state_file_url] = entry["etag"]
+            return entry["state"]
+        s3 = self._get_s3_client(profile=profile, region=region)
         parts = state_file_url[5:].split("/")
-        bucket = parts[0]
-        filename = "/".join(parts[1:])
-        key = s3.Object(bucket, filename)
+        kwargs: dict[str, Any] = {"Bucket": parts[0], "Key": "/".join(parts[1:])}
+        if entry is not None:
+            kwargs["IfNoneMatch"] = entry["etag"]
         try:
-            state_file = key.get()["Body"].read().decode("utf-8")
+            response = s3.get_object(**kwargs)
         except botocore.exceptions.ClientError as ex:
+            if entry is not None and ex.response["Error"]["Code"] in ("304", "NotModified"):
+                terraform_state_disk_cache.write(state_file_url, entry["etag"], entry["state"])
+                self.etags[state_file_url] = entry["etag"]
+                return entry["state"]
             if ex.response["Error"]["Code"] == "NoSuchKey":
                 raise NoSuchTerraformStateFile(f"Could not find Terraform state file {state_file_url}")
             raise ex
-        return json.loads(state_file)
+        try:
+            state = self.read_state(response["Body"])
+        finally:
+            response["Body"].close()
+        if response.get("ETag"):
+            terraform_state_disk_cache.write(state_file_url, response["ETag"], state)
+            self.etags[state_file_url] = response["ETag"]
+        return state
+
+    def get_current_version(self, url: str) -> str | None:
+        s3 = self._get_s3_client(
+            profile=self.terraform_config.get("profile", None),
+            region=self.terraform_config.get("region", None)
+        )
+        parts = url[5:].split("/")
+        try:
+            return s3.head_object(Bucket=parts[0], Key="/".join(parts[1:]))["ETag"]
+        except botocore.exceptions.ClientError as ex:
+            if ex.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise ex
 
-    def _load_pre_version_12(self, tfstate: dict[str, Any]) -> None:
-        for i in tfstate["modules"]:
-            if i["path"] == ["root"]:
-                for key, value in list(i["outputs"].items()):
-                    self.terraform_lookups[key] = value
+    def get_statefile_url(self, replacements: dict[str, str]) -> str:
+        """
+        Return the URL of the state file to use for an item with deployfish
+        replacements ``replacements``.
 
-    def _load_post_version_12(self, tfstate: dict[str, Any]) -> None:
-        for key, value in list(tfstate["outputs"].items()):
-            self.terraform_lookups[key] = value
+        Args:
+            replacements: the deployfish replacements for the item
 
-    def load(self, replacements: dict[str, str]) -> None:
-        if replacements == self.replacements:
-            return
-        self.replacements = replacements
+        Returns:
+            The resolved URL of the state file.
+
+        """
         statefile_url = self.terraform_config["statefile"]
         for key, value in replacements.items():
             statefile_url = statefile_url.replace(key, value)
-        if not self.loaded:
+        return statefile_url
+
+    def fetch(self, statefile_url: str) -> dict[str, Any]:
+        """
+        Return the outputs of the state file at ``statefile_url``.
+
+        Outputs are cached in :py:data:`terraform_outputs_cache`, so we only
+        download and parse each state file once.
+
+        Args:
+            statefile_url: the resolved URL of the state file
+
+        Raises:
+            NoSuchTerraformStateFile: the state file does not exist
+
+        Returns:
+            The outputs, keyed by output name.
+
+        """
+        outputs = terraform_outputs_cache.get(statefile_url)
+        if outputs is None:
             tfstate = self._get_state_file_from_s3(
                 statefile_url,
                 profile=self.terraform_config.get("profile", None),
                 region=self.terraform_config.get("region", None)
             )
-            major, minor, _ = tfstate["terraform_version"].split(".")
-            if int(major) >= 1 or (int(major) == 0 and int(minor) >= 12):
-                self._load_post_version_12(tfstate)
-            else:
-                self._load_pre_version_12(tfstate)
-            # If our statefile URL has no replacments in it, we don't need to load this again
-            self.loaded = not any(
-                r in self.terraform_config["statefile"] for r in AbstractConfigProcessor.REPLACEMENTS
-            )
+            outputs = self.get_outputs(tfstate)
+            terraform_outputs_cache.set(statefile_url, outputs, version=self.etags.get(statefile_url))
+        return outputs
+
+    def prefetch(self, replacements_list: list[dict[str, str]]) -> None:
+        """
+        Download, in parallel, all the state files we don't already have
+        outputs for that items with the deployfish replacements in
+        ``replacements_list`` will need, so that :py:meth:`load` can work from
+        :py:data:`terraform_outputs_cache`.
+
+        State files we fail to download are skipped; :py:meth:`load` will
+        report the problem if the state file is actually needed.
+
+        Args:
+            replacements_list: a list of deployfish replacements, one per item
+
+        """
+        urls: list[str] = []
+        for replacements in replacements_list:
+            url = self.get_statefile_url(replacements)
+            if url not in urls and url not in terraform_outputs_cache:
+                urls.append(url)
+        # Don't fetch more state files than we have room for
+        urls = urls[:terraform_outputs_cache.maxsize]
+        if len(urls) < 2:
+            return
+
+        def fetch(url: str) -> None:
+            try:
+                self.fetch(url)
+            except Exception:  # noqa: BLE001,S110
+                pass
+
+        run_concurrently(fetch, [(url,) for url in urls])
+
+    def load(self, replacements: dict[str, str]) -> None:
+        """
+        Make :py:attr:`terraform_lookups` be the outputs of the state file for
+        an item with deployfish replacements ``replacements``.
+
+        Args:
+            replacements: the deployfish replacements for the item
+
+        Raises:
+            NoSuchTerraformStateFile: the state file does not exist
+
+        """
+        statefile_url = self.get_statefile_url(replacements)
+        if statefile_url == self.statefile_url:
+            return
+        self.terraform_lookups = self.fetch(statefile_url)
+        self.versions[statefile_url] = terraform_outputs_cache.version(statefile_url)
+        self.statefile_url = statefile_url
+        self.loaded = True
 
 
 class TerraformEnterpriseState(AbstractTerraformState):
+    """
+    Outputs from the current state version of a Terraform Enterprise
+    (Terraform Cloud) workspace.
+
+    All our API calls go through one process-wide :py:class:`requests.Session`
+    (see :py:meth:`get_session`), so they share keep-alive connections, and all
+    of them have timeouts.  We ask the API only for the latest state version;
+    if its ``serial`` matches what we have in :py:data:`terraform_outputs_cache`
+    or :py:data:`terraform_state_disk_cache`, we skip downloading the state
+    entirely.
+    """
 
     TERRAFORM_API_ENDPOINT: str = "https://app.terraform.io/api/v2"
 
+    #: The ``(connect, read)`` timeouts, in seconds, for our HTTP requests
+    TIMEOUT: tuple[float, float] = (10.0, 60.0)
+
+    _session: requests.Session | None = None
+    _session_lock = threading.Lock()
+
     def __init__(self, terraform_config: dict[str, Any], context: dict[str, Any]) -> None:
         super().__init__(terraform_config, context)
         if "workspace" not in self.terraform_config:
             raise SchemaException(
                 'In the "terraform:" section, if you define "organization", you must also define "workspace"'
             )
-        if "tfe_token" in self.context:
+        if self.context.get("tfe_token"):
             self.api_token: str = self.context["tfe_token"]
         if "ATLAS_TOKEN" in os.environ:
             self.api_token = cast("str", os.getenv("ATLAS_TOKEN"))
-        if not hasattr(self, "tfe_token"):
+        if not hasattr(self, "api_token"):
             raise ConfigProcessingFailed("Terraform Enterprise State: No Terraform Enterprise API token provided!")
 
-    def get_terraform_state_download_url(self) -> str:
-        endpoint = self.TERRAFORM_API_ENDPOINT + "/state-versions?"
-        org_filter = "filter[organization][name]=" + self.terraform_config["organization"]
-        workspace_filter = "filter[workspace][name]=" + self.terraform_config["workspace"]
-        web_request = endpoint + org_filter + "&" + workspace_filter
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Return the :py:class:`requests.Session` we share between all our
+        instances, creating it if need be.
+
+        Returns:
+            The session.
+
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                cls._session = requests.Session()
+            return cls._session
+
+    @property
+    def cache_key(self) -> str:
+        """
+        The key for our workspace in our caches.
+        """
+        return "tfe://{}/{}".format(self.terraform_config["organization"], self.terraform_config["workspace"])
+
+    def get_current_state_version(self) -> dict[str, Any]:
+        """
+        Ask the Terraform Enterprise API for the current state version of our
+        workspace.
+
+        Raises:
+            ConfigProcessingFailed: the API request failed, or the workspace has
+                no state
+
+        Returns:
+            The ``attributes`` of the state version, which include ``serial``
+            and ``hosted-state-download-url``.
+
+        """
+        params = {
+            "filter[organization][name]": self.terraform_config["organization"],
+            "filter[workspace][name]": self.terraform_config["workspace"],
+            "page[size]": "1",
+        }
         headers = {
             "Authorization": "Bearer " + self.api_token,
             "Content-Type": "application/vnd.api+json"
         }
-        response = requests.get(web_request, headers=headers)
-        data = json.loads(response.text)
-        return data["data"][0]["attributes"]["hosted-state-download-url"]
+        try:
+            response = self.get_session().get(
+                self.TERRAFORM_API_ENDPOINT + "/state-versions",
+                params=params,
+                headers=headers,
+                timeout=self.TIMEOUT
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            raise ConfigProcessingFailed(
+                f"Terraform Enterprise State: could not get the current state version of {self.cache_key}: {e}"
+            )
+        if not data:
+            raise NoSuchTerraformStateFile(f"Terraform Enterprise workspace {self.cache_key} has no state")
+        return data[0]["attributes"]
+
+    def get_current_version(self, url: str) -> str | None:
+        try:
+            return str(self.get_current_state_version()["serial"])
+        except NoSuchTerraformStateFile:
+            return None
+
+    def get_terraform_state_download_url(self) -> str:
+        return self.get_current_state_version()["hosted-state-download-url"]
+
+    def download_state(self, url: str) -> dict[str, Any]:
+        """
+        Download the state file at ``url``.
+
+        Args:
+            url: the ``hosted-state-download-url`` of a state version
+
+        Raises:
+            ConfigProcessingFailed: the download failed
+
+        Returns:
+            The state file, reduced by :py:meth:`read_state`.
+
+        """
+        try:
+            with self.get_session().get(url, stream=True, timeout=self.TIMEOUT) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return self.read_state(response.raw)
+        except (requests.RequestException, ValueError) as e:
+            raise ConfigProcessingFailed(
+                f"Terraform Enterprise State: could not download the state for {self.cache_key}: {e}"
+            )
 
     def load(self, _: dict[str, str]) -> None:
-        if not self.loaded:
-            state_download_url = self.get_terraform_state_download_url()
-            response = requests.get(state_download_url)
-            tfstate = json.loads(response.text)
-            for i in tfstate["modules"]:
-                if i["path"] == ["root"]:
-                    for key, value in list(i["outputs"].items()):
-                        self.terraform_lookups[key] = value
+        """
+        Load the outputs of the current state version of our workspace into
+        :py:attr:`terraform_lookups`, downloading the state only if we don't
+        already have that version cached.
+
+        Raises:
+            ConfigProcessingFailed: we could not talk to Terraform Enterprise
+            NoSuchTerraformStateFile: our workspace has no state
+
+        """
+        if self.loaded:
+            return
+        key = self.cache_key
+        entry = terraform_state_disk_cache.read(key)
+        if entry is not None and terraform_state_disk_cache.is_fresh(entry):
+            self.terraform_lookups = self.get_outputs(entry["state"])
+            self.versions[key] = entry["etag"]
             self.loaded = True
+            return
+        version = self.get_current_state_version()
+        serial = str(version["serial"])
+        state = entry["state"] if entry is not None and entry["etag"] == serial else None
+        outputs = terraform_outputs_cache.get(f"{key}#{serial}")
+        if outputs is None:
+            if state is None:
+                state = self.download_state(version["hosted-state-download-url"])
+            outputs = self.get_outputs(state)
+            terraform_outputs_cache.set(f"{key}#{serial}", outputs, version=serial)
+        if state is not None:
+            # This also records when we last checked, for DEPLOYFISH_TERRAFORM_CACHE_TTL
+            terraform_state_disk_cache.write(key, serial, state)
+        self.terraform_lookups = outputs
+        self.versions[key] = serial
+        self.loaded = True
 
 
 class TerraformStateConfigProcessor(AbstractConfigProcessor):
@@ -189,8 +781,10 @@ class TerraformStateConfigProcessor(AbstractConfigProcessor):
 
     """
 
-    #: The
+    #: The pattern for our ``${terraform.KEY}`` replacements
     TERRAFORM_RE = re.compile(r"\$\{terraform.(?P<key>[A-Za-z0-9_]+)\}")
+    PATTERN = TERRAFORM_RE
+    ITEM_KEYS = (*AbstractConfigProcessor.ITEM_KEYS, "service")
 
     def __init__(self, config: "Config", context: dict[str, Any]) -> None:
         super().__init__(config, context)
@@ -199,19 +793,60 @@ class TerraformStateConfigProcessor(AbstractConfigProcessor):
         except KeyError:
             raise self.SkipConfigProcessing('Skipping terraform state processing: no "terraform" section')
 
-    def replace(
+    def prefetch(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        """
+        Download, in parallel, every distinct state file that the items in
+        ``items`` that reference ``${terraform.KEY}`` resolve to, so that we
+        can interpolate them purely from memory.
+
+        Args:
+            items: a list of ``(section_name, item)`` tuples we're about to
+                process
+
+        """
+        if not isinstance(self.terraform, TerraformS3State):
+            return
+        replacements_list = []
+        for section_name, item in items:
+            if not self.TERRAFORM_RE.search(json.dumps(item, default=str)):
+                continue
+            try:
+                if section_name == "tunnels":
+                    replacements_list.append(self.get_deployfish_replacements("services", item["service"]))
+                else:
+                    replacements_list.append(self.get_deployfish_replacements(section_name, item["name"]))
+            except KeyError:
+                continue
+        self.terraform.prefetch(replacements_list)
+
+    def get_fingerprints(self) -> dict[str, Any]:
+        return {"versions": dict(self.terraform.versions)}
+
+    def check_fingerprints(self, fingerprints: dict[str, Any]) -> bool:
+        """
+        Ask the state backend whether each state file in ``fingerprints`` is
+        still at the version we compiled against.  This costs us a ``HeadObject``
+        per S3 state file, or one state-versions API call for Terraform
+        Enterprise, rather than downloading the state.
+        """
+        try:
+            for url, version in fingerprints.get("versions", {}).items():
+                if version is None or self.terraform.get_current_version(url) != version:
+                    return False
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+    def resolve(
         self,
+        match: re.Match,
         obj: list | dict,
-        key: Any,
-        value: str,
         section_name: str,
         item_name: str
-    ) -> None:
+    ) -> Any:
         """
-        Perform string replacements on ``value``, a string value in our
-        ``deployfish.yml`` item, replacing any strings that look like
-        ``${terraform.KEY}`` with the value from the ``terraform:`` section.  This
-        means the key to which we assign the value from the state file.
+        Return the value from our Terraform state for ``match``, a string that
+        looks like ``${terraform.KEY}``.
 
         Example:
             If our terraform section looks like this::
@@ -227,38 +862,35 @@ class TerraformStateConfigProcessor(AbstractConfigProcessor):
             ``s3://my-statefile``.
 
         Args:
+            match: the match of :py:attr:`TERRAFORM_RE` to resolve
             obj: a list or dict from an item from a ``deployfish.yml``
-            key: the name of the key (if ``obj`` is a dict) or index (if ``obj``
-                is a list``) in ``obj``
-            value: our string value from ``obj[key]``
             section_name: the section name ``obj`` came from
             item_name: the name of the item in ``section_name`` that ``obj``
                 came from
 
+        Raises:
+            TerraformStateConfigProcessor.ProcessingFailed: we couldn't load the
+                statefile, or it has no such output
+
+        Returns:
+            The value of the Terraform output.
+
         """
-        m = self.TERRAFORM_RE.search(value)
-        if m:
-            if section_name == "tunnels":
-                replacers = self.get_deployfish_replacements("services", cast("dict", obj)["service"])
-            else:
-                replacers = self.get_deployfish_replacements(section_name, item_name)
-            try:
-                self.terraform.load(replacers)
-            except NoSuchTerraformStateFile as e:
-                raise self.ProcessingFailed(str(e))
-            try:
-                tfvalue = self.terraform.lookup(m.group("key"), replacers)
-            except KeyError:
-                raise self.ProcessingFailed(
-                    'Config["{}"]["{}"]: There is no terraform output named "{}" in the statefile'.format(
-                        section_name,
-                        item_name,
-                        m.group("key")
-                    )
+        if section_name == "tunnels":
+            replacers = self.get_deployfish_replacements("services", cast("dict", obj)["service"])
+        else:
+            replacers = self.get_deployfish_replacements(section_name, item_name)
+        try:
+            self.terraform.load(replacers)
+        except NoSuchTerraformStateFile as e:
+            raise self.ProcessingFailed(str(e))
+        try:
+            return self.terraform.lookup(match.group("key"), replacers)
+        except KeyError:
+            raise self.ProcessingFailed(
+                'Config["{}"]["{}"]: There is no terraform output named "{}" in the statefile'.format(
+                    section_name,
+                    item_name,
+                    match.group("key")
                 )
-            if isinstance(tfvalue, (list, tuple, dict)):
-                obj[key] = tfvalue
-            elif isinstance(tfvalue, int):
-                obj[key] = self.TERRAFORM_RE.sub(str(tfvalue), value)
-            else:
-                obj[key] = self.TERRAFORM_RE.sub(tfvalue, value)
+            )
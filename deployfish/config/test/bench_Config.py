@@ -0,0 +1,50 @@
+"""
+Micro-benchmark :py:meth:`deployfish.config.Config.get_section_item` with the
+section index against the linear scan it replaced.
+
+Run it like so::
+
+    python -m deployfish.config.test.bench_Config
+
+For each section size we look up every item once by ``name`` and once by
+``environment``, which is roughly what interpolating every item in the section
+costs in lookups.
+"""
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from deployfish.config import Config
+from deployfish.core.utils.test.benchmark import best_of, make_parser
+
+
+def linear_get_section_item(config: Config, section_name: str, item_name: str) -> dict[str, Any]:
+    for item in config.cooked[section_name]:
+        if item["name"] == item_name:
+            return item
+        if "environment" in item and item["environment"] == item_name:
+            return item
+    raise Config.NoSuchSectionItemError(section_name, item_name)
+
+
+def look_up_all(func: Callable[[Config, str, str], Any], config: Config, keys: list[str]) -> None:
+    for key in keys:
+        func(config, "services", key)
+
+
+def main() -> None:
+    parser = make_parser(__doc__, repeat=3)
+    args = parser.parse_args()
+    print(f"{'services':>9} {'linear ms':>10} {'indexed ms':>11}")
+    for size in (10, 100, 500, 2000):
+        services = [{"name": f"service-{i}", "environment": f"env-{i}"} for i in range(size)]
+        config = Config.new(filename="deployfish.yml", raw_config={"services": services}, interpolate=False)
+        keys = [s["name"] for s in services] + [s["environment"] for s in services]
+        results = []
+        for func in (linear_get_section_item, Config.get_section_item):
+            results.append(best_of(partial(look_up_all, func, config, keys), args.repeat))
+        print(f"{size:>9} {results[0]:>10.2f} {results[1]:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
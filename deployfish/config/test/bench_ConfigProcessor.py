@@ -0,0 +1,104 @@
+"""
+Benchmark interpolating a large ``deployfish.yml`` with the fused, single pass
+:py:class:`deployfish.config.processors.ConfigProcessor` against running each
+processor's own :py:meth:`AbstractConfigProcessor.process` pass one after the
+other, as we used to.
+
+Run it like so::
+
+    python -m deployfish.config.test.bench_ConfigProcessor
+
+The statefile is read from ``terraform.tfstate`` next to this file rather than
+from S3.  Each service has a realistic mix of containers, environment
+variables and other settings, most of which need no interpolation at all.
+"""
+import json
+import os
+from functools import partial
+from typing import Any
+
+from testfixtures import Replacer
+
+from deployfish.config import Config
+from deployfish.config.processors import ConfigProcessor
+from deployfish.core.utils.test.benchmark import best_of, make_parser
+
+
+def make_service(i: int) -> dict[str, Any]:
+    environment = ("prod", "qa")[i % 2]
+    return {
+        "name": f"service-{i}-{environment}",
+        "environment": environment,
+        "cluster": "${terraform.cluster_name}",
+        "count": 2,
+        "load_balancer": {
+            "load_balancer_name": "${terraform.elb_id}",
+            "container_name": "web",
+            "container_port": 443,
+        },
+        "task_role_arn": "${terraform.iam_task_role}",
+        "config": [f"VAR_{j}=value-{j}" for j in range(20)] + [
+            "DB_HOST=${env.FOOBAR_ENV}:${env.FOO_BAR_PREFIX_ENV}",
+        ],
+        "containers": [
+            {
+                "name": name,
+                "image": f"123445564666.dkr.ecr.us-west-2.amazonaws.com/{name}:0.1.{i}",
+                "cpu": 128,
+                "memory": 256,
+                "ports": ["80", "443"],
+                "environment": [f"SETTING_{j}=plain-{j}" for j in range(20)] + [
+                    "S3_BUCKET=${terraform.secrets_bucket_name}",
+                ],
+                "logging": {"driver": "awslogs", "options": {"awslogs-group": f"service-{i}"}},
+            }
+            for name in ("web", "worker")
+        ],
+    }
+
+
+def make_processor(raw_config: dict[str, Any], env_file: str) -> tuple[ConfigProcessor]:
+    config = Config.new(filename="deployfish.yml", raw_config=raw_config, interpolate=False)
+    return (ConfigProcessor(config, {"env_file": env_file}),)
+
+
+def process_separately(processor: ConfigProcessor) -> None:
+    for p in processor.get_processors():
+        p.process()
+
+
+def main() -> None:
+    parser = make_parser(__doc__, repeat=3)
+    args = parser.parse_args()
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    env_file = os.path.join(current_dir, "env_file.env")
+    with open(os.path.join(current_dir, "terraform.tfstate"), encoding="utf-8") as f:
+        tfstate = json.loads(f.read())
+    terraform = {
+        "statefile": "s3://my-statefile",
+        "lookups": {
+            "cluster_name": "{environment}-cluster-name",
+            "elb_id": "{environment}-elb-id",
+            "iam_task_role": "iam-role-{environment}-task",
+            "secrets_bucket_name": "s3-config-store-bucket",
+        },
+    }
+    print(f"{'services':>9} {'separate ms':>12} {'fused ms':>9} {'same':>5}")
+    with Replacer() as r:
+        r("deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3", lambda *a, **kw: tfstate)
+        for size in (10, 100, 500, 2000):
+            raw_config = {"terraform": terraform, "services": [make_service(i) for i in range(size)]}
+            setup = partial(make_processor, raw_config, env_file)
+            results = [
+                best_of(process_separately, args.repeat, setup=setup),
+                best_of(ConfigProcessor.process, args.repeat, setup=setup),
+            ]
+            (separate,), (fused,) = setup(), setup()
+            process_separately(separate)
+            fused.process()
+            same = separate.config.cooked == fused.config.cooked
+            print(f"{size:>9} {results[0]:>12.2f} {results[1]:>9.2f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
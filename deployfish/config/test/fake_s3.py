@@ -0,0 +1,66 @@
+"""
+A small in-memory stand-in for the AWS S3 ``GetObject`` and ``HeadObject``
+APIs, good enough to exercise
+:py:class:`deployfish.config.processors.terraform.TerraformS3State` in tests
+without talking to AWS.
+
+Like S3, it honors ``IfNoneMatch`` on ``get_object`` by raising a ``304``
+``ClientError`` when the ETag matches.  Each call is counted in ``calls``, and
+the number of body bytes actually sent is totalled in ``bytes_sent``.
+"""
+import hashlib
+import io
+from collections import Counter
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+
+class FakeS3Client:
+
+    def __init__(self, objects: dict[tuple[str, str], bytes] | None = None) -> None:
+        self.objects: dict[tuple[str, str], bytes] = dict(objects or {})
+        self.calls: Counter = Counter()
+        self.bytes_sent: int = 0
+
+    def put(self, bucket: str, key: str, body: bytes) -> None:
+        self.objects[(bucket, key)] = body
+
+    def etag(self, bucket: str, key: str) -> str:
+        return '"{}"'.format(hashlib.md5(self.objects[(bucket, key)]).hexdigest())  # noqa: S324
+
+    def _check(self, operation: str, bucket: str, key: str) -> None:
+        if (bucket, key) not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": "The specified key does not exist."}},
+                operation
+            )
+
+    # ------------------------
+    # boto3 API
+    # ------------------------
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:  # noqa: N803
+        self.calls["head_object"] += 1
+        try:
+            self._check("HeadObject", Bucket, Key)
+        except ClientError:
+            # HeadObject responses have no body, so S3 can only give us the status
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"ETag": self.etag(Bucket, Key), "ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def get_object(self, Bucket: str, Key: str, IfNoneMatch: str | None = None) -> dict[str, Any]:  # noqa: N803
+        self.calls["get_object"] += 1
+        self._check("GetObject", Bucket, Key)
+        etag = self.etag(Bucket, Key)
+        if IfNoneMatch == etag:
+            raise ClientError(
+                {
+                    "Error": {"Code": "304", "Message": "Not Modified"},
+                    "ResponseMetadata": {"HTTPStatusCode": 304}
+                },
+                "GetObject"
+            )
+        body = self.objects[(Bucket, Key)]
+        self.bytes_sent += len(body)
+        return {"ETag": etag, "ContentLength": len(body), "Body": io.BytesIO(body)}
@@ -0,0 +1,82 @@
+"""
+A small local HTTP stand-in for the parts of the Terraform Enterprise API that
+:py:class:`deployfish.config.processors.terraform.TerraformEnterpriseState`
+uses: listing state versions, and downloading a hosted state file.
+
+The server runs in a background thread on a random port on ``127.0.0.1``.
+Requests are counted by path in ``calls``, and the client ports we've seen are
+recorded in ``ports``, so tests can tell whether connections were reused.
+"""
+import http.server
+import json
+import threading
+from collections import Counter
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeTFEServer:
+
+    def __init__(self, tfstate: dict[str, Any], serial: int = 1, token: str = "token") -> None:
+        self.tfstate = tfstate
+        self.serial = serial
+        self.token = token
+        self.calls: Counter = Counter()
+        self.ports: set[int] = set()
+        self.queries: list[dict[str, list[str]]] = []
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def start(self) -> "FakeTFEServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self) -> type[http.server.BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+            def send_json(self, status: int, data: Any) -> None:
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # noqa: N802
+                url = urlparse(self.path)
+                fake.calls[url.path] += 1
+                fake.ports.add(self.client_address[1])
+                if url.path == "/api/v2/state-versions":
+                    if self.headers.get("Authorization") != f"Bearer {fake.token}":
+                        self.send_json(401, {"errors": [{"status": "401", "title": "unauthorized"}]})
+                        return
+                    fake.queries.append(parse_qs(url.query))
+                    self.send_json(200, {"data": [{
+                        "id": f"sv-{fake.serial}",
+                        "type": "state-versions",
+                        "attributes": {
+                            "serial": fake.serial,
+                            "hosted-state-download-url": f"{fake.url}/state/{fake.serial}",
+                        },
+                    }]})
+                elif url.path == f"/state/{fake.serial}":
+                    self.send_json(200, fake.tfstate)
+                else:
+                    self.send_json(404, {"errors": [{"status": "404", "title": "not found"}]})
+
+        return Handler
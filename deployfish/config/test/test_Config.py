@@ -1,12 +1,22 @@
 import json
 import os
+import tempfile
+import threading
 import unittest
+from copy import deepcopy
 from typing import Any
 from unittest.mock import Mock, call
 
 from testfixtures import Replacer
 
+import deployfish.core.adapters  # noqa:F401
 from deployfish.config.config import Config
+from deployfish.config.processors.environment import env_file_cache
+from deployfish.config.processors.terraform import terraform_outputs_cache
+from deployfish.core.models.ssh import SSHTunnel
+from deployfish.exceptions import ConfigProcessingFailed
+
+from .fake_s3 import FakeS3Client
 
 
 def statefile_loader(state_file_url, profile: str = None, region: str = None) -> dict[str, Any]:
@@ -23,6 +33,7 @@ def statefile_loader(state_file_url, profile: str = None, region: str = None) ->
 class TestContainerDefinition_terraform_statefile_interpolation(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         config_yml = os.path.join(current_dir, "terraform_interpolate.yml")
         with Replacer() as r:
@@ -51,6 +62,7 @@ class TestContainerDefinition_terraform_statefile_interpolation(unittest.TestCas
 class TestTunnelDefinition_terraform_interpolation(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         config_yml = os.path.join(current_dir, "terraform_interpolate.yml")
         with Replacer() as r:
@@ -77,6 +89,7 @@ class TestTunnelDefinition_terraform_interpolation(unittest.TestCase):
 class TestContainerDefinition_load_yaml(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         state_file = os.path.join(current_dir, "terraform.tfstate")
         config_yml = os.path.join(current_dir, "interpolate.yml")
@@ -129,6 +142,7 @@ class TestContainerDefinition_load_yaml(unittest.TestCase):
 class TestContainerDefinition_load_yaml_no_interpolate(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         state_file = os.path.join(current_dir, "terraform.tfstate")
         config_yml = os.path.join(current_dir, "interpolate.yml")
@@ -177,3 +191,360 @@ class TestTunnelParameters_load_yaml(unittest.TestCase):
         self.assertEqual(yml["host"], "config.DB_HOST")
         self.assertEqual(yml["port"], 3306)
         self.assertEqual(yml["local_port"], 8888)
+
+
+class TestConfig_lazy_interpolation(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.config_yml = os.path.join(current_dir, "terraform_interpolate.yml")
+        self.replacer = Replacer()
+        self.get_mock = self.replacer(
+            "deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3",
+            Mock()
+        )
+        self.get_mock.side_effect = statefile_loader
+        self.config = Config.new(filename=self.config_yml, lazy=True)
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_nothing_is_interpolated_up_front(self):
+        self.get_mock.assert_not_called()
+        self.assertEqual(self.config.cooked["services"][0]["cluster"], "${terraform.cluster_name}")
+
+    def test_only_the_requested_item_is_interpolated(self):
+        prod = self.config.get_section_item("services", "foobar-prod")
+        self.assertEqual(prod["cluster"], "foobar-cluster-prod")
+        self.get_mock.assert_called_once_with("s3://my-prod-statefile", profile=None, region=None)
+        self.assertEqual(self.config.cooked["services"][0]["cluster"], "${terraform.cluster_name}")
+
+    def test_items_are_interpolated_once(self):
+        first = self.config.get_section_item("services", "foobar-prod")
+        with Replacer() as r:
+            process_mock = r("deployfish.config.processors.ConfigProcessor.process_item", Mock())
+            second = self.config.get_section_item("services", "prod")
+        self.assertIs(first, second)
+        process_mock.assert_not_called()
+
+    def test_lazy_matches_eager(self):
+        eager = Config.new(filename=self.config_yml)
+        self.config.interpolate()
+        self.assertEqual(self.config.cooked, eager.cooked)
+
+    def test_lazy_matches_eager_with_env_file(self):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        config_yml = os.path.join(current_dir, "interpolate.yml")
+        env_file = os.path.join(current_dir, "env_file.env")
+        with open(os.path.join(current_dir, "terraform.tfstate"), encoding="utf-8") as f:
+            tfstate = json.loads(f.read())
+        self.get_mock.side_effect = None
+        self.get_mock.return_value = tfstate
+        eager = Config.new(filename=config_yml, env_file=env_file)
+        lazy = Config.new(filename=config_yml, env_file=env_file, lazy=True)
+        self.assertEqual(lazy.get_section_item("services", "foobar-prod"), eager.get_service("foobar-prod"))
+        lazy.interpolate()
+        self.assertEqual(lazy.cooked, eager.cooked)
+
+
+class TestConfig_lazy_interpolated_names(unittest.TestCase):
+
+    RAW_CONFIG = {
+        "services": [
+            {"name": "web-${env.STAGE}", "environment": "${env.STAGE}", "cluster": "cluster-${env.STAGE}"},
+        ],
+        "tasks": [
+            {"name": "other", "service": "api-prod"},
+            {"name": "migrate-${env.STAGE}", "service": "web-${env.STAGE}"},
+        ],
+        "tunnels": [
+            {"name": "db-${env.STAGE}", "service": "web-${env.STAGE}", "host": "h", "port": 3306, "local_port": 8888},
+        ],
+    }
+
+    def setUp(self):
+        self.replacer = Replacer()
+        self.replacer.in_environ("STAGE", "prod")
+        self.config = Config.new(
+            filename="deployfish.yml",
+            raw_config=deepcopy(self.RAW_CONFIG),
+            import_env=True,
+            lazy=True
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_lazy_matches_eager(self):
+        eager = Config.new(filename="deployfish.yml", raw_config=deepcopy(self.RAW_CONFIG), import_env=True)
+        self.assertEqual(eager.cooked["services"][0]["cluster"], "cluster-prod")
+        self.config.interpolate()
+        self.assertEqual(self.config.cooked, eager.cooked)
+
+    def test_lookup_by_interpolated_name(self):
+        self.assertEqual(self.config.get_section_item("services", "web-prod")["cluster"], "cluster-prod")
+        self.assertEqual(self.config.get_section_item("services", "prod")["name"], "web-prod")
+
+    def test_section_for_lookup_interpolates_only_what_it_needs(self):
+        tasks = self.config.get_section_for_lookup("tasks", keys=("name", "service"))
+        self.assertEqual(
+            [(t["name"], t["service"]) for t in tasks],
+            [("other", "api-prod"), ("migrate-prod", "web-prod")]
+        )
+        self.assertEqual(self.config.cooked["tunnels"][0]["name"], "db-${env.STAGE}")
+        self.assertEqual(self.config.get_section_for_lookup("nope"), [])
+
+    def test_tunnel_by_interpolated_name(self):
+        with Replacer() as r:
+            r.replace("deployfish.core.models.ssh.get_config", Mock(return_value=self.config))
+            tunnel = SSHTunnel.objects.get("db-prod")
+        self.assertEqual(tunnel.data["service"], "web-prod")
+
+
+class TestConfig_terraform_prefetch(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.config_yml = os.path.join(current_dir, "terraform_interpolate.yml")
+        # Both statefiles must be requested at the same time for either
+        # request to succeed
+        barrier = threading.Barrier(2, timeout=5)
+
+        def concurrent_statefile_loader(*args, **kwargs):
+            barrier.wait()
+            return statefile_loader(*args, **kwargs)
+
+        self.replacer = Replacer()
+        self.get_mock = self.replacer(
+            "deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3",
+            Mock(side_effect=concurrent_statefile_loader)
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+        terraform_outputs_cache.clear()
+
+    def test_eager_interpolation_fetches_statefiles_in_parallel(self):
+        config = Config.new(filename=self.config_yml)
+        self.assertEqual(config.get_service("foobar-qa")["cluster"], "foobar-cluster-qa")
+        self.assertEqual(config.get_service("foobar-prod")["cluster"], "foobar-cluster-prod")
+        self.assertEqual(
+            sorted(c.args[0] for c in self.get_mock.call_args_list),
+            ["s3://my-prod-statefile", "s3://my-qa-statefile"]
+        )
+
+    def test_lazy_interpolate_fetches_statefiles_in_parallel(self):
+        config = Config.new(filename=self.config_yml, lazy=True)
+        config.interpolate()
+        self.assertEqual(config.cooked["tunnels"][0]["host"], "foo-qa.c970jsizrrcy.us-west-2.rds.amazonaws.com")
+        self.assertEqual(self.get_mock.call_count, 2)
+
+    def test_single_item_does_not_prefetch(self):
+        self.get_mock.side_effect = statefile_loader
+        config = Config.new(filename=self.config_yml, lazy=True)
+        config.get_section_item("services", "foobar-prod")
+        self.get_mock.assert_called_once_with("s3://my-prod-statefile", profile=None, region=None)
+
+
+class TestConfig_section_index(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config.new(
+            filename="deployfish.yml",
+            interpolate=False,
+            raw_config={
+                "services": [
+                    {"name": "foo-test", "environment": "test"},
+                    {"name": "foo-prod", "environment": "prod"},
+                    {"name": "bar-test", "environment": "test"},
+                    {"name": "prod", "environment": "staging"},
+                ]
+            }
+        )
+
+    def test_lookup_by_name(self):
+        self.assertEqual(self.config.get_section_item("services", "bar-test")["name"], "bar-test")
+
+    def test_first_matching_environment_wins(self):
+        self.assertEqual(self.config.get_section_item("services", "test")["name"], "foo-test")
+
+    def test_earlier_environment_beats_later_name(self):
+        self.assertEqual(self.config.get_section_item("services", "prod")["name"], "foo-prod")
+
+    def test_raw_lookups_are_indexed_too(self):
+        self.assertEqual(self.config.get_raw_section_item("services", "staging")["name"], "prod")
+
+    def test_missing_item_raises(self):
+        with self.assertRaises(Config.NoSuchSectionItemError):
+            self.config.get_section_item("services", "nope")
+        with self.assertRaises(Config.NoSuchSectionError):
+            self.config.get_section_item("tasks", "nope")
+
+    def test_index_is_rebuilt_when_section_grows(self):
+        self.config.get_section_item("services", "foo-test")
+        self.config.cooked["services"].append({"name": "new"})
+        self.assertEqual(self.config.get_section_item("services", "new")["name"], "new")
+
+    def test_index_is_rebuilt_when_item_is_renamed(self):
+        self.config.get_section_item("services", "foo-test")
+        self.config.cooked["services"][0]["name"] = "renamed"
+        self.assertEqual(self.config.get_section_item("services", "renamed")["environment"], "test")
+        with self.assertRaises(Config.NoSuchSectionItemError):
+            self.config.get_section_item("services", "foo-test")
+
+
+class TestConfigProcessor_fused_interpolation(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.env_file = os.path.join(current_dir, "env_file.env")
+        with open(os.path.join(current_dir, "terraform.tfstate"), encoding="utf-8") as f:
+            tfstate = json.loads(f.read())
+        outputs = tfstate["modules"][0]["outputs"]
+        outputs["env-reference"] = {"sensitive": False, "type": "string", "value": "tf-${env.FOOBAR_ENV}"}
+        self.replacer = Replacer()
+        self.get_mock = self.replacer(
+            "deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3",
+            Mock(return_value=tfstate)
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def get_config(self, value: Any, **kwargs) -> dict[str, Any]:
+        raw_config = {
+            "terraform": {
+                "statefile": "s3://my-statefile",
+                "lookups": {
+                    "cluster_name": "{environment}-cluster-name",
+                    "elb_id": "{environment}-elb-id",
+                    "env_reference": "env-reference",
+                    "security_group_list": "security-group-list",
+                }
+            },
+            "services": [
+                {"name": "foobar-prod", "environment": "prod", "value": value},
+            ]
+        }
+        config = Config.new(filename="deployfish.yml", raw_config=raw_config, env_file=self.env_file, **kwargs)
+        return config.get_section_item("services", "foobar-prod")
+
+    def test_multiple_environment_matches_in_one_string(self):
+        item = self.get_config("${env.FOOBAR_ENV}:${env.FOO_BAR_PREFIX_ENV}:${env.FOOBAR_ENV}")
+        self.assertEqual(item["value"], "hi_mom:oh_no:hi_mom")
+
+    def test_multiple_terraform_matches_in_one_string(self):
+        item = self.get_config("${terraform.cluster_name}/${terraform.elb_id}")
+        self.assertEqual(item["value"], "foobar-cluster-prod/foobar-elb-prod")
+
+    def test_terraform_and_environment_matches_in_one_string(self):
+        item = self.get_config("${env.FOOBAR_ENV}-${terraform.cluster_name}")
+        self.assertEqual(item["value"], "hi_mom-foobar-cluster-prod")
+
+    def test_environment_references_in_terraform_outputs_are_replaced(self):
+        item = self.get_config("${terraform.env_reference}")
+        self.assertEqual(item["value"], "tf-hi_mom")
+
+    def test_terraform_references_in_environment_values_are_not_replaced(self):
+        self.replacer.in_environ("FOOBAR_TF_REFERENCE", "${terraform.cluster_name}")
+        item = self.get_config("${env.FOOBAR_TF_REFERENCE}", import_env=True)
+        self.assertEqual(item["value"], "${terraform.cluster_name}")
+
+    def test_list_outputs_replace_the_whole_string(self):
+        item = self.get_config(["${terraform.security_group_list} ignored", "${env.FOOBAR_ENV}"])
+        self.assertEqual(item["value"], [["sg-1234567", "sg-2345678", "sg-3456789"], "hi_mom"])
+
+    def test_lazy_matches_eager(self):
+        value = {"a": ["${env.FOOBAR_ENV}:${terraform.cluster_name}", "${terraform.env_reference}"]}
+        eager = self.get_config(value)
+        lazy = self.get_config(value, lazy=True)
+        self.assertEqual(lazy, eager)
+
+
+class TestConfig_compiled(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        env_file_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, "deployfish.yml")
+        self.env_file = os.path.join(self.tmpdir.name, "foobar.env")
+        self.compiled = os.path.join(self.tmpdir.name, "compiled.json")
+        with open(self.filename, "w", encoding="utf-8") as f:
+            f.write(
+                "terraform:\n"
+                "  statefile: s3://my-{environment}-statefile/terraform.tfstate\n"
+                "  lookups:\n"
+                "    cluster_name: cluster-name\n"
+                "services:\n"
+                "  - name: foobar-prod\n"
+                "    environment: prod\n"
+                "    cluster: ${terraform.cluster_name}\n"
+                f"    env_file: {self.env_file}\n"
+                "    config:\n"
+                "      - FOO=${env.FOO}\n"
+            )
+        self.write_env_file("FOO=bar\n")
+        with open(os.path.join(current_dir, "terraform.tfstate.prod"), "rb") as f:
+            self.s3 = FakeS3Client({("my-prod-statefile", "terraform.tfstate"): f.read()})
+        self.replacer = Replacer()
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE", "false")
+        self.replacer(
+            "deployfish.config.processors.terraform.TerraformS3State._get_s3_client",
+            lambda *args, **kwargs: self.s3
+        )
+        Config.new(filename=self.filename, lazy=True).write_compiled(self.compiled)
+
+    def tearDown(self):
+        self.replacer.restore()
+        terraform_outputs_cache.clear()
+        env_file_cache.clear()
+        self.tmpdir.cleanup()
+
+    def write_env_file(self, contents):
+        with open(self.env_file, "w", encoding="utf-8") as f:
+            f.write(contents)
+
+    def test_compiled_config_is_fully_interpolated(self):
+        config = Config.load_compiled(self.compiled, filename=self.filename)
+        service = config.get_service("foobar-prod")
+        self.assertEqual(service["cluster"], "foobar-cluster-prod")
+        self.assertEqual(service["config"], ["FOO=bar"])
+        self.assertEqual(config.raw["services"][0]["cluster"], "${terraform.cluster_name}")
+
+    def test_loading_checks_state_versions_without_downloading(self):
+        Config.load_compiled(self.compiled, filename=self.filename)
+        self.assertEqual(self.s3.calls["get_object"], 1)
+        self.assertEqual(self.s3.calls["head_object"], 1)
+
+    def test_changed_config_file_is_stale(self):
+        with open(self.filename, "a", encoding="utf-8") as f:
+            f.write("    count: 2\n")
+        with self.assertRaises(Config.StaleCompiledConfigError):
+            Config.load_compiled(self.compiled, filename=self.filename)
+
+    def test_changed_env_file_is_stale(self):
+        self.write_env_file("FOO=baz\n")
+        with self.assertRaises(Config.StaleCompiledConfigError):
+            Config.load_compiled(self.compiled, filename=self.filename)
+
+    def test_changed_statefile_is_stale(self):
+        self.s3.put("my-prod-statefile", "terraform.tfstate", b'{"terraform_version": "1.5.7", "outputs": {}}')
+        with self.assertRaises(Config.StaleCompiledConfigError):
+            Config.load_compiled(self.compiled, filename=self.filename)
+
+    def test_different_context_is_stale(self):
+        with self.assertRaises(Config.StaleCompiledConfigError):
+            Config.load_compiled(self.compiled, filename=self.filename, ignore_missing_environment=True)
+
+    def test_different_config_file_is_stale(self):
+        with self.assertRaises(Config.StaleCompiledConfigError):
+            Config.load_compiled(self.compiled, filename="deployfish.yml")
+
+    def test_only_lazy_configs_compile(self):
+        with self.assertRaises(ConfigProcessingFailed):
+            Config.new(filename=self.filename).compile()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from testfixtures import compare
+
+from deployfish.config.config import Config
+from deployfish.config.processors.environment import EnvironmentConfigProcessor, env_file_cache
+
+
+class TestEnvironmentConfigProcessor_env_file_cache(unittest.TestCase):
+
+    def setUp(self):
+        env_file_cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.env_file = os.path.join(self.tmpdir.name, "shared.env")
+        self.write("# a comment\nFOO=foo\nBAR=bar=baz\n\n")
+        self.raw_config = {
+            "services": [
+                {
+                    "name": f"service-{i}",
+                    "environment": f"env-{i}",
+                    "env_file": self.env_file,
+                    "config": ["FOO=${env.FOO}", "BAR=${env.BAR}"],
+                }
+                for i in range(20)
+            ]
+        }
+
+    def tearDown(self):
+        env_file_cache.clear()
+        self.tmpdir.cleanup()
+
+    def write(self, contents, mtime=None):
+        with open(self.env_file, "w", encoding="utf-8") as f:
+            f.write(contents)
+        if mtime is not None:
+            os.utime(self.env_file, ns=(mtime, mtime))
+
+    def test_shared_env_file_is_parsed_once(self):
+        config = Config.new(filename="deployfish.yml", raw_config=self.raw_config)
+        for i in range(20):
+            compare(config.get_section_item("services", f"service-{i}")["config"], ["FOO=foo", "BAR=bar=baz"])
+        self.assertEqual(env_file_cache.loads, 1)
+
+    def test_cache_is_shared_between_processors(self):
+        Config.new(filename="deployfish.yml", raw_config=self.raw_config)
+        Config.new(filename="deployfish.yml", raw_config=self.raw_config, lazy=True).interpolate()
+        self.assertEqual(env_file_cache.loads, 1)
+
+    def test_changed_env_file_is_parsed_again(self):
+        Config.new(filename="deployfish.yml", raw_config=self.raw_config)
+        self.write("FOO=changed\nBAR=bar\n", mtime=1_000_000_000_000_000_000)
+        config = Config.new(filename="deployfish.yml", raw_config=self.raw_config)
+        compare(config.get_section_item("services", "service-0")["config"], ["FOO=changed", "BAR=bar"])
+        self.assertEqual(env_file_cache.loads, 2)
+
+    def test_env_file_names_are_mapped_in_one_pass(self):
+        config = Config.new(filename="deployfish.yml", raw_config=self.raw_config, interpolate=False)
+        processor = EnvironmentConfigProcessor(config, {})
+        compare(processor.item_env_files["services"], {f"service-{i}": self.env_file for i in range(20)})
+
+    def test_missing_env_file_raises(self):
+        self.raw_config["services"][0]["env_file"] = os.path.join(self.tmpdir.name, "missing.env")
+        config = Config.new(filename="deployfish.yml", raw_config=self.raw_config, interpolate=False)
+        processor = EnvironmentConfigProcessor(config, {})
+        with self.assertRaises(EnvironmentConfigProcessor.ProcessingFailed):
+            processor.process()
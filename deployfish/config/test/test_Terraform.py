@@ -1,11 +1,23 @@
+import io
 import json
 import os
+import tempfile
 import unittest
 from unittest.mock import Mock
 
-from testfixtures import Replacer, compare
+from testfixtures import Replacer, compare, not_there
 
-from deployfish.config.processors.terraform import TerraformS3State
+from deployfish.config.processors.terraform import (
+    TerraformEnterpriseState,
+    TerraformOutputsCache,
+    TerraformS3State,
+    terraform_outputs_cache,
+    terraform_state_disk_cache,
+)
+from deployfish.exceptions import ConfigProcessingFailed, NoSuchTerraformStateFile
+
+from .fake_s3 import FakeS3Client
+from .fake_tfe import FakeTFEServer
 
 YAML = {
     "statefile": "s3://foobar/baz",
@@ -35,6 +47,7 @@ class TestTerraform_load_yaml(unittest.TestCase):
 class TestTerraform_get_terraform_state(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         filename = os.path.join(current_dir, "terraform.tfstate")
         with open(filename) as f:
@@ -52,6 +65,7 @@ class TestTerraform_get_terraform_state(unittest.TestCase):
 class TestTerraform_get_terraform_state_v12(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         filename = os.path.join(current_dir, "terraform.tfstate.0.12")
         with open(filename) as f:
@@ -69,6 +83,7 @@ class TestTerraform_get_terraform_state_v12(unittest.TestCase):
 class TestTerraform_lookup(unittest.TestCase):
 
     def setUp(self):
+        terraform_outputs_cache.clear()
         current_dir = os.path.dirname(os.path.abspath(__file__))
         filename = os.path.join(current_dir, "terraform.tfstate")
         with open(filename) as f:
@@ -83,3 +98,236 @@ class TestTerraform_lookup(unittest.TestCase):
         self.assertEqual(self.terraform.lookup("lookup1", {"{environment}": "qa"}), "foobar-cluster-qa")
         self.assertEqual(self.terraform.lookup("lookup1", {"{environment}": "prod"}), "foobar-cluster-prod")
         self.assertListEqual(self.terraform.lookup("lookup4", {}), ["sg-1234567", "sg-2345678", "sg-3456789"])
+
+
+class TestTerraformS3State_outputs_cache(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.states = {}
+        for environment in ("qa", "prod"):
+            with open(os.path.join(current_dir, f"terraform.tfstate.{environment}")) as f:
+                self.states[f"s3://foobar/{environment}"] = json.loads(f.read())
+        self.terraform = TerraformS3State({
+            "statefile": "s3://foobar/{environment}",
+            "lookups": {"cluster_name": "cluster-name"}
+        }, {})
+
+    def tearDown(self):
+        terraform_outputs_cache.clear()
+
+    def test_each_statefile_is_fetched_once(self):
+        with Replacer() as r:
+            get_mock = r("deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3", Mock())
+            get_mock.side_effect = lambda url, **kwargs: self.states[url]
+            for environment in ("qa", "prod", "qa", "prod", "qa"):
+                replacements = {"{environment}": environment}
+                self.terraform.load(replacements)
+                self.assertEqual(
+                    self.terraform.lookup("cluster_name", replacements),
+                    f"foobar-cluster-{environment}"
+                )
+        compare([c.args[0] for c in get_mock.call_args_list], ["s3://foobar/qa", "s3://foobar/prod"])
+
+    def test_cache_is_shared_between_instances(self):
+        with Replacer() as r:
+            get_mock = r("deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3", Mock())
+            get_mock.side_effect = lambda url, **kwargs: self.states[url]
+            self.terraform.load({"{environment}": "qa"})
+            other = TerraformS3State(self.terraform.terraform_config, {})
+            other.load({"{environment}": "qa"})
+        self.assertEqual(get_mock.call_count, 1)
+        self.assertEqual(terraform_outputs_cache.hits, 1)
+
+    def test_least_recently_used_statefile_is_evicted(self):
+        cache = TerraformOutputsCache(maxsize=2)
+        cache.set("a", {})
+        cache.set("b", {})
+        cache.get("a")
+        cache.set("c", {})
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+
+class TestTerraformS3State_disk_cache(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(current_dir, "terraform.tfstate.0.12"), "rb") as f:
+            self.body = f.read()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.s3 = FakeS3Client({("foobar", "baz"): self.body})
+        self.replacer = Replacer()
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE_DIR", self.tmpdir.name)
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE", "true")
+        self.replacer.in_environ("DEPLOYFISH_TERRAFORM_CACHE_TTL", not_there)
+        self.replacer(
+            "deployfish.config.processors.terraform.TerraformS3State._get_s3_client",
+            lambda *args, **kwargs: self.s3
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+        terraform_outputs_cache.clear()
+        self.tmpdir.cleanup()
+
+    def get_lookups(self):
+        terraform_outputs_cache.clear()
+        terraform = TerraformS3State(YAML, {})
+        terraform.load({"{environment}": "prod"})
+        return terraform.terraform_lookups
+
+    def test_first_load_downloads_the_statefile(self):
+        lookups = self.get_lookups()
+        self.assertIn("prod-rds-address", lookups)
+        self.assertEqual(self.s3.bytes_sent, len(self.body))
+
+    def test_unchanged_statefile_is_not_downloaded_again(self):
+        first = self.get_lookups()
+        second = self.get_lookups()
+        compare(second, first)
+        self.assertEqual(self.s3.calls["get_object"], 2)
+        self.assertEqual(self.s3.bytes_sent, len(self.body))
+
+    def test_changed_statefile_is_downloaded_again(self):
+        self.get_lookups()
+        tfstate = json.loads(self.body)
+        tfstate["outputs"]["prod-rds-address"]["value"] = "changed"
+        self.s3.put("foobar", "baz", json.dumps(tfstate).encode("utf-8"))
+        self.assertEqual(self.get_lookups()["prod-rds-address"]["value"], "changed")
+        self.assertEqual(self.s3.calls["get_object"], 2)
+
+    def test_cache_holds_only_outputs(self):
+        self.get_lookups()
+        entry = terraform_state_disk_cache.read("s3://foobar/baz")
+        compare(sorted(entry["state"].keys()), ["outputs", "terraform_version"])
+        self.assertEqual(entry["etag"], self.s3.etag("foobar", "baz"))
+
+    def test_ttl_skips_revalidation(self):
+        self.get_lookups()
+        self.replacer.in_environ("DEPLOYFISH_TERRAFORM_CACHE_TTL", "3600")
+        del self.s3.objects[("foobar", "baz")]
+        self.assertIn("prod-rds-address", self.get_lookups())
+        self.assertEqual(self.s3.calls["get_object"], 1)
+
+    def test_disabled_cache_always_downloads(self):
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE", "false")
+        self.get_lookups()
+        self.get_lookups()
+        self.assertEqual(self.s3.bytes_sent, 2 * len(self.body))
+
+    def test_missing_statefile_raises(self):
+        del self.s3.objects[("foobar", "baz")]
+        with self.assertRaises(NoSuchTerraformStateFile):
+            self.get_lookups()
+
+
+class TestTerraformS3State_read_state(unittest.TestCase):
+
+    def setUp(self):
+        self.current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.terraform = TerraformS3State(YAML, {})
+
+    def read(self, filename):
+        with open(os.path.join(self.current_dir, filename), "rb") as f:
+            body = f.read()
+        stream = io.BytesIO(body)
+        return json.loads(body), self.terraform.read_state(stream), stream
+
+    def test_pre_version_12_outputs_match_full_parse(self):
+        tfstate, state, _ = self.read("terraform.tfstate")
+        compare(self.terraform.get_outputs(state), self.terraform.get_outputs(tfstate))
+        compare([m["path"] for m in state["modules"]], [["root"]])
+
+    def test_post_version_12_outputs_match_full_parse(self):
+        tfstate, state, _ = self.read("terraform.tfstate.0.12")
+        compare(state, {"terraform_version": tfstate["terraform_version"], "outputs": tfstate["outputs"]})
+
+    def test_reading_stops_after_outputs(self):
+        tfstate = {
+            "version": 4,
+            "terraform_version": "1.5.7",
+            "outputs": {"foo": {"value": "bar", "type": "string"}},
+            "resources": [{"name": f"resource-{i}", "instances": [{"attributes": {"id": i}}]} for i in range(10000)],
+        }
+        body = json.dumps(tfstate).encode("utf-8")
+        stream = io.BytesIO(body)
+        compare(self.terraform.read_state(stream), {"terraform_version": "1.5.7", "outputs": tfstate["outputs"]})
+        self.assertLess(stream.tell(), len(body) // 2)
+
+
+class TestTerraformEnterpriseState(unittest.TestCase):
+
+    def setUp(self):
+        terraform_outputs_cache.clear()
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(current_dir, "terraform.tfstate.0.12")) as f:
+            self.tfstate = json.loads(f.read())
+        self.server = FakeTFEServer(self.tfstate).start()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.replacer = Replacer()
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE_DIR", self.tmpdir.name)
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE", "true")
+        self.replacer.in_environ("DEPLOYFISH_TERRAFORM_CACHE_TTL", not_there)
+        self.replacer.in_environ("ATLAS_TOKEN", not_there)
+        self.replacer.replace(
+            "deployfish.config.processors.terraform.TerraformEnterpriseState.TERRAFORM_API_ENDPOINT",
+            self.server.url + "/api/v2"
+        )
+        self.replacer.replace("deployfish.config.processors.terraform.TerraformEnterpriseState._session", None)
+
+    def tearDown(self):
+        session = TerraformEnterpriseState._session
+        self.replacer.restore()
+        if session is not None:
+            session.close()
+        self.server.stop()
+        terraform_outputs_cache.clear()
+        self.tmpdir.cleanup()
+
+    def get_lookups(self):
+        terraform = TerraformEnterpriseState(
+            {"organization": "my-org", "workspace": "my-workspace", "lookups": {}},
+            {"tfe_token": "token"}
+        )
+        terraform.load({})
+        return terraform.terraform_lookups
+
+    def test_load(self):
+        compare(self.get_lookups(), self.tfstate["outputs"])
+        compare(self.server.queries[0], {
+            "filter[organization][name]": ["my-org"],
+            "filter[workspace][name]": ["my-workspace"],
+            "page[size]": ["1"],
+        })
+
+    def test_connections_are_reused(self):
+        self.get_lookups()
+        self.get_lookups()
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_unchanged_serial_skips_download(self):
+        self.get_lookups()
+        terraform_outputs_cache.clear()
+        compare(self.get_lookups(), self.tfstate["outputs"])
+        self.assertEqual(self.server.calls["/api/v2/state-versions"], 2)
+        self.assertEqual(self.server.calls["/state/1"], 1)
+
+    def test_changed_serial_downloads_again(self):
+        self.get_lookups()
+        self.server.serial = 2
+        self.server.tfstate = {"terraform_version": "1.5.7", "outputs": {"foo": {"value": "bar"}}}
+        compare(self.get_lookups(), {"foo": {"value": "bar"}})
+        self.assertEqual(self.server.calls["/state/2"], 1)
+
+    def test_bad_token_raises(self):
+        self.server.token = "other"
+        with self.assertRaises(ConfigProcessingFailed):
+            self.get_lookups()
+
+    def test_no_token_raises(self):
+        with self.assertRaises(ConfigProcessingFailed):
+            TerraformEnterpriseState({"organization": "my-org", "workspace": "my-workspace"}, {"tfe_token": None})
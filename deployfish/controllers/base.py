@@ -99,6 +99,15 @@ class Base(Controller):
                     "help": "Terraform Enterprise API Token"
                 }
             ),
+            (
+                ["--compiled-config"],
+                {
+                    "dest": "compiled_config",
+                    "action": "store",
+                    "default": None,
+                    "help": "Path to a config compiled by 'deploy config compile'.  Used only if it is up to date."
+                }
+            ),
             (
                 ["--ignore-missing-environment"],
                 {
@@ -178,6 +187,42 @@ class BaseServiceSecrets(ECSServiceSecrets):
         for task, env_file in list(tasks.items()):
             self._write_env_file(env_file, task, StandaloneTask)
 
+    @ex(
+        help=(
+            "Interpolate deployfish.yml and save the result for use with --compiled-config.  WARNING: the result "
+            "holds every interpolated value, including environment variables and Terraform outputs, so it may "
+            "contain secrets.  Do not commit it; add it to your .gitignore."
+        ),
+        arguments=[
+            (
+                ["output"],
+                {
+                    "help": "The file to write the compiled config to.  Keep it out of version control.",
+                    "nargs": "?",
+                    "default": "deployfish.compiled.json"
+                }
+            ),
+        ]
+    )
+    @handle_model_exceptions
+    def compile(self):
+        """
+        Fully interpolate deployfish.yml, and write the result along with
+        fingerprints of deployfish.yml, any env_files and any Terraform state
+        files to a JSON file.  Later commands given that file with
+        --compiled-config will use it directly as long as none of those have
+        changed, skipping YAML parsing, env file loading, Terraform state
+        downloads and interpolation.
+
+        The compiled config holds fully interpolated values, which may include
+        secrets, so it is only readable by its owner and should never be
+        committed.
+        """
+        # Always compile from scratch, even if we were given --compiled-config
+        self.app.pargs.compiled_config = None
+        self.app.deployfish_config.write_compiled(self.app.pargs.output)
+        click.secho(f"Wrote compiled config to {self.app.pargs.output}", fg="green")
+
 
 class BaseServiceSSH(ECSServiceSSH):
 
@@ -13,7 +13,7 @@ from deployfish.core.models import (
 from deployfish.renderers.table import TableRenderer
 
 from ..exceptions import ObjectDoesNotExist
-from .crud import CrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, CrudBase
 from .network import ObjectSSHController
 from .utils import handle_model_exceptions
 
@@ -122,12 +122,13 @@ class ECSCluster(CrudBase):
                     "default": None,
                     "dest": "cluster_name"
                 }
-            )
+            ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(cluster_name=self.app.pargs.cluster_name)
+        results = self.list_results(cluster_name=self.app.pargs.cluster_name)
         self.render_list(results)
 
     @ex(
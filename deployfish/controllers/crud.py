@@ -1,5 +1,7 @@
-from collections.abc import Sequence
-from typing import Any
+import itertools
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, cast
 
 import botocore
 import click
@@ -7,11 +9,37 @@ from cement import ex, shell
 
 from deployfish.core.loaders import ObjectLoader
 from deployfish.core.models import Model
+from deployfish.core.models.abstract import batch_together, identity_map
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
-from deployfish.renderers.table import TableRenderer
+from deployfish.renderers.table import (
+    CSVRenderer,
+    JSONLinesRenderer,
+    StreamingRenderer,
+    StreamingTableRenderer,
+    TableRenderer,
+)
 
 from .utils import handle_model_exceptions
 
+# ========================
+# Arguments
+# ========================
+
+#: The ``--output`` option for ``list`` commands.  Add this to the ``arguments``
+#: of any :py:meth:`ReadOnlyCrudBase.list` override, and get the results with
+#: :py:meth:`ReadOnlyCrudBase.list_results`.
+LIST_OUTPUT_ARGUMENT: tuple[list[str], dict[str, Any]] = (
+    ["--output"],
+    {
+        "help": "Output format.  jsonl, csv and table-stream print results as they are loaded, in the order "
+                "AWS returns them.",
+        "action": "store",
+        "default": "table",
+        "choices": ["table", "jsonl", "csv", "table-stream"],
+        "dest": "output"
+    }
+)
+
 # ========================
 # Controllers
 # ========================
@@ -33,6 +61,9 @@ class ReadOnlyCrudBase(Controller):
     # --------------------
     #: Which template should we use when showing :py:meth:`info` output?
     info_template: str = "detail.jinja2"
+    #: The related objects :py:attr:`info_template` uses, to load before
+    #: rendering it.  See :py:meth:`deployfish.core.models.abstract.Manager.prefetch_related`
+    info_prefetch_related: tuple[str, ...] = ()
 
     # --------------------
     # .list() related vars
@@ -42,6 +73,18 @@ class ReadOnlyCrudBase(Controller):
     #: Configuration for :py:class:`deployfish.renderers.table.TableRenderer`, which
     #: we use to render our tabular output.
     list_result_columns: dict[str, Any] = {}
+    #: The related objects :py:attr:`list_result_columns` use, to load for all
+    #: the results at once before rendering them.  See
+    #: :py:meth:`deployfish.core.models.abstract.Manager.prefetch_related`
+    list_prefetch_related: tuple[str, ...] = ()
+    #: The renderers for the streaming formats of ``--output``
+    list_stream_renderers: dict[str, type[StreamingRenderer]] = {
+        "jsonl": JSONLinesRenderer,
+        "csv": CSVRenderer,
+        "table-stream": StreamingTableRenderer,
+    }
+    #: When streaming, how many results to load related objects for and print at once
+    list_stream_chunk_size: int = 100
 
     def _default(self):
         """
@@ -85,30 +128,79 @@ class ReadOnlyCrudBase(Controller):
         """
         loader = self.loader(self)
         obj = loader.get_object_from_aws(self.app.pargs.pk)
+        if self.info_prefetch_related:
+            self.model.objects.prefetch_related([obj], *self.info_prefetch_related)
         self.app.render({"obj": obj}, template=self.info_template)
 
     # List
 
-    def render_list(self, results: Sequence[Model]) -> None:
+    @property
+    def list_output(self) -> str:
+        """
+        The ``--output`` format for :py:meth:`list`.  Commands without a ``--output`` option get ``table``.
+        """
+        return getattr(self.app.pargs, "output", None) or "table"
+
+    def list_results(self, *args, **kwargs) -> Iterable[Model]:
+        """
+        Get the results for :py:meth:`list` by passing ``args`` and ``kwargs`` to our model's manager.  For the
+        streaming ``--output`` formats, this is the lazy iterator from
+        :py:meth:`deployfish.core.models.abstract.Manager.iterator`, so that we can print results as they are loaded
+        instead of after all of them have been.
+        """
+        if self.list_output in self.list_stream_renderers:
+            return self.model.objects.iterator(*args, **kwargs)
+        return self.model.objects.list(*args, **kwargs)
+
+    def stream_chunks(self, results: Iterable[Model]) -> Iterator[Model]:
+        """
+        Yield ``results`` back, having loaded their related objects :py:attr:`list_stream_chunk_size` results at a
+        time, so that we get most of the benefit of :py:attr:`list_prefetch_related` without holding every result
+        in memory.  A batch holds its results only weakly, so each chunk can be freed once it has been rendered.
+        """
+        results = iter(results)
+        while chunk := list(itertools.islice(results, self.list_stream_chunk_size)):
+            batch_together(chunk)
+            if self.list_prefetch_related:
+                self.model.objects.prefetch_related(chunk, *self.list_prefetch_related)
+            yield from chunk
+
+    def render_list(self, results: Iterable[Model]) -> None:
         """
         Helper method that renders output from self.list() so that we can override .list() without
         having to re-implement this.
 
-
+        For the streaming ``--output`` formats, print each chunk of :py:attr:`list_stream_chunk_size` lines
+        as soon as we have it.  We suspend the identity map while we do, since it would otherwise hold on to every
+        related object we load.
         """
+        if self.list_output in self.list_stream_renderers:
+            renderer = self.list_stream_renderers[self.list_output](columns=self.list_result_columns)
+            with identity_map.suspended():
+                lines = renderer.render_lines(self.stream_chunks(results))
+                while chunk := list(itertools.islice(lines, self.list_stream_chunk_size)):
+                    self.app.print("\n".join(chunk))
+                    sys.stdout.flush()
+            return
+        results = cast("Sequence[Model]", results)
+        if self.list_prefetch_related:
+            self.model.objects.prefetch_related(results, *self.list_prefetch_related)
         renderer = TableRenderer(
             columns=self.list_result_columns,
             ordering=self.list_ordering
         )
         self.app.print(renderer.render(results))
 
-    @ex(help="List objects in AWS")
+    @ex(
+        help="List objects in AWS",
+        arguments=[LIST_OUTPUT_ARGUMENT]
+    )
     @handle_model_exceptions
     def list(self):
         """
         List objects in AWS.
         """
-        results = self.model.objects.list()
+        results = self.list_results()
         self.render_list(results)
 
 
@@ -3,7 +3,7 @@ from cement import ex
 
 from deployfish.core.models import ClassicLoadBalancer, Model
 
-from .crud import ReadOnlyCrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, ReadOnlyCrudBase
 from .utils import handle_model_exceptions
 
 
@@ -62,11 +62,12 @@ class EC2ClassicLoadBalancer(ReadOnlyCrudBase):
                     "dest": "scheme"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             vpc_id=self.app.pargs.vpc_id,
             scheme=self.app.pargs.scheme,
             name=self.app.pargs.name
@@ -5,7 +5,7 @@ from cement import ex
 from deployfish.core.models import LoadBalancer, Model
 from deployfish.core.models.elbv2 import LoadBalancerListener, TargetGroup
 
-from .crud import ReadOnlyCrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, ReadOnlyCrudBase
 from .utils import handle_model_exceptions
 
 
@@ -76,11 +76,12 @@ class EC2LoadBalancer(ReadOnlyCrudBase):
                     "dest": "scheme"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             vpc_id=self.app.pargs.vpc_id,
             lb_type=self.app.pargs.lb_type,
             scheme=self.app.pargs.scheme,
@@ -119,12 +120,13 @@ class EC2LoadBalancerListener(ReadOnlyCrudBase):
     @ex(
         help="List Load Balancer Listeners in AWS",
         arguments=[
-            (["load_balancer"], {"help": "Load balancer name or ARN"})
+            (["load_balancer"], {"help": "Load balancer name or ARN"}),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(self.app.pargs.load_balancer)
+        results = self.list_results(self.app.pargs.load_balancer)
         self.render_list(results)
 
 
@@ -168,11 +170,12 @@ class EC2LoadBalancerTargetGroup(ReadOnlyCrudBase):
                     "dest": "load_balancer"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             load_balancer=self.app.pargs.load_balancer
         )
         self.render_list(results)
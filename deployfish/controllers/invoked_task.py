@@ -4,7 +4,7 @@ from cement import ex
 
 from deployfish.core.models import InvokedTask, Model
 
-from .crud import ReadOnlyCrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, ReadOnlyCrudBase
 from .utils import handle_model_exceptions
 
 
@@ -75,11 +75,12 @@ class ECSInvokedTask(ReadOnlyCrudBase):
                     "dest": "launch_type"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             self.app.pargs.cluster,
             service=self.app.pargs.service,
             family=self.app.pargs.family,
@@ -14,7 +14,7 @@ from deployfish.core.models import (
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.renderers.table import TableRenderer
 
-from .crud import ReadOnlyCrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, ReadOnlyCrudBase
 from .utils import handle_model_exceptions
 
 
@@ -147,11 +147,12 @@ class LogsCloudWatchLogGroup(ReadOnlyCrudBase):
                     "dest": "prefix"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             prefix=self.app.pargs.prefix,
         )
         self.render_list(results)
@@ -275,11 +276,12 @@ class LogsCloudWatchLogStream(ReadOnlyCrudBase):
                     "dest": "limit"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             self.app.pargs.log_group_name,
             prefix=self.app.pargs.prefix,
             limit=self.app.pargs.limit
@@ -5,7 +5,7 @@ from cement import ex, shell
 
 from deployfish.core.adapters.deployfish.secrets import parse_secret_string
 from deployfish.core.loaders import ObjectLoader
-from deployfish.core.models import Model, Secret
+from deployfish.core.models import Model, secret_store
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.types import SupportsModelWithSecrets
 
@@ -53,7 +53,7 @@ class ObjectSecretsController(Controller):
                 env_var = value[6:-1]
                 env_vars[key] = env_var
         # Load their values form AWS
-        secrets = Secret.objects.list(obj.secrets_prefix)
+        secrets = secret_store.list(obj.secrets_prefix)
         lines = []
         for secret in secrets:
             if secret.secret_name in env_vars:
@@ -94,7 +94,7 @@ class ObjectSecretsController(Controller):
         raw = loader.get_object_from_deployfish(self.app.pargs.pk)
         assert hasattr(raw, "secrets_prefix"), f'Models of type "{raw.__class__.__name__} do not have secrets.'
         obj = cast("SupportsModelWithSecrets", raw)
-        other = Secret.objects.list(obj.secrets_prefix)
+        other = secret_store.list(obj.secrets_prefix)
         title = f'\nDiffing secrets for {self.model.__name__}(pk="{obj.pk}"):'
         self.app.print(title)
         self.app.print("=" * len(title))
@@ -132,7 +132,7 @@ class ObjectSecretsController(Controller):
         raw = loader.get_object_from_deployfish(self.app.pargs.pk)
         assert hasattr(raw, "secrets_prefix"), f'Models of type "{raw.__class__.__name__} do not have secrets.'
         obj = cast("SupportsModelWithSecrets", raw)
-        other = Secret.objects.list(obj.secrets_prefix)
+        other = secret_store.list(obj.secrets_prefix)
         if not self.app.pargs.force:
             changes = obj.diff_secrets(other, ignore_external=True)
             if not changes:
@@ -159,8 +159,10 @@ class ObjectSecretsController(Controller):
                 )
                 return
         self.app.print("Writing secrets ...")
-        obj.write_secrets()
-        self.app.print("Done.")
+        counts = obj.write_secrets(live=other)
+        self.app.print(
+            "Done: {written} written, {skipped} unchanged, {deleted} deleted.".format(**counts)
+        )
         obj.reload_secrets()
         self.app.render({"obj": obj.secrets}, template=self.show_template)
 
@@ -1,5 +1,4 @@
 import argparse
-import json
 import os
 from datetime import datetime
 from typing import cast
@@ -7,7 +6,6 @@ from typing import cast
 import botocore
 import click
 from cement import ex
-from jsondiff import diff
 
 from deployfish.controllers.network import (
     ObjectDockerExecController,
@@ -18,12 +16,13 @@ from deployfish.controllers.tunnel import ObjectTunnelController
 from deployfish.controllers.utils import handle_model_exceptions
 from deployfish.core.loaders import ObjectLoader, ServiceLoader
 from deployfish.core.models import Model, Service, StandaloneTask
+from deployfish.core.utils.diff import diff
 from deployfish.core.waiters.hooks.ecs import ECSDeploymentStatusWaiterHook
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.renderers.table import TableRenderer
 
 from ..core.ssh import DockerMixin
-from .crud import CrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, CrudBase
 
 
 def valid_date(s):
@@ -53,6 +52,7 @@ class ECSService(CrudBase):
     }
 
     info_template: str = "detail--service.jinja2"
+    info_prefetch_related: tuple[str, ...] = ("task_definition", "load_balancers")
     plan_template: str = "plan--service.jinja2"
 
     list_ordering: str = "Service"
@@ -65,6 +65,7 @@ class ECSService(CrudBase):
         "P": "pendingCount",
         "Updated": "last_updated",
     }
+    list_prefetch_related: tuple[str, ...] = ("cluster", "task_definition")
 
     create_template: str = "detail--service--short.jinja2"
     update_template = delete_template = create_template
@@ -129,6 +130,8 @@ class ECSService(CrudBase):
     def info(self):
         loader = self.loader(self)
         obj = loader.get_object_from_aws(self.app.pargs.pk)
+        if self.info_prefetch_related:
+            self.model.objects.prefetch_related([obj], *self.info_prefetch_related)
         context = {
             "obj": obj,
             "includes": self.app.pargs.includes if self.app.pargs.includes else [],
@@ -187,11 +190,12 @@ class ECSService(CrudBase):
                     "type": valid_date
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             cluster_name=self.app.pargs.cluster_name,
             service_name=self.app.pargs.service_name,
             launch_type=self.app.pargs.launch_type,
@@ -316,7 +320,7 @@ class ECSService(CrudBase):
         # Instead of using AbstractModel.diff() method, we'll collect the json data to pass to our template.
         df_json = df_obj.render_for_diff()
         aws_json = aws_obj.render_for_diff()
-        changes = json.loads(diff(aws_json, df_json, syntax="explicit", dump=True))
+        changes = diff(aws_json, df_json)
         self.app.log.debug(f"Changes: {changes}")
         self.app.render(
             {
@@ -370,13 +374,11 @@ class ECSServiceStandaloneTasks(Controller):
             factory_kwargs={"load_secrets": False}
         )
         tasks = []
-        config = self.app.deployfish_config.cooked
-        if "tasks" in config:
-            for task_data in config["tasks"]:
-                if "service" in task_data:
-                    if (task_data["service"] == obj.pk or task_data["service"] == obj.name):
-                        tasks.append(task_data["name"])
-            tasks.sort()
+        for task_data in self.app.deployfish_config.get_section_for_lookup("tasks", keys=("name", "service")):
+            if "service" in task_data:
+                if (task_data["service"] == obj.pk or task_data["service"] == obj.name):
+                    tasks.append(task_data["name"])
+        tasks.sort()
         if tasks:
             for task in tasks:
                 self.app.print(task)
@@ -413,13 +415,11 @@ class ECSServiceStandaloneTasks(Controller):
             factory_kwargs={"load_secrets": False}
         )
         tasks = []
-        config = self.app.deployfish_config.cooked
-        if "tasks" in config:
-            for task_data in config["tasks"]:
-                if "service" in task_data:
-                    if (task_data["service"] == obj.pk or task_data["service"] == obj.name):
-                        tasks.append(task_data["name"])
-            tasks.sort()
+        for task_data in self.app.deployfish_config.get_section_for_lookup("tasks", keys=("name", "service")):
+            if "service" in task_data:
+                if (task_data["service"] == obj.pk or task_data["service"] == obj.name):
+                    tasks.append(task_data["name"])
+        tasks.sort()
         if tasks:
             self.app.print(click.style(f'\n\nUpdating StandaloneTasks related to Service("{obj.pk}"):\n', fg="yellow"))
             for task in tasks:
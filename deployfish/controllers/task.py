@@ -1,18 +1,17 @@
 import argparse
-import json
 from collections.abc import Sequence
 from typing import Any, cast
 
 import click
 from cement import ex
-from jsondiff import diff
 
 from deployfish.core.loaders import ObjectLoader
 from deployfish.core.models import InvokedTask, Model, StandaloneTask
+from deployfish.core.utils.diff import diff
 from deployfish.core.waiters.hooks.ecs import ECSTaskStatusHook
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 
-from .crud import CrudBase
+from .crud import LIST_OUTPUT_ARGUMENT, CrudBase
 from .logs import list_log_streams, tail_task_logs
 from .secrets import ObjectSecretsController
 from .utils import handle_model_exceptions
@@ -150,11 +149,12 @@ class ECSStandaloneTask(CrudBase):
                     "dest": "all_revisions",
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             scheduled_only=self.app.pargs.scheduled_only,
             all_revisions=self.app.pargs.all_revisions,
             task_type=self.app.pargs.task_type,
@@ -325,7 +325,7 @@ Run a StandaloneTask that exists in AWS.
         # Instead of using AbstractModel.diff() method, we'll collect the json data to pass to our template.
         df_json = df_obj.render_for_diff()
         aws_json = aws_obj.render_for_diff()
-        changes = json.loads(diff(aws_json, df_json, syntax="explicit", dump=True))
+        changes = diff(aws_json, df_json)
         self.app.log.debug(f"Changes: {changes}")
         self.app.render(
             {
@@ -5,7 +5,7 @@ import click
 from cement import ex, shell
 from tabulate import tabulate
 
-from deployfish.controllers.crud import ReadOnlyCrudBase
+from deployfish.controllers.crud import LIST_OUTPUT_ARGUMENT, ReadOnlyCrudBase
 from deployfish.controllers.utils import handle_model_exceptions
 from deployfish.core.loaders import ObjectLoader
 from deployfish.core.models import Model, Instance, SSHTunnel
@@ -297,11 +297,12 @@ class Tunnels(ReadOnlyCrudBase):
                     "dest": "port"
                 }
             ),
+            LIST_OUTPUT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.list_results(
             service_name=self.app.pargs.service_name,
             port=self.app.pargs.port,
         )
@@ -5,7 +5,6 @@ import click
 
 from deployfish.core.ssh import SSHMixin
 from deployfish.exceptions import (
-    ConfigProcessingFailed,
     MultipleObjectsReturned,
     NoSuchConfigSection,
     NoSuchConfigSectionItem,
@@ -22,6 +21,10 @@ def handle_model_exceptions(func: Callable) -> Callable:
     This decorator cathces all the kinds of execptions we expect to see in normal
     operation while letting others display their stack traces normally.
 
+    :py:exc:`deployfish.exceptions.ConfigProcessingFailed` is left for
+    ``deployfish.main.main`` to report, so that we exit non-zero when
+    ``deployfish.yml`` can't be interpolated.
+
     We use this decorator to wrap cement command methods on
     :py:class:`cement.ext.ext_argparse.ArgparseController` subclasses.
     """
@@ -37,7 +40,6 @@ def handle_model_exceptions(func: Callable) -> Callable:
             self.model.ReadOnly,
             self.loader.DeployfishSectionDoesNotExist,
             SchemaException,
-            ConfigProcessingFailed,
             NoSuchConfigSection,
             SSHMixin.NoSSHTargetAvailable
         ) as e:
@@ -48,10 +50,13 @@ def handle_model_exceptions(func: Callable) -> Callable:
             lines.append(
                 click.style(f'Available {self.model.__name__}s in the "{e.section}:" section of deployfish.yml:', fg="cyan")
             )
-            for item in self.app.deployfish_config.get_section(e.section):
+            # We only need their names, so don't interpolate the whole section
+            # just to print them
+            section = self.app.deployfish_config.get_section_for_lookup(e.section)
+            for item in section:
                 lines.append("  {}".format(item["name"]))
             environments = []
-            for item in self.app.deployfish_config.get_section(e.section):
+            for item in section:
                 if "environment" in item:
                     environments.append("  {}".format(item["environment"]))
             if environments:
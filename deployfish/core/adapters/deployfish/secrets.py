@@ -1,7 +1,7 @@
 from copy import deepcopy
 from typing import Any, cast
 
-from deployfish.core.models import ExternalSecret, Secret
+from deployfish.core.models import ExternalSecret, Secret, secret_store
 
 from ..abstract import Adapter
 
@@ -59,12 +59,18 @@ class SecretsMixin:
         secrets = None
         if "config" in self.data:
             secrets = []
+            # Load all our external parameters from AWS up front, in as few
+            # calls as we can
+            secret_store.prefetch(
+                [secret for secret in self.data["config"] if SecretAdapter({"value": secret}).is_external()],
+                decrypt=decrypt
+            )
             for secret in self.data["config"]:
                 try:
                     secrets.append(Secret.new({"value": secret}, "deployfish", cluster=cluster, name=name))
                 except SecretAdapter.ExternalParameterException:
                     # handle globs
-                    secrets.extend(ExternalSecret.objects.list(secret, decrypt=decrypt))
+                    secrets.extend(secret_store.list(secret, model=ExternalSecret, decrypt=decrypt))
         return cast("list[Secret]", secrets)
 
 
@@ -0,0 +1,81 @@
+import unittest
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.adapters.deployfish.secrets import SecretsMixin
+from deployfish.core.models import ExternalSecret, Secret, SecretStore
+from deployfish.core.models.test.fake_ssm import FakeSSMClient
+
+
+class FakeAdapter(SecretsMixin):
+
+    def __init__(self, config):
+        self.data = {"config": config}
+
+
+class TestSecretsMixin_get_secrets(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeSSMClient({
+            "shared.db.HOST": "db.example.com",
+            "shared.db.PORT": "3306",
+            "shared.db.USER": "dbuser",
+            "shared.cache.HOST": "cache.example.com",
+            "shared.cache.PORT": "6379",
+            "global.SENTRY_DSN": "https://sentry.example.com",
+        })
+        self.store = SecretStore()
+        self.replacer = Replacer()
+        self.replacer(
+            "deployfish.core.models.secrets.SecretManager.client", property(lambda _: self.client), strict=False
+        )
+        self.replacer("deployfish.core.models.secrets.secret_store", self.store)
+        self.replacer("deployfish.core.adapters.deployfish.secrets.secret_store", self.store)
+        self.config = [
+            "DEBUG=False",
+            "shared.db.HOST",
+            "shared.db.PORT",
+            "shared.db.USER",
+            "shared.cache.*",
+            "global.SENTRY_DSN",
+        ]
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_external_secrets_are_resolved(self):
+        secrets = FakeAdapter(self.config).get_secrets("foobar-cluster", "foobar", decrypt=False)
+        compare(
+            [(s.__class__, s.pk) for s in secrets],
+            [
+                (Secret, "foobar-cluster.foobar.DEBUG"),
+                (ExternalSecret, "shared.db.HOST"),
+                (ExternalSecret, "shared.db.PORT"),
+                (ExternalSecret, "shared.db.USER"),
+                (ExternalSecret, "shared.cache.HOST"),
+                (ExternalSecret, "shared.cache.PORT"),
+                (ExternalSecret, "global.SENTRY_DSN"),
+            ]
+        )
+
+    def test_external_secrets_are_scanned_by_prefix(self):
+        FakeAdapter(self.config).get_secrets("foobar-cluster", "foobar", decrypt=False)
+        # One scan each for "shared.db.HOST", "shared.db.PORT", "shared.db.USER",
+        # "shared.cache." and "global.SENTRY_DSN"
+        compare(self.client.calls["describe_parameters"], 5)
+
+    def test_external_secrets_are_grouped_by_prefix(self):
+        self.replacer("deployfish.core.models.secrets.SecretStore.PREFETCH_WIDEN_THRESHOLD", 3)
+        FakeAdapter(self.config).get_secrets("foobar-cluster", "foobar", decrypt=False)
+        # One scan each for "shared.db.", "shared.cache." and "global.SENTRY_DSN"
+        compare(self.client.calls["describe_parameters"], 3)
+        compare(self.client.calls["get_parameters"], 3)
+
+    def test_external_secrets_are_loaded_once_for_all_services(self):
+        first = FakeAdapter(self.config).get_secrets("foobar-cluster", "foobar", decrypt=False)
+        self.client.calls.clear()
+        second = FakeAdapter(self.config).get_secrets("foobar-cluster", "barfoo", decrypt=False)
+        compare(sum(self.client.calls.values()), 0)
+        compare(first[1].data, second[1].data)
+        # ... but each service gets its own instance to change
+        self.assertIsNot(first[1], second[1])
@@ -2,8 +2,8 @@ import os
 from typing import Any, cast
 
 import boto3
-import yaml
 
+from deployfish.core.utils import load_config_file
 from deployfish.exceptions import ConfigProcessingFailed
 
 boto3_session: boto3.session.Session | None = None
@@ -28,6 +28,9 @@ class AWSSessionBuilder:
         Args:
             filename: the path to our deployfish.yml file
 
+        This shares its parse with :py:meth:`deployfish.config.Config.load_config`;
+        see :py:func:`deployfish.core.utils.load_config_file`.
+
         Returns:
             The data loaded from the YAML file.  This will not have any of the
             interpolations done.
@@ -39,8 +42,7 @@ class AWSSessionBuilder:
             raise ConfigProcessingFailed(
                 f"Deployfish config file '{filename}' exists but is not readable"
             )
-        with open(filename, encoding="utf-8") as f:
-            return yaml.load(f, Loader=yaml.FullLoader)
+        return load_config_file(filename)
 
     def new(self, filename: str, use_aws_section: bool = True) -> boto3.session.Session:
         """
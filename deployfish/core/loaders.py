@@ -173,10 +173,8 @@ class ObjectLoader:
         if not factory_kwargs:
             factory_kwargs = {}
         if model.config_section != "NO_SECTION":
-            try:
-                config.get_section(model.config_section)
-            except KeyError as e:
-                raise self.DeployfishSectionDoesNotExist(model.config_section) from e
+            if model.config_section not in config.cooked:
+                raise self.DeployfishSectionDoesNotExist(model.config_section)
             try:
                 data = config.get_section_item(model.config_section, identifier)
                 return model.new(data, "deployfish", **factory_kwargs)
@@ -1,12 +1,18 @@
-import json
-from collections.abc import Callable, Sequence
+import functools
+import threading
+import weakref
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
 from copy import deepcopy
-from typing import Any
+from typing import Any, Optional
 
 from botocore import waiter, xform_name
-from jsondiff import diff
 
 from deployfish.core.aws import get_boto3_session
+from deployfish.core.utils import run_concurrently
+from deployfish.core.utils.cow import cow
+from deployfish.core.utils.diff import diff
 from deployfish.core.waiters import create_hooked_waiter_with_client
 from deployfish.exceptions import (
     MultipleObjectsReturned as BaseMultipleObjectsReturned,
@@ -25,6 +31,9 @@ from deployfish.types import SupportsCache, SupportsModel
 
 class LazyAttributeMixin(SupportsCache):
 
+    # Empty, so that CompactModel subclasses can do without a __dict__
+    __slots__ = ()
+
     def __init__(self) -> None:
         self.cache: dict[str, Any] = {}
         super().__init__()
@@ -39,19 +48,392 @@ class LazyAttributeMixin(SupportsCache):
         self.cache = {}
 
 
+# ------------------------
+# Identity map
+# ------------------------
+
+class IdentityMap:
+    """
+    An opt-in, per-process identity map of the models we load from AWS, keyed
+    by ``(model class, pk)``.
+
+    Nothing uses it unless it asks to: code that reads the same read-only
+    object for many others, like ``InvokedTask.cluster``, ``Service.cluster``
+    or ``ContainerInstance.ec2_instance``, loads it with :py:meth:`load` or
+    :py:meth:`load_many`, and while a :py:meth:`scope` is open each such
+    object is loaded from AWS once.  ``Manager.get`` and friends never look
+    here, so fetching an object yourself always goes to AWS.  Outside of a
+    scope, nothing is remembered and :py:meth:`load` just calls its loader.
+
+    We never hand out the instances we hold: every caller gets its own
+    ``deepcopy``, so changing what you got does not change what anyone else
+    gets.
+
+    Objects are remembered under their ``pk``, their ``arn`` and the key they
+    were asked for by (e.g. a cluster name), so any of those will find them.
+    :py:meth:`Model.save`, :py:meth:`Model.delete` and
+    :py:meth:`Model.reload_from_db` forget what we knew about the objects
+    they touch; use :py:meth:`invalidate` to forget things yourself.
+
+    The ``deploy`` command opens a scope around each command it runs; when run
+    with ``--debug``, it logs our :py:meth:`stats` at the end.
+    """
+
+    def __init__(self) -> None:
+        #: The objects we've loaded, keyed by ``(model class, key)``
+        self.objects: dict[tuple[type["Model"], str], "Model"] = {}
+        #: Counts of ``hits``, ``misses``, ``stores`` and ``invalidations``,
+        #: both in total and as ``(model name, event)``
+        self.counts: Counter = Counter()
+        self._depth = 0
+        self._suspended = 0
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        ``True`` if a :py:meth:`scope` is open, and we're not :py:meth:`suspended`.
+        """
+        return self._depth > 0 and self._suspended == 0
+
+    @contextmanager
+    def scope(self) -> Iterator["IdentityMap"]:
+        """
+        Use the identity map for the duration of a ``with`` block.  Scopes may
+        be nested; when the outermost one closes, everything we've remembered
+        is forgotten.
+
+        Yields:
+            This identity map.
+
+        """
+        with self._lock:
+            if self._depth == 0:
+                self.clear()
+                self.counts.clear()
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.clear()
+
+    @contextmanager
+    def suspended(self) -> Iterator["IdentityMap"]:
+        """
+        Don't use the identity map for the duration of a ``with`` block, even
+        if a scope is open: :py:meth:`load` and :py:meth:`load_many` neither
+        look here nor remember what they load.  What we already hold is kept
+        for when the block ends.
+
+        Use this around code that streams through more objects than we should
+        hold in memory at once.
+
+        Yields:
+            This identity map.
+
+        """
+        with self._lock:
+            self._suspended += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._suspended -= 1
+
+    def _count(self, model: type["Model"], event: str, n: int = 1) -> None:
+        self.counts[event] += n
+        self.counts[(model.__name__, event)] += n
+
+    @staticmethod
+    def _keys(obj: "Model") -> list[str]:
+        keys = [obj.pk]
+        try:
+            arn = obj.arn
+        except (NotImplementedError, KeyError, AttributeError):
+            arn = None
+        if arn:
+            keys.append(arn)
+        return keys
+
+    def load(self, model: type["Model"], key: str, loader: Callable[[str], "Model"]) -> "Model":
+        """
+        Return a copy of the ``model`` object known as ``key``, calling
+        ``loader(key)`` to load it from AWS only if we don't have it yet.
+
+        Args:
+            model: the model class
+            key: a pk, ARN or other key for the object
+            loader: loads the object from AWS, e.g. ``model.objects.get``
+
+        Raises:
+            Whatever ``loader`` raises.
+
+        Returns:
+            The object.
+
+        """
+        if not self.enabled:
+            return loader(key)
+        obj = self.get(model, key)
+        if obj is None:
+            obj = self.add(model, loader(key), aliases=[key])
+        return obj
+
+    def load_many(
+        self,
+        model: type["Model"],
+        keys: Sequence[str],
+        loader: Callable[[list[str]], Sequence["Model"]]
+    ) -> list["Model"]:
+        """
+        Return copies of the ``model`` objects known as ``keys``, calling
+        ``loader`` once, with just the keys we don't have yet, to load the rest
+        from AWS.
+
+        Args:
+            model: the model class
+            keys: pks, ARNs or other keys for the objects
+            loader: loads objects from AWS, e.g. ``model.objects.get_many``
+
+        Returns:
+            The objects that we had or ``loader`` found, once each, in no
+            particular order.
+
+        """
+        if not self.enabled:
+            return list(loader(list(keys)))
+        found: dict[int, Model] = {}
+        missing = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                obj = self.objects.get((model, key))
+                self._count(model, "hits" if obj is not None else "misses")
+                if obj is None:
+                    missing.append(key)
+                else:
+                    found[id(obj)] = obj
+            objs = [deepcopy(obj) for obj in found.values()]
+        if missing:
+            objs.extend(self.add(model, obj) for obj in loader(missing))
+        return objs
+
+    def get(self, model: type["Model"], key: str) -> Optional["Model"]:
+        """
+        Return a copy of the ``model`` object we know as ``key``, if any.
+
+        Args:
+            model: the model class
+            key: a pk, ARN or other key the object was loaded by
+
+        Returns:
+            The object, or ``None``.
+
+        """
+        with self._lock:
+            obj = self.objects.get((model, key))
+            self._count(model, "hits" if obj is not None else "misses")
+            return deepcopy(obj) if obj is not None else None
+
+    def add(self, model: type["Model"], obj: "Model", aliases: Sequence[str] = ()) -> "Model":
+        """
+        Remember a copy of ``obj`` under its pk, its ARN and ``aliases``.  If
+        we already have an object under any of those, that one wins, and a
+        copy of it is returned instead of ``obj``.
+
+        Args:
+            model: the model class
+            obj: the object we just loaded from AWS
+
+        Keyword Args:
+            aliases: other keys ``obj`` was asked for by
+
+        Returns:
+            The instance to use.
+
+        """
+        keys = list(dict.fromkeys([*self._keys(obj), *aliases]))
+        with self._lock:
+            for key in keys:
+                existing = self.objects.get((model, key))
+                if existing is not None:
+                    kept = existing
+                    obj = deepcopy(existing)
+                    break
+            else:
+                kept = deepcopy(obj)
+                self._count(model, "stores")
+            for key in keys:
+                self.objects[(model, key)] = kept
+            return obj
+
+    def invalidate(self, model: type["Model"], key: str | None = None) -> None:
+        """
+        Forget the ``model`` object known as ``key`` under all of its keys, or
+        every ``model`` object if ``key`` is ``None``.
+
+        Args:
+            model: the model class
+
+        Keyword Args:
+            key: a pk, ARN or other key
+
+        """
+        with self._lock:
+            target = self.objects.get((model, key)) if key is not None else None
+            doomed = [
+                k for k, v in self.objects.items()
+                if k[0] is model and (key is None or v is target or k[1] == key)
+            ]
+            if doomed:
+                self._count(model, "invalidations", len({id(self.objects[k]) for k in doomed}))
+            for k in doomed:
+                del self.objects[k]
+
+    def clear(self) -> None:
+        """
+        Forget everything.
+        """
+        with self._lock:
+            self.objects.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return counts of what we've done in the current (or last) scope, for
+        debugging.
+
+        Returns:
+            A dict with the total ``hits``, ``misses``, ``stores`` and
+            ``invalidations``, the number of distinct objects we currently hold
+            as ``size``, and the per model class counts as ``models``.
+
+        """
+        with self._lock:
+            models: dict[str, dict[str, int]] = {}
+            for key, count in self.counts.items():
+                if isinstance(key, tuple):
+                    models.setdefault(key[0], {})[key[1]] = count
+            return {
+                "hits": self.counts["hits"],
+                "misses": self.counts["misses"],
+                "stores": self.counts["stores"],
+                "invalidations": self.counts["invalidations"],
+                "size": len({id(obj) for obj in self.objects.values()}),
+                "models": models,
+            }
+
+
+#: The process-wide :py:class:`IdentityMap`
+identity_map = IdentityMap()
+
+
+#: For each model loaded together with others, keyed by ``id()``: a weak
+#: reference to the model itself, and weak references to its whole batch.
+#: See :py:func:`batch_together`.
+_batches: dict[int, tuple[weakref.ref, list[weakref.ref]]] = {}
+
+
+def _forget_batch(key: int) -> Callable[[weakref.ref], None]:
+    def forget(ref: weakref.ref) -> None:
+        # Only if the entry is still ours: another object may have our id now
+        entry = _batches.get(key)
+        if entry is not None and entry[0] is ref:
+            del _batches[key]
+    return forget
+
+
+def batch_together(objs: Sequence[Any]) -> Sequence[Any]:
+    """
+    Remember that the models in ``objs`` were loaded together, so that the
+    first time a related object is read through :py:meth:`Model.get_batched`
+    on any of them, it is loaded for all of them at once.  This is what
+    ``Manager.list`` and ``Manager.get_many`` do with their results.
+
+    We only hold weak references to ``objs``, and keep them out of the objects
+    themselves, so being in a batch keeps neither an object nor its siblings
+    alive.
+
+    Args:
+        objs: the objects that were loaded together
+
+    Returns:
+        ``objs``, for chaining.
+
+    """
+    batch = [obj for obj in objs if isinstance(obj, Model)]
+    if len(batch) > 1:
+        refs = [weakref.ref(obj, _forget_batch(id(obj))) for obj in batch]
+        for obj, ref in zip(batch, refs):
+            _batches[id(obj)] = (ref, refs)
+    return objs
+
+
+def batch_of(obj: "Model") -> list["Model"]:
+    """
+    Return the models that ``obj`` was loaded together with, ``obj`` included,
+    that are still alive.
+
+    Args:
+        obj: the model
+
+    Returns:
+        The batch, or an empty list if ``obj`` was loaded by itself.
+
+    """
+    entry = _batches.get(id(obj))
+    if entry is None or entry[0]() is not obj:
+        return []
+    return [member for member in (ref() for ref in entry[1]) if member is not None]
+
+
+def _batched(func: Callable) -> Callable:
+    @functools.wraps(func)
+    def batched(self: "Manager", *args, **kwargs) -> Any:
+        result = func(self, *args, **kwargs)
+        if isinstance(result, list):
+            batch_together(result)
+        return result
+    return batched
+
+
 class Manager:
 
     service: str
+    #: Relations that must be prefetched before the relation named by the key
+    #: can be, because its prefetcher reads them.  See :py:meth:`prefetch_related`.
+    prefetch_dependencies: dict[str, tuple[str, ...]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        # Batch together what every subclass's list/get_many return
+        super().__init_subclass__(**kwargs)
+        for name in ("get_many", "list"):
+            if name in cls.__dict__:
+                setattr(cls, name, _batched(cls.__dict__[name]))
+
+    #: Held while any manager creates its boto3 client.  boto3 clients are
+    #: thread safe, but creating them from a shared session is not, and
+    #: :py:meth:`prefetch_related` and friends use managers from worker threads.
+    _client_lock: threading.Lock = threading.Lock()
 
     def __init__(self):
         self._client = None
+        self._client_session = None
 
     @property
     def client(self):
-        if self.service:
-            self._client = get_boto3_session().client(self.service)
-        else:
-            self._client = None
+        """
+        Our boto3 client for :py:attr:`service`.  We create it once per boto3
+        session, and share it between threads.
+        """
+        if not self.service:
+            return None
+        session = get_boto3_session()
+        with self._client_lock:
+            if self._client is None or self._client_session is not session:
+                self._client = session.client(self.service)
+                self._client_session = session
         return self._client
 
     def get(self, pk: str, **_) -> "Model":
@@ -72,6 +454,26 @@ class Manager:
 
     list: Callable[..., Sequence["Model"]]
 
+    def iterator(self, *args, **kwargs) -> Iterator["Model"]:
+        """
+        Like :py:meth:`list`, and with the same arguments, but yield the
+        objects one at a time as we load them from AWS instead of loading them
+        all first, so callers can start working on (or printing) the first
+        ones while we're still fetching the rest, and so we don't have to hold
+        them all in memory at once.
+
+        Managers that can stream their results override this, fetch a page at
+        a time, and apply any filters they can on the AWS side or before
+        describing each page, rather than after loading everything; each
+        page's objects are batched together (see :py:func:`batch_together`).
+        By default, we just iterate over :py:meth:`list`.
+
+        Yields:
+            The objects that :py:meth:`list` would return.
+
+        """
+        yield from self.list(*args, **kwargs)
+
     def delete(self, obj: "Model", **_) -> None:
         raise obj.ReadOnly(f"Cannot modify {obj.__class__.__name__} objects with deployfish.")
 
@@ -83,6 +485,50 @@ class Manager:
         aws_obj = self.get(obj.pk)
         return obj == aws_obj
 
+    def prefetch_related(self, objs: Sequence["Model"], *relations: str) -> Sequence["Model"]:
+        """
+        Load the related objects named by ``relations`` for all of ``objs`` at
+        once, and put them in each object's :py:attr:`Model.cache`, so that
+        reading e.g. ``service.task_definition`` for each of ``objs`` afterwards
+        does not go to AWS once per object.
+
+        Each relation ``foo`` is loaded by our ``prefetch_foo(objs)`` method,
+        which gathers the distinct keys across ``objs``, loads them with as few
+        (or as concurrent) AWS calls as it can and seeds ``obj.cache["foo"]``.
+        Objects that already have ``foo`` in their cache are left alone.
+        Independent relations are loaded concurrently; relations listed in
+        :py:attr:`prefetch_dependencies` are loaded first.
+
+        Args:
+            objs: the objects to prefetch for, e.g. the results of :py:meth:`list`
+            *relations: the names of the relations to prefetch
+
+        Raises:
+            ValueError: we don't know how to prefetch one of ``relations``
+
+        Returns:
+            ``objs``, for chaining.
+
+        """
+        if not objs or not relations:
+            return objs
+        for relation in relations:
+            if not hasattr(self, f"prefetch_{relation}"):
+                raise ValueError(f'{self.__class__.__name__}: don\'t know how to prefetch "{relation}"')
+        first = [
+            dependency for relation in relations
+            for dependency in self.prefetch_dependencies.get(relation, ())
+        ]
+        for batch in (first, relations):
+            batch = list(dict.fromkeys(batch))
+            run_concurrently(
+                lambda relation: getattr(self, f"prefetch_{relation}")(
+                    [obj for obj in objs if relation not in obj.cache]
+                ),
+                [(relation,) for relation in batch]
+            )
+        return objs
+
     def get_waiter(self, waiter_name: str):
         config = self.client._get_waiter_config()  # pylint:disable=protected-access
         if not config:
@@ -98,6 +544,8 @@ class Manager:
 
 class Model(LazyAttributeMixin, SupportsModel):
 
+    __slots__ = ()
+
     objects: Manager
     adapters = importer_registry
     config_section: str = "NO_SECTION"
@@ -195,17 +643,32 @@ class Model(LazyAttributeMixin, SupportsModel):
         return self.render()
 
     def render(self) -> dict[str, Any]:
-        data = deepcopy(self.data)
-        return data
+        """
+        Return our :py:attr:`data` for the ``render_for_*`` methods to work on.
+
+        This is a copy-on-write view of :py:attr:`data` (see
+        :py:func:`deployfish.core.utils.cow.cow`): you can change it at any
+        depth without changing :py:attr:`data`, but only what you change gets
+        copied, so rendering just to read (display, diffs, ``==``) is cheap.
+        """
+        return cow(self.data)
 
     def save(self):
-        return self.objects.save(self)
+        try:
+            return self.objects.save(self)
+        finally:
+            # Forget every object of this class, not just us: aliases like a
+            # cluster name may now refer to something else
+            identity_map.invalidate(self.__class__)
 
     def delete(self) -> None:
-        self.objects.delete(self)
+        try:
+            self.objects.delete(self)
+        finally:
+            identity_map.invalidate(self.__class__)
 
     def copy(self) -> "Model":
-        return self.__class__(self.render_for_create())
+        return self.__class__(deepcopy(self.render_for_create()))
 
     def __eq__(self, other) -> bool:
         if self.__class__ != other.__class__:
@@ -217,12 +680,74 @@ class Model(LazyAttributeMixin, SupportsModel):
             other = self.objects.get(self.pk)
         if self.__class__ != other.__class__:
             raise ValueError(f"{other!s} is not a {self.__class__.__name__}")
-        return json.loads(diff(other.render_for_diff(), self.render_for_diff(), syntax="explicit", dump=True))
+        return diff(other.render_for_diff(), self.render_for_diff())
+
+    def get_batched(self, key: str, populator: Callable, args: list[Any], kwargs: dict[str, Any] = None) -> Any:
+        """
+        Like :py:meth:`get_cached`, but if we were loaded together with other
+        objects (see :py:func:`batch_together`) and our manager has a
+        ``prefetch_{key}`` method, first load ``key`` for every object in our
+        batch that doesn't have it yet, with
+        :py:meth:`Manager.prefetch_related`.  Thus code that reads
+        ``task.container_instance`` for each of a list of tasks makes one
+        describe call for all of them, not one per task.
+
+        If the batch load doesn't find anything for us, fall back to
+        ``populator(*args, **kwargs)``, as :py:meth:`get_cached` would.
+
+        Args:
+            key: the key in :py:attr:`cache`, and the name of the relation
+            populator: the function that loads the value for just us
+            args: the positional arguments for ``populator``
+
+        Keyword Args:
+            kwargs: the keyword arguments for ``populator``
+
+        Returns:
+            The value of ``key``.
+
+        """
+        if key not in self.cache and hasattr(self.objects, f"prefetch_{key}"):
+            pending = [obj for obj in batch_of(self) if key not in obj.cache and type(obj) is type(self)]
+            if len(pending) > 1:
+                self.objects.prefetch_related(pending, key)
+        return self.get_cached(key, populator, args, kwargs)
 
     def reload_from_db(self) -> None:
         self.purge_cache()
+        identity_map.invalidate(self.__class__, self.pk)
         new = self.objects.get(self.pk)
         self.data = new.data
 
     def __str__(self) -> str:
         return f'{self.__class__.__name__}(pk="{self.pk}")'
+
+
+class CompactModel(Model):
+    """
+    A :py:class:`Model` for things we may load thousands of at a time and
+    mostly just look at, like running tasks, log streams, target group targets
+    and SSM parameters.
+
+    Instances use ``__slots__`` instead of a ``__dict__``, and don't create
+    their :py:attr:`cache` until something is put in it, which roughly halves
+    the memory each one needs.  Subclasses must declare ``__slots__`` too,
+    listing any attributes they set beyond ``data``, or they get a
+    ``__dict__`` back; so must any mixins they use.
+    """
+
+    __slots__ = ("data", "_cache", "__weakref__")
+
+    @property
+    def cache(self) -> dict[str, Any]:  # type: ignore[override]
+        if self._cache is None:
+            self._cache = {}
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: dict[str, Any]) -> None:
+        # Don't bother holding on to an empty dict
+        self._cache = value if value else None
+
+    def purge_cache(self) -> None:
+        self._cache = None
@@ -1,6 +1,8 @@
 from collections.abc import Sequence
 from typing import Any, cast
 
+from deployfish.core.utils import run_concurrently
+
 from .abstract import Manager, Model
 from .cloudwatch import CloudwatchAlarm
 
@@ -90,6 +92,23 @@ class ScalableTargetManager(Manager):
         policies = ScalingPolicy.objects.list(cluster, service)
         return ScalableTarget(data, policies=policies)
 
+    def get_many(self, pks: list[str], **_) -> Sequence["ScalableTarget"]:
+        """
+        Get the ScalableTargets with resource ids in ``pks``.  Unlike
+        :py:meth:`get`, any that don't exist are just left out.
+        """
+        targets = []
+        paginator = self.client.get_paginator("describe_scalable_targets")
+        # describe_scalable_targets accepts at most 50 resource ids
+        for i in range(0, len(pks), 50):
+            for response in paginator.paginate(ResourceIds=pks[i:i + 50], ServiceNamespace="ecs"):
+                targets.extend(response["ScalableTargets"])
+        policies = run_concurrently(
+            ScalingPolicy.objects.list,
+            [tuple(data["ResourceId"].split("/")[1:]) for data in targets]
+        )
+        return [ScalableTarget(data, policies=p) for data, p in zip(targets, policies)]
+
     def list(self) -> Sequence["ScalableTarget"]:
         response = self.client.describe_scalable_targets(
             ServiceNamespace="ecs",
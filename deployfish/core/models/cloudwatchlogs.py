@@ -1,11 +1,11 @@
 import time
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from typing import Any, Optional
 
 from deployfish.core.aws import get_boto3_session
 
-from .abstract import Manager, Model
+from .abstract import CompactModel, Manager, Model
 
 
 class CloudWatchLogStreamIterator:
@@ -179,15 +179,17 @@ class CloudWatchLogGroupManager(Manager):
         )
 
     def list(self, prefix: str = None) -> Sequence["CloudWatchLogGroup"]:
+        return list(self.iterator(prefix=prefix))
+
+    def iterator(self, prefix: str = None) -> Iterator["CloudWatchLogGroup"]:
         paginator = self.client.get_paginator("describe_log_groups")
         kwargs = {}
         if prefix:
             kwargs["logGroupNamePrefix"] = prefix
         response_iterator = paginator.paginate(**kwargs)
-        group_data = []
         for response in response_iterator:
-            group_data.extend(response["logGroups"])
-        return [CloudWatchLogGroup(data) for data in group_data]
+            for data in response["logGroups"]:
+                yield CloudWatchLogGroup(data)
 
 
 class CloudWatchLogStreamManager(Manager):
@@ -222,6 +224,20 @@ class CloudWatchLogStreamManager(Manager):
             Note that ``log_group_name`` is required here.  We could turn this into "list all streams", but we in ADS
             have a bajillion groups and streams and that might be untenable to actually work with.
         """
+        return list(self.iterator(log_group_name, prefix=prefix, limit=limit))
+
+    def iterator(
+        self,
+        log_group_name: str,
+        prefix: str = None,
+        limit: int = None
+    ) -> Iterator["CloudWatchLogStream"]:
+        """
+        Yield the streams in ``log_group_name``, most recent first.  Without a
+        ``prefix``, AWS sorts them for us, so we yield them a page at a time;
+        AWS can't sort streams it filters by prefix, so with one we have to load
+        them all to sort them first.
+        """
         paginator = self.client.get_paginator("describe_log_streams")
         kwargs: dict[str, Any] = {"logGroupName": log_group_name}
         if prefix:
@@ -229,20 +245,17 @@ class CloudWatchLogStreamManager(Manager):
         else:
             kwargs["orderBy"] = "LastEventTime"
             kwargs["descending"] = True
-        response_iterator = paginator.paginate(**kwargs)
-        stream_data = []
-        for response in response_iterator:
-            for stream in response["logStreams"]:
-                stream["logGroupName"] = log_group_name
-            stream_data.extend(response["logStreams"])
-            if limit and len(stream_data) > limit:
-                stream_data = stream_data[:limit]
-                break
-        streams = [CloudWatchLogStream(data) for data in stream_data]
+        if limit:
+            # Stop paging once we have enough
+            kwargs["PaginationConfig"] = {"MaxItems": limit}
+        streams = (
+            CloudWatchLogStream({**stream, "logGroupName": log_group_name})
+            for response in paginator.paginate(**kwargs)
+            for stream in response["logStreams"]
+        )
         if prefix:
-            streams = sorted(streams, key=lambda x: x.data.get("lastEventTimestamp", -1))
-            streams.reverse()
-        return streams
+            streams = reversed(sorted(streams, key=lambda x: x.data.get("lastEventTimestamp", -1)))
+        yield from streams
 
 
 # ----------------------------------------
@@ -330,7 +343,9 @@ class CloudWatchLogGroup(Model):
         )
 
 
-class CloudWatchLogStream(Model):
+class CloudWatchLogStream(CompactModel):
+
+    __slots__ = ()
 
     objects = CloudWatchLogStreamManager()
 
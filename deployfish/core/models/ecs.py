@@ -1,10 +1,11 @@
 import builtins
 import datetime
 import fnmatch
+import itertools
 import re
 import textwrap
 import warnings
-from collections.abc import Sequence
+from collections.abc import Callable, Iterator, Sequence
 from copy import deepcopy
 from typing import (
     Any,
@@ -15,14 +16,16 @@ from typing import (
 )
 
 import pytz
+from botocore.exceptions import ClientError
 from tzlocal import get_localzone
 
 from deployfish.core.aws import get_boto3_session
 from deployfish.core.ssh import DockerMixin, SSHMixin
-from deployfish.core.utils import is_fnmatch_filter
-from deployfish.exceptions import ObjectImproperlyConfigured, SchemaException
+from deployfish.core.utils import is_fnmatch_filter, run_concurrently
+from deployfish.core.utils.cow import cow
+from deployfish.exceptions import ObjectDoesNotExist, ObjectImproperlyConfigured, SchemaException
 
-from .abstract import LazyAttributeMixin, Manager, Model
+from .abstract import CompactModel, LazyAttributeMixin, Manager, Model, identity_map
 from .appscaling import ScalableTarget
 from .ec2 import AutoscalingGroup, Instance, SecurityGroup, Subnet
 from .efs import EFSFileSystem
@@ -30,7 +33,7 @@ from .elb import ClassicLoadBalancer
 from .elbv2 import TargetGroup
 from .events import EventScheduleRule
 from .mixins import SupportsTags, TagsMixin, TaskDefinitionFARGATEMixin
-from .secrets import Secret, SecretsMixin
+from .secrets import Secret, SecretsMixin, secret_store
 from .service_discovery import ServiceDiscoveryService
 
 __all__ = [
@@ -438,12 +441,14 @@ class TaskDefinitionManager(Manager):
         return TaskDefinition(data, containers=containers)
 
     def list(self, family: str) -> Sequence["TaskDefinition"]:  # type:ignore
+        return builtins.list(self.iterator(family))
+
+    def iterator(self, family: str) -> Iterator["TaskDefinition"]:  # type:ignore
         paginator = self.client.get_paginator("list_task_definitions")
         response_iterator = paginator.paginate(familyPrefix=family, sort="ASC")
-        task_definition_arns = []
         for response in response_iterator:
-            task_definition_arns.extend(response["taskDefinitionArns"])
-        return [self.get(arn) for arn in task_definition_arns]
+            for arn in response["taskDefinitionArns"]:
+                yield self.get(arn)
 
     def save(self, obj: Model, **_) -> str:
         response = self.client.register_task_definition(**obj.render())
@@ -866,6 +871,25 @@ class InvokedTaskManager(Manager):
             raise InvokedTask.DoesNotExist(f'No task exists with arn "{task_arn}" in cluster "{cluster}"')
         return InvokedTask(response["tasks"][0])
 
+    def get_many(self, pks: list[str], **_) -> Sequence["InvokedTask"]:
+        """
+        :param pks list[str]: a list of strings like '{cluster}:{task_arn}'
+        """
+        clusters: dict[str, list[str]] = {}
+        for pk in pks:
+            cluster, task_arn = self.__get_cluster_and_task_arn_from_pk(pk)
+            clusters.setdefault(cluster, []).append(task_arn)
+        tasks = []
+        for cluster, task_arns in clusters.items():
+            # describe_tasks accepts at most 100 tasks
+            for i in range(0, len(task_arns), 100):
+                try:
+                    response = self.client.describe_tasks(cluster=cluster, tasks=task_arns[i:i + 100])
+                except self.client.exceptions.ClusterNotFoundException:
+                    raise Cluster.DoesNotExist(f'No cluster named "{cluster}" exists in AWS')
+                tasks.extend(InvokedTask(data) for data in response["tasks"])
+        return tasks
+
     def list(
         self,
         cluster: str,
@@ -875,6 +899,24 @@ class InvokedTaskManager(Manager):
         launch_type: str = None,
         status: str = "RUNNING"
     ) -> Sequence["InvokedTask"]:
+        return builtins.list(self.iterator(
+            cluster,
+            service=service,
+            family=family,
+            container_instance=container_instance,
+            launch_type=launch_type,
+            status=status
+        ))
+
+    def iterator(
+        self,
+        cluster: str,
+        service: str = None,
+        family: str = None,
+        container_instance: str = None,
+        launch_type: str = None,
+        status: str = "RUNNING"
+    ) -> Iterator["InvokedTask"]:
         kwargs: dict[str, str] = {}
         kwargs["cluster"] = cluster
         if status != "any":
@@ -887,13 +929,16 @@ class InvokedTaskManager(Manager):
             kwargs["family"] = family
         if container_instance:
             kwargs["containerInstance"] = container_instance
+        paginator = self.client.get_paginator("list_tasks")
         try:
-            response = self.client.list_tasks(**kwargs)
+            # Pages hold at most 100 tasks, which is what describe_tasks accepts
+            for response in paginator.paginate(**kwargs):
+                if response["taskArns"]:
+                    yield from self.get_many([f"{cluster}:{arn}" for arn in response["taskArns"]])
         except self.client.exceptions.ClusterNotFoundException:
             raise Cluster.DoesNotExist(f'No cluster named "{cluster}" exists in AWS')
         except self.client.exceptions.ServiceNotFoundException:
             raise Service.DoesNotExist(f'No service named "{service}" exists in cluster "{cluster}" in AWS')
-        return [self.get(f"{cluster}:{arn}") for arn in response["taskArns"]]
 
     def save(self, obj: Model, **_) -> NoReturn:
         raise InvokedTask.ReadOnly("InvokedTasks are not modifiable")
@@ -905,6 +950,33 @@ class InvokedTaskManager(Manager):
             task=obj.arn
         )
 
+    # ------------------------
+    # Prefetching
+    # ------------------------
+
+    def prefetch_task_definition(self, objs: Sequence["InvokedTask"]) -> None:
+        task_definitions = _load_task_definitions([obj.data["taskDefinitionArn"] for obj in objs], shared=True)
+        for obj in objs:
+            if obj.data["taskDefinitionArn"] in task_definitions:
+                obj.cache["task_definition"] = task_definitions[obj.data["taskDefinitionArn"]]
+
+    def prefetch_container_instance(self, objs: Sequence["InvokedTask"]) -> None:
+        pks = list(dict.fromkeys(
+            f"{obj.cluster_name}:{obj.data['containerInstanceArn']}"
+            for obj in objs if "containerInstanceArn" in obj.data
+        ))
+        container_instances = {
+            ci.pk: ci for ci in identity_map.load_many(ContainerInstance, pks, ContainerInstance.objects.get_many)
+        } if pks else {}
+        for obj in objs:
+            if "containerInstanceArn" not in obj.data:
+                # this is a FARGATE task
+                obj.cache["container_instance"] = None
+            else:
+                pk = f"{obj.cluster_name}:{obj.data['containerInstanceArn']}"
+                if pk in container_instances:
+                    obj.cache["container_instance"] = container_instances[pk]
+
 
 class ContainerInstanceManager(Manager):
 
@@ -941,6 +1013,32 @@ class ContainerInstanceManager(Manager):
             )
         return ContainerInstance(response["containerInstances"][0], cluster)
 
+    def get_many(self, pks: list[str], **_) -> Sequence["ContainerInstance"]:
+        """
+        :param pks list[str]: a list of strings like "{cluster}:{container_instance_id}"
+        """
+        clusters: dict[str, list[str]] = {}
+        for pk in pks:
+            cluster, container_instance_id = self.__get_cluster_and_id_from_pk(pk)
+            clusters.setdefault(cluster, []).append(container_instance_id)
+        container_instances = []
+        for cluster, ids in clusters.items():
+            # describe_container_instances accepts at most 100 container instances
+            for i in range(0, len(ids), 100):
+                try:
+                    response = self.client.describe_container_instances(
+                        cluster=cluster,
+                        containerInstances=ids[i:i + 100]
+                    )
+                except self.client.exceptions.ClusterNotFoundException:
+                    raise Cluster.DoesNotExist(
+                        f'No cluster named "{cluster}" exists in AWS'
+                    )
+                container_instances.extend(
+                    ContainerInstance(data, cluster) for data in response["containerInstances"]
+                )
+        return container_instances
+
     def exists(self, pk: str) -> bool:
         """
         :param pk str: a string like "{cluster}:{container_instance_id}"
@@ -955,11 +1053,21 @@ class ContainerInstanceManager(Manager):
         """
         :param cluster str: the name of an ECS cluster
         """
+        return builtins.list(self.iterator(cluster))
+
+    def iterator(self, cluster: str) -> Iterator["ContainerInstance"]:
+        """
+        :param cluster str: the name of an ECS cluster
+        """
+        paginator = self.client.get_paginator("list_container_instances")
         try:
-            response = self.client.list_container_instances(cluster=cluster)
+            # Pages hold at most 100 container instances, which is what
+            # describe_container_instances accepts
+            for response in paginator.paginate(cluster=cluster):
+                if response["containerInstanceArns"]:
+                    yield from self.get_many([f"{cluster}:{arn}" for arn in response["containerInstanceArns"]])
         except self.client.exceptions.ClusterNotFoundException:
             raise Cluster.DoesNotExist
-        return [self.get(f"{cluster}:{arn}") for arn in response["containerInstanceArns"]]
 
     def save(self, obj: Model, **kwargs) -> NoReturn:
         raise Cluster.ReadOnly("Container instances cannot be updated from deployfish")
@@ -967,6 +1075,19 @@ class ContainerInstanceManager(Manager):
     def delete(self, obj: Model, **kwargs) -> NoReturn:
         raise Cluster.ReadOnly("Container instances cannot be updated from deployfish")
 
+    # ------------------------
+    # Prefetching
+    # ------------------------
+
+    def prefetch_ec2_instance(self, objs: Sequence["ContainerInstance"]) -> None:
+        ids = list(dict.fromkeys(obj.data["ec2InstanceId"] for obj in objs))
+        instances = {
+            instance.pk: instance for instance in identity_map.load_many(Instance, ids, Instance.objects.get_many)
+        }
+        for obj in objs:
+            if obj.data["ec2InstanceId"] in instances:
+                obj.cache["ec2_instance"] = instances[obj.data["ec2InstanceId"]]
+
 
 class ClusterManager(Manager):
 
@@ -999,16 +1120,36 @@ class ClusterManager(Manager):
         return sorted([Cluster(data) for data in response["clusters"]], key=lambda x: x.name)
 
     def list(self, cluster_name: str = None) -> "builtins.list[Cluster]":
+        return sorted(self.iterator(cluster_name=cluster_name), key=lambda x: x.name)
+
+    def iterator(self, cluster_name: str = None) -> Iterator["Cluster"]:
+        """
+        Yield the clusters 100 at a time, sorted by name within each 100.
+
+        :param cluster_name str: a cluster name, or a glob that cluster names must match
+        """
+        names = self.list_names(cluster_name)
+        # describe_clusters accepts at most 100 clusters
+        while chunk := builtins.list(itertools.islice(names, 100)):
+            yield from self.get_many(chunk)
+
+    def list_names(self, cluster_name: str = None) -> Iterator[str]:
+        """
+        Yield the names of the clusters matching ``cluster_name`` without
+        describing them.  If ``cluster_name`` is not a glob, we just yield it,
+        rather than listing every cluster to find it.
+
+        :param cluster_name str: a cluster name, or a glob that cluster names must match
+        """
+        if cluster_name and not is_fnmatch_filter(cluster_name):
+            yield cluster_name
+            return
         paginator = self.client.get_paginator("list_clusters")
-        response_iterator = paginator.paginate()
-        cluster_arns = []
-        for response in response_iterator:
-            cluster_arns.extend(response["clusterArns"])
-        if cluster_name:
-            clusters = {arn.split("/")[1]: arn for arn in cluster_arns}
-            cluster_names = fnmatch.filter(list(clusters.keys()), cluster_name)
-            cluster_arns = [clusters[name] for name in cluster_names]
-        return self.get_many(cluster_arns)
+        for response in paginator.paginate():
+            names = [arn.rsplit("/", 1)[1] for arn in response["clusterArns"]]
+            if cluster_name:
+                names = fnmatch.filter(names, cluster_name)
+            yield from names
 
     def exists(self, pk: str) -> bool:
         """
@@ -1110,6 +1251,32 @@ class ServiceManager(Manager):
         scheduling_strategy: str = "any",
         updated_since: datetime.datetime = None
     ) -> Sequence["Service"]:
+        return builtins.list(self.iterator(
+            cluster_name=cluster_name,
+            service_name=service_name,
+            launch_type=launch_type,
+            scheduling_strategy=scheduling_strategy,
+            updated_since=updated_since
+        ))
+
+    def iterator(
+        self,
+        cluster_name: str = None,
+        service_name: str = None,
+        launch_type: str = "any",
+        scheduling_strategy: str = "any",
+        updated_since: datetime.datetime = None
+    ) -> Iterator["Service"]:
+        """
+        Yield the services matching our filters as we describe them, 10 at a
+        time.
+
+        ``launch_type`` and ``scheduling_strategy`` are passed to
+        ``list_services``.  If ``cluster_name`` is not a glob, we use it as is
+        rather than listing every cluster.  ``service_name`` is matched against
+        each page of service ARNs before describing them, and ``updated_since``
+        against each batch of described services.
+        """
         if launch_type not in ["any", "EC2", "FARGATE"]:
             raise Service.OperationFailed(
                 f"{launch_type} is not a valid launch_type.  Valid types are: EC2, FARGATE."
@@ -1121,37 +1288,36 @@ class ServiceManager(Manager):
         if updated_since:
             local_tz = get_localzone()
             updated_since = updated_since.astimezone(local_tz)
-        paginator = self.client.get_paginator("list_clusters")
-        response_iterator = paginator.paginate()
-        cluster_arns = []
-        for response in response_iterator:
-            cluster_arns.extend(response["clusterArns"])
-        clusters = [arn.rsplit("/", 1)[1] for arn in cluster_arns]
-        if cluster_name:
-            clusters = fnmatch.filter(clusters, cluster_name)
-        service_arns: list[str] = []
-        for cluster in clusters:
+        for cluster in cast("ClusterManager", Cluster.objects).list_names(cluster_name):
             kwargs = {"cluster": cluster}
             if launch_type != "any":
                 kwargs["launchType"] = launch_type
             if scheduling_strategy != "any":
                 kwargs["schedulingStrategy"] = scheduling_strategy
             paginator = self.client.get_paginator("list_services")
-            response_iterator = paginator.paginate(**kwargs)
+            # describe_services accepts at most 10 services, so ask for pages of 10
+            response_iterator = paginator.paginate(**kwargs, PaginationConfig={"PageSize": 10})
             try:
                 for response in response_iterator:
-                    service_arns.extend(f"{cluster}:{arn}" for arn in response["serviceArns"])
+                    service_arns = response["serviceArns"]
+                    if service_name:
+                        service_arns = [
+                            arn for arn in service_arns if fnmatch.fnmatch(arn.rsplit("/", 1)[1], service_name)
+                        ]
+                    if not service_arns:
+                        continue
+                    services = self.get_many([f"{cluster}:{arn}" for arn in service_arns])
+                    if updated_since is not None:
+                        services = [
+                            s for s in services
+                            if s.last_updated is not None and s.last_updated >= updated_since
+                        ]
+                    yield from services
             except self.client.exceptions.ClusterNotFoundException:
-                raise Cluster.DoesNotExist(f'No cluster with name "{cluster}" exists in AWS')
-        if service_name:
-            service_arns = [arn for arn in service_arns if fnmatch.fnmatch(arn.rsplit("/")[1], service_name)]
-        services = self.get_many(service_arns)
-        if updated_since is not None:
-            services = [
-                s for s in services
-                if s.last_updated is not None and s.last_updated >= updated_since
-            ]
-        return services
+                if is_fnmatch_filter(cluster_name) or not cluster_name:
+                    raise Cluster.DoesNotExist(f'No cluster with name "{cluster}" exists in AWS')
+                # We didn't list the clusters to find this one, so it may
+                # just not exist; that's no match, not an error
 
     def save(self, obj: Model, **_) -> None:
         if self.exists(obj.pk):
@@ -1204,6 +1370,121 @@ class ServiceManager(Manager):
     def scale(self, obj: "Service", count: int) -> None:
         self.client.update_service(**obj.render_for_scale(count))
 
+    # ------------------------
+    # Prefetching
+    # ------------------------
+
+    prefetch_dependencies = {"helper_tasks": ("task_definition",)}
+
+    def prefetch_cluster(self, objs: Sequence["Service"]) -> None:
+        names = list(dict.fromkeys(obj.data["cluster"] for obj in objs))
+        clusters: dict[str, Cluster] = {}
+        # describe_clusters accepts at most 100 clusters
+        for i in range(0, len(names), 100):
+            clusters.update({
+                cluster.name: cluster
+                for cluster in identity_map.load_many(Cluster, names[i:i + 100], Cluster.objects.get_many)
+            })
+        for obj in objs:
+            if obj.data["cluster"] in clusters:
+                obj.cache["cluster"] = clusters[obj.data["cluster"]]
+
+    def prefetch_task_definition(self, objs: Sequence["Service"]) -> None:
+        task_definitions = _load_task_definitions([obj.data["taskDefinition"] for obj in objs])
+        for obj in objs:
+            if obj.data["taskDefinition"] in task_definitions:
+                obj.cache["task_definition"] = task_definitions[obj.data["taskDefinition"]]
+
+    def prefetch_load_balancers(self, objs: Sequence["Service"]) -> None:
+        lbs = [lb for obj in objs for lb in obj.data["loadBalancers"]]
+        tg_arns = list(dict.fromkeys(lb["targetGroupArn"] for lb in lbs if "targetGroupArn" in lb))
+        lb_names = list(dict.fromkeys(lb["loadBalancerName"] for lb in lbs if "targetGroupArn" not in lb))
+        # Both describe calls accept at most 20 names or ARNs
+        chunks = [
+            *((TargetGroup.objects.get_many, tg_arns[i:i + 20]) for i in range(0, len(tg_arns), 20)),
+            *((ClassicLoadBalancer.objects.get_many, lb_names[i:i + 20]) for i in range(0, len(lb_names), 20)),
+        ]
+        found: dict[str, TargetGroup | ClassicLoadBalancer] = {}
+        for results in run_concurrently(lambda get_many, pks: get_many(pks), chunks):
+            found.update({obj.pk: obj for obj in results})
+        for obj in objs:
+            data = []
+            for lb in obj.data["loadBalancers"]:
+                lb = deepcopy(lb)
+                if "targetGroupArn" in lb:
+                    lb["TargetGroup"] = found.get(lb["targetGroupArn"])
+                else:
+                    lb["LoadBalancer"] = found.get(lb["loadBalancerName"])
+                data.append(lb)
+            # Leave anything we couldn't find for the property to complain about
+            if all(lb.get("TargetGroup") or lb.get("LoadBalancer") for lb in data):
+                obj.cache["load_balancers"] = data
+
+    def prefetch_appscaling(self, objs: Sequence["Service"]) -> None:
+        pks = list(dict.fromkeys(f"service/{obj.data['cluster']}/{obj.data['serviceName']}" for obj in objs))
+        targets = {target.pk: target for target in ScalableTarget.objects.get_many(pks)} if pks else {}
+        for obj in objs:
+            obj.cache["appscaling"] = targets.get(f"service/{obj.data['cluster']}/{obj.data['serviceName']}")
+
+    def prefetch_helper_tasks(self, objs: Sequence["Service"]) -> None:
+        command_arns: dict[int, builtins.list[str]] = {}
+        for obj in objs:
+            try:
+                tags = obj.task_definition.tags  # type: ignore
+            except (ObjectDoesNotExist, ClientError):
+                # Leave it to obj.helper_tasks to report the error
+                continue
+            command_arns[id(obj)] = [arn for tag, arn in tags.items() if tag.startswith("deployfish:command:")]
+        arns = list(dict.fromkeys(arn for obj_arns in command_arns.values() for arn in obj_arns))
+        tasks = _load_each(ServiceHelperTask.objects.get, arns)
+        for obj in objs:
+            if id(obj) in command_arns and all(arn in tasks for arn in command_arns[id(obj)]):
+                obj.cache["helper_tasks"] = [tasks[arn] for arn in command_arns[id(obj)]]
+
+
+def _load_each(get: Callable[[str], Any], pks: Sequence[str]) -> dict[str, Any]:
+    """
+    Call ``get(pk)`` concurrently for each distinct ``pk`` in ``pks``.
+
+    Prefetchers use this for things AWS only lets us describe one at a time.
+    Anything ``get`` can't find, or that AWS refuses to describe, is left out
+    instead of failing the prefetch for every object; reading the relation on
+    the objects that wanted it then loads it (and reports the error) the usual
+    way.  Any other exception is a bug, and is raised.
+
+    Returns:
+        A dict of pk to whatever ``get`` returned for it.
+
+    """
+    def load(pk: str) -> Any:
+        try:
+            return get(pk)
+        except (ObjectDoesNotExist, ClientError):
+            return None
+
+    pks = list(dict.fromkeys(pks))
+    return {pk: obj for pk, obj in zip(pks, run_concurrently(load, [(pk,) for pk in pks])) if obj is not None}
+
+
+def _load_task_definitions(arns: Sequence[str], shared: bool = False) -> dict[str, "TaskDefinition"]:
+    """
+    Load the distinct task definitions in ``arns`` concurrently;
+    ``describe_task_definition`` only takes one at a time.  Task definitions
+    we can't load are left out.
+
+    Keyword Args:
+        shared: if ``True``, load them through :py:data:`identity_map`, so
+            that each is loaded once per command.  Only do this for task
+            definitions nobody is going to change.
+
+    Returns:
+        A dict of task definition ARN to :py:class:`TaskDefinition`.
+
+    """
+    if shared:
+        return _load_each(lambda arn: identity_map.load(TaskDefinition, arn, TaskDefinition.objects.get), arns)
+    return _load_each(TaskDefinition.objects.get, arns)
+
 
 # ----------------------------------------
 # Models
@@ -1360,7 +1641,7 @@ class TaskDefinition(TagsMixin, TaskDefinitionFARGATEMixin, SecretsMixin, Model)
         return data
 
     def render(self):
-        data = deepcopy(self.data)
+        data = cow(self.data)
         self.autofill_fargate_parameters(data)
         data["containerDefinitions"] = [c.render() for c in sorted(self.containers, key=lambda x: x.name)]
         if "executionRoleArn" not in data:
@@ -1381,7 +1662,7 @@ class TaskDefinition(TagsMixin, TaskDefinitionFARGATEMixin, SecretsMixin, Model)
     def save(self):
         # Update Timestamp tag on task defintion before saving
         self._tags["Timestamp"] = datetime.datetime.now(datetime.UTC).strftime("%Y/%m/%dT%H:%M:%SZ")
-        return self.objects.save(self)
+        return super().save()
 
     # ----------------------------------
     # TaskDefinition-specific properties
@@ -1553,12 +1834,12 @@ class ContainerDefinition(SecretsMixin, LazyAttributeMixin):
         return env_dict.get("DEPLOYFISH_ENVIRONMENT", "undefined")
 
     def render_for_diff(self):
-        data = deepcopy(self.data)
+        data = cow(self.data)
         if "environment" in data:
-            environment = {x["name"]: x["value"] for x in data["environment"]}
+            environment = {x["name"]: x["value"] for x in self.data["environment"]}
             data["environment"] = environment
         if "secrets" in data:
-            secrets = {x["name"]: x["valueFrom"] for x in data["secrets"]}
+            secrets = {x["name"]: x["valueFrom"] for x in self.data["secrets"]}
             data["secrets"] = secrets
         if "volumesFrom" not in data:
             data["volumesFrom"] = []
@@ -1572,16 +1853,16 @@ class ContainerDefinition(SecretsMixin, LazyAttributeMixin):
         return data
 
     def render(self) -> dict[str, Any]:
-        data = deepcopy(self.data)
+        data = cow(self.data)
         if "environment" in data:
             if data["environment"]:
                 # Alphabetize the environment variables for easier comparison
-                environment = sorted(data["environment"], key=lambda item: item["name"])
+                environment = cow(sorted(self.data["environment"], key=lambda item: item["name"]))
                 data["environment"] = environment
         return data
 
     def copy(self) -> "ContainerDefinition":
-        return self.__class__(self.render())
+        return self.__class__(deepcopy(self.render()))
 
     def __add__(self, other: "ContainerDefinition") -> "ContainerDefinition":
         c = self.copy()
@@ -1606,7 +1887,7 @@ class ContainerDefinition(SecretsMixin, LazyAttributeMixin):
             if "secrets" in self.data:
                 # FIXME: should we be splitting these into Secrets and ExternalSecrets so we can do comparisons
                 names = [s["valueFrom"] for s in self.data["secrets"]]
-                self.cache["secrets"] = Secret.objects.get_many(names)
+                self.cache["secrets"] = secret_store.get_many(names)
             else:
                 self.cache["secrets"] = []
         return self.cache["secrets"]
@@ -1684,7 +1965,7 @@ class Task(TagsMixin, VPCConfigurationMixin, Model):
         raise ValueError("No task definition")
 
     def render_for_display(self):
-        data = deepcopy(self.data)
+        data = cow(self.data)
         if "service" in self.data:
             data["serviceName"] = data["service"].split(":")[1]
         else:
@@ -1869,12 +2150,14 @@ class ServiceHelperTask(Task):
 ServiceHelperTaskManager.model = ServiceHelperTask
 
 
-class InvokedTask(DockerMixin, Model):
+class InvokedTask(DockerMixin, CompactModel):
     """
     A record of a running AWS ECS Task, which means either a task running as part of a Service, a StandaloneTask or a
     ServiceHelperTask.
     """
 
+    __slots__ = ()
+
     objects = InvokedTaskManager()
 
     # ---------------------
@@ -1924,9 +2207,11 @@ class InvokedTask(DockerMixin, Model):
 
     @property
     def task_definition(self) -> TaskDefinition:
-        if "task_definition" not in self.cache:
-            self.cache["task_definition"] = TaskDefinition.objects.get(self.data["taskDefinitionArn"])
-        return self.cache["task_definition"]
+        return self.get_batched(
+            "task_definition",
+            identity_map.load,
+            [TaskDefinition, self.data["taskDefinitionArn"], TaskDefinition.objects.get]
+        )
 
     @property
     def containers(self) -> Sequence[ContainerDefinition]:
@@ -1940,19 +2225,22 @@ class InvokedTask(DockerMixin, Model):
 
     @property
     def cluster(self) -> "Cluster":
-        return self.get_cached("cluster", Cluster.objects.get, [self.cluster_name])
+        return self.get_cached("cluster", identity_map.load, [Cluster, self.cluster_name, Cluster.objects.get])
 
     @property
     def container_instance(self) -> Optional["ContainerInstance"]:
-        try:
-            return self.get_cached(
-                "container_machine",
-                ContainerInstance.objects.get,
-                [f"{self.cluster_name}:{self.data['containerInstanceArn']}"]
-            )
-        except KeyError:
+        if "containerInstanceArn" not in self.data:
             # this is a FARGATE task
             return None
+        return self.get_batched(
+            "container_instance",
+            identity_map.load,
+            [
+                ContainerInstance,
+                f"{self.cluster_name}:{self.data['containerInstanceArn']}",
+                ContainerInstance.objects.get,
+            ]
+        )
 
     # -----------------------
     # Networking
@@ -2012,7 +2300,9 @@ class ContainerInstance(SSHMixin, Model):
 
     @property
     def ec2_instance(self) -> Instance:
-        return self.get_cached("ec2_instance", Instance.objects.get, [self.data["ec2InstanceId"]])
+        return self.get_batched(
+            "ec2_instance", identity_map.load, [Instance, self.data["ec2InstanceId"], Instance.objects.get]
+        )
 
     @property
     def autoscaling_group(self) -> AutoscalingGroup | None:
@@ -2623,13 +2913,11 @@ class Service(
 
     @property
     def cluster(self) -> Cluster:
-        return self.get_cached("cluster", Cluster.objects.get, [self.data["cluster"]])
+        return self.get_batched("cluster", identity_map.load, [Cluster, self.data["cluster"], Cluster.objects.get])
 
     @property
     def task_definition(self) -> TaskDefinition:
-        if "task_definition" not in self.cache:
-            self.cache["task_definition"] = TaskDefinition.objects.get(self.data["taskDefinition"])
-        return self.cache["task_definition"]
+        return self.get_batched("task_definition", TaskDefinition.objects.get, [self.data["taskDefinition"]])
 
     @task_definition.setter
     def task_definition(self, value: TaskDefinition) -> None:
@@ -3,7 +3,7 @@ import fnmatch
 from collections.abc import Sequence
 from typing import Any
 
-from .abstract import Manager, Model
+from .abstract import CompactModel, Manager, Model
 from .ec2 import Instance
 from .mixins import TagsMixin
 
@@ -532,7 +532,9 @@ class TargetGroup(Model):
         return TargetGroupTarget.objects.list(self.arn)
 
 
-class TargetGroupTarget(Model):
+class TargetGroupTarget(CompactModel):
+
+    __slots__ = ()
 
     objects = TargetGroupTargetManager()
 
@@ -1,14 +1,17 @@
 import builtins
-import json
 import sys
+import threading
 from collections.abc import Sequence
+from copy import deepcopy
 from typing import Any
 
-from jsondiff import diff
+from botocore.exceptions import ClientError
 
+from deployfish.core.utils import AdaptiveRateLimiter, run_concurrently
+from deployfish.core.utils.diff import diff
 from deployfish.types import SupportsCache
 
-from .abstract import Manager, Model
+from .abstract import CompactModel, Manager, Model
 
 if sys.version_info >= (3, 8):
     from typing import Protocol
@@ -49,24 +52,60 @@ class SecretsMixin:
     def secrets(self: SupportsSecrets, value: dict[str, "Secret"]) -> None:
         self.cache["secrets"] = value
 
-    def write_secrets(self: SupportsSecrets) -> None:
-        # Add and update secrets we do need
+    def write_secrets(self: SupportsSecrets, live: Sequence["Secret"] | None = None) -> dict[str, int]:
+        """
+        Make the AWS SSM Parameter Store parameters under our secrets prefix
+        match :py:attr:`secrets`:
+
+        * Write any of our secrets that are missing from AWS or differ from
+          what is in AWS; leave the ones that are already up to date alone.
+        * Delete any parameters under our prefix that we no longer have.
+
+        Writes are done concurrently, but within a rate limit that adapts to
+        AWS throttling us; deletes are done in batches of 10.
+
+        Keyword Args:
+            live: the secrets currently in AWS under our secrets prefix, if the
+                caller already has them.  If not provided, we'll list them.
+
+        Returns:
+            A dict with the counts of ``written``, ``skipped`` (unchanged or
+            read only) and ``deleted`` parameters.
+
+        """
+        counts = {"written": 0, "skipped": 0, "deleted": 0}
+        if not self.secrets:
+            return counts
+        if live is None:
+            live = secret_store.list(self.secrets_prefix)
+        live_secrets = {s.pk: s for s in live}
+        limiter = AdaptiveRateLimiter()
+        to_write = []
         for secret in list(self.secrets.values()):
-            try:
-                secret.save()
-            except secret.ReadOnly:
-                pass
+            if secret.objects.readonly:
+                counts["skipped"] += 1
+                continue
+            existing = live_secrets.get(secret.pk)
+            if existing is not None and existing.render_for_diff() == secret.render_for_diff():
+                counts["skipped"] += 1
+                continue
+            to_write.append(secret)
+        if to_write:
+            Secret.objects.save_many(to_write, limiter=limiter)
+            counts["written"] = len(to_write)
         # now delete any secrets that we no longer need
-        if self.secrets:
-            aws_pks = Secret.objects.list_names(self.secrets_prefix)
-            our_pks = [s.pk for s in list(self.secrets.values())]
-            for_deletion = list(set(aws_pks) - set(our_pks))
-            if for_deletion:
-                Secret.objects.delete_many_by_name(for_deletion)
+        our_pks = {s.pk for s in list(self.secrets.values())}
+        for_deletion = sorted(pk for pk in live_secrets if pk not in our_pks)
+        if for_deletion:
+            counts["deleted"] = Secret.objects.delete_many_by_name(for_deletion, limiter=limiter)
+        return counts
 
     def reload_secrets(self: SupportsSecrets) -> None:
         if "secrets" in self.cache:
-            del self.cache["secrets"]
+            secrets = self.cache.pop("secrets")
+            if isinstance(secrets, dict):
+                secrets = list(secrets.values())
+            secret_store.invalidate([s.pk for s in secrets or []])
 
     def diff_secrets(self: SupportsSecrets, other: Sequence["Secret"], ignore_external: bool = False) -> dict[str, Any]:
         """
@@ -89,7 +128,68 @@ class SecretsMixin:
         if other:
             their_secrets = sorted(other, key=lambda x: x.name)
             them = {s.name: s.render_for_diff() for s in their_secrets}
-        return json.loads(diff(them, us, syntax="explicit", dump=True))
+        return diff(them, us)
+
+
+class ServiceSecretLookupMixin:
+    """
+    A mixin for models like :py:class:`deployfish.core.models.ssh.SSHTunnel`
+    which allow ``config.KEY`` as values in their ``deployfish.yml`` config,
+    and which need to dereference those values against the live AWS SSM
+    Parameter Store secrets of their :py:class:`deployfish.core.models.ecs.Service`.
+
+    The first time any secret is requested, we load all the secrets under
+    ``self.service.secrets_prefix`` with a single prefix scan through
+    :py:data:`secret_store`, and serve all further lookups from that.
+    """
+
+    cache: dict[str, Any]
+
+    @property
+    def service(self):
+        raise NotImplementedError
+
+    def prefetch_secrets(self) -> dict[str, "Secret"]:
+        """
+        Load all the secrets for our service from AWS, if we haven't already.
+
+        Returns:
+            A dict where the keys are fully qualified parameter names, and the
+            values are :py:class:`Secret` objects.
+
+        """
+        if "secrets" not in self.cache:
+            prefix = self.service.secrets_prefix
+            self.cache["secrets"] = {s.pk: s for s in secret_store.list(prefix)}
+            self.cache["secrets_prefix"] = prefix
+        return self.cache["secrets"]
+
+    def secret(self, name: str) -> "Secret":
+        """
+        Return the live :py:class:`Secret` named ``name``.  If ``name`` has no
+        ``.`` in it, it is a secret name relative to our service's secrets
+        prefix; otherwise it is a fully qualified parameter name.
+
+        Args:
+            name: the name of the secret to retrieve
+
+        Raises:
+            Secret.DoesNotExist: no secret named ``name`` exists in AWS
+
+        Returns:
+            The live ``Secret``.
+
+        """
+        secrets = self.prefetch_secrets()
+        prefix = self.cache["secrets_prefix"]
+        full_name = f"{prefix}{name}" if "." not in name else name
+        if full_name not in secrets:
+            if full_name.startswith(prefix):
+                # We already loaded everything under our prefix, so no need to
+                # ask AWS again
+                raise Secret.DoesNotExist(f"No secret named {full_name} exists in AWS")
+            secrets[full_name] = secret_store.get(full_name)
+        return secrets[full_name]
 
 
 # ----------------------------------------
@@ -106,43 +206,142 @@ class SecretManager(Manager):
 
     service = "ssm"
 
+    #: ``describe_parameters`` accepts at most this many values in a single
+    #: ``Name`` filter
+    DESCRIBE_FILTER_MAX_VALUES: int = 50
+    #: ``get_parameters`` accepts at most this many names per call
+    GET_PARAMETERS_MAX_NAMES: int = 10
+    #: ``delete_parameters`` accepts at most this many names per call
+    DELETE_PARAMETERS_MAX_NAMES: int = 10
+    #: When :py:meth:`get_many` wants more than this many parameters from a
+    #: single prefix, we scan the whole prefix with a ``BeginsWith`` filter
+    #: instead of describing the parameters by name with ``Equals`` filters.
+    #: Measured with ``deployfish/core/models/test/bench_SecretManager.py``
+    #: (30ms per call, 0.2ms per item), describing by name was faster at every
+    #: size we tried, because the ``Equals`` describes run concurrently while a
+    #: scan pages serially: 429ms vs 848ms for all 1000 parameters of a 1000
+    #: parameter prefix, and 437ms vs 2048ms for 1000 of 2500.  So we only
+    #: scan to cap how many describes one call makes: past 1000 names (20
+    #: ``Equals`` describes) we'd rather not flood SSM's low
+    #: ``describe_parameters`` rate limit.
+    PREFIX_SCAN_THRESHOLD: int = 1000
+
     def __init__(self, model: type["Secret"] | type["ExternalSecret"], readonly: bool = False) -> None:
         self.model = model
         self.readonly = readonly
         super().__init__()
 
-    def _describe_parameters(self, key: str, option: str = "prefix") -> list[dict[str, Any]]:
+    def _describe_parameters(
+        self,
+        key: str | builtins.list[str],
+        option: str = "prefix",
+        client=None
+    ) -> builtins.list[dict[str, Any]]:
+        """
+        Run ``describe_parameters`` with a single ``Name`` filter and return all
+        the matching parameter descriptions.
+
+        Args:
+            key: the prefix to scan, or the parameter name (or a list of up to
+                :py:attr:`DESCRIBE_FILTER_MAX_VALUES` names) to describe
+
+        Keyword Args:
+            option: ``prefix`` to use a ``BeginsWith`` filter, anything else to
+                use an ``Equals`` filter
+            client: the boto3 SSM client to use.  If not provided, make a new one.
+
+        Returns:
+            A list of parameter descriptions.
+
+        """
         if option == "prefix":
             option = "BeginsWith"
         else:
             option = "Equals"
-        paginator = self.client.get_paginator("describe_parameters")
+        values = key if isinstance(key, builtins.list) else [key]
+        if client is None:
+            client = self.client
+        paginator = client.get_paginator("describe_parameters")
         response_iterator = paginator.paginate(
             ParameterFilters=[
-                {"Key": "Name", "Option": option, "Values": [key]}
-            ]
+                {"Key": "Name", "Option": option, "Values": values}
+            ],
+            PaginationConfig={"PageSize": self.DESCRIBE_FILTER_MAX_VALUES}
         )
         parameters = []
         for page in response_iterator:
             parameters.extend(page["Parameters"])
         return parameters
 
-    def _get_parameter_values(self, names: list[str], decrypt: bool = True) -> tuple[dict[str, Any], list[str]]:
+    def _get_parameter_chunk(
+        self,
+        client,
+        names: builtins.list[str],
+        decrypt: bool
+    ) -> tuple[builtins.list[dict[str, Any]], builtins.list[str]]:
+        try:
+            response = client.get_parameters(Names=names, WithDecryption=decrypt)
+        except client.exceptions.InvalidKeyId as e:
+            raise self.model.DecryptionFailed(str(e))
+        return response["Parameters"], response.get("InvalidParameters", [])
+
+    def _get_parameter_values(
+        self,
+        names: builtins.list[str],
+        decrypt: bool = True,
+        client=None
+    ) -> tuple[dict[str, Any], builtins.list[str]]:
         # get_parameters only accepts 10 or fewer names in the Names kwarg, so we have to
-        # split names into sub lists of 10 of fewer names and iterate
-        names_chunks = [names[i * 10:(i + 1) * 10] for i in range((len(names) + 9) // 10)]
+        # split names into sub lists of 10 of fewer names, which we retrieve concurrently
+        size = self.GET_PARAMETERS_MAX_NAMES
+        names_chunks = [names[i:i + size] for i in range(0, len(names), size)]
+        if client is None:
+            client = self.client
         parameters = []
         non_existant = []
-        for chunk in names_chunks:
-            try:
-                response = self.client.get_parameters(Names=chunk, WithDecryption=decrypt)
-            except self.client.exceptions.InvalidKeyId as e:
-                raise self.model.DecryptionFailed(str(e))
-            if response.get("InvalidParameters"):
-                non_existant.extend(response["InvalidParameters"])
-            parameters.extend(response["Parameters"])
+        results = run_concurrently(
+            self._get_parameter_chunk,
+            [(client, chunk, decrypt) for chunk in names_chunks]
+        )
+        for chunk_parameters, chunk_invalid in results:
+            parameters.extend(chunk_parameters)
+            non_existant.extend(chunk_invalid)
         return {p["Name"]: p for p in parameters}, non_existant
 
+    def _plan_describes(self, names: builtins.list[str]) -> builtins.list[tuple[Any, str]]:
+        """
+        Decide how to get the descriptions for the parameters named in ``names``
+        in as few ``describe_parameters`` calls as possible.
+
+        For each prefix, if we want at most :py:attr:`PREFIX_SCAN_THRESHOLD`
+        parameters from it, we describe those parameters by name; the names from
+        all such prefixes are combined into ``Equals`` filters of up to
+        :py:attr:`DESCRIBE_FILTER_MAX_VALUES` names each.  Otherwise we scan
+        the whole prefix with a ``BeginsWith`` filter.
+
+        Args:
+            names: the fully qualified names of the parameters we want
+
+        Returns:
+            A list of ``(key, option)`` tuples suitable for passing to
+            :py:meth:`_describe_parameters`.
+
+        """
+        prefixes: dict[str, builtins.list[str]] = {}
+        for name in names:
+            prefixes.setdefault(name.rsplit(".", 1)[0] + ".", []).append(name)
+        plan: builtins.list[tuple[Any, str]] = []
+        by_name: builtins.list[str] = []
+        for prefix, prefix_names in prefixes.items():
+            if len(prefix_names) > self.PREFIX_SCAN_THRESHOLD:
+                plan.append((prefix, "prefix"))
+            else:
+                by_name.extend(prefix_names)
+        size = self.DESCRIBE_FILTER_MAX_VALUES
+        for i in range(0, len(by_name), size):
+            plan.append((by_name[i:i + size], "equals"))
+        return plan
+
     def convert(self, parameter_data: dict[str, Any]) -> "Secret":
         name = parameter_data["Name"].split(".")[-1]
         return self.model(parameter_data, name=name)
@@ -157,31 +356,42 @@ class SecretManager(Manager):
         data["Value"] = values[pk]["Value"]
         return self.convert(data)
 
-    def get_many(self, pks: list[str], **_) -> Sequence["Secret"]:
+    def get_many(self, pks: builtins.list[str], decrypt: bool = True, **_) -> Sequence["Secret"]:
         """
+        Return :py:class:`Secret` objects for each of the parameters named in
+        ``pks``, and only those.  Parameters that don't exist in AWS are
+        returned as unsaved ``String`` parameters with no value.
+
+        This used to also return every other parameter under the prefix of each
+        name in ``pks``, without its value.  Use :py:meth:`list` if you want
+        everything under a prefix.
 
         .. note::
 
             What we want to return is data that contains both the encryption information (which is only
-            available from describe_paramters) and the actual parameter value (which is only available
-            from get_parameters).  So we do one call to describe_parameters and one to get_parameters for
-            each parameter (well, we bundle the calls as much as possible) and combine the results.
-        """
-        # Use get_parameter to get the parameter values
-        values, non_existant_parameters = self._get_parameter_values(pks)
-        prefixes = set()
-        # FIXME: we're getting all parameters for a service even if we wanted just a few, and that takes a long time.
-        # Find the breakeven point below which it's faster to get parameters individually and above which is better to
-        # get all the parameters.
-        for pk in pks:
-            prefixes.add(pk.rsplit(".", 1)[0] + ".")
+            available from describe_parameters) and the actual parameter value (which is only available
+            from get_parameters).  We choose the cheapest way to get the descriptions with
+            :py:meth:`_plan_describes`, and then run all the describe_parameters and get_parameters calls
+            concurrently and combine the results.
+        """
+        pks = builtins.list(dict.fromkeys(pks))
+        client = self.client
+        plan = self._plan_describes(pks)
+        results = run_concurrently(
+            lambda func, args: func(*args),
+            [(self._get_parameter_values, (pks, decrypt, client))]
+            + [(self._describe_parameters, (key, option, client)) for key, option in plan]
+        )
+        values, non_existant_parameters = results[0]
         descriptions = {}
-        for prefix in prefixes:
-            params = self._describe_parameters(prefix)
+        for params in results[1:]:
             for p in params:
                 descriptions[p["Name"]] = p
         secrets = []
-        for name, data in list(descriptions.items()):
+        for name in pks:
+            if name not in descriptions:
+                continue
+            data = descriptions[name]
             if name in values:
                 data["ARN"] = values[name]["ARN"]
                 data["Value"] = values[name]["Value"]
@@ -204,17 +414,19 @@ class SecretManager(Manager):
         parameters = self._describe_parameters(prefix)
         return [p["Name"] for p in parameters]
 
-    def list(self, prefix: str, decrypt: bool = True) -> Sequence["Secret"]:
+    def list(self, prefix: str, decrypt: bool = True, client=None) -> Sequence["Secret"]:
         if prefix.endswith("*"):
             prefix = prefix[:-1]
             if not prefix.endswith("."):
                 prefix = prefix + "."
-        parameters = self._describe_parameters(prefix)
+        if client is None:
+            client = self.client
+        parameters = self._describe_parameters(prefix, client=client)
         # We have to do two loops here, because describe_parameters gives us the
         # KeyId for our KMS key, but does not give us Value or ARN, while
         # get_parameters gives us Value and ARN but no KeyId
         names = [parameter["Name"] for parameter in parameters]
-        values, _ = self._get_parameter_values(names, decrypt=decrypt)
+        values, _ = self._get_parameter_values(names, decrypt=decrypt, client=client)
         secrets = []
         for parameter in parameters:
             parameter["ARN"] = values[parameter["Name"]]["ARN"]
@@ -225,18 +437,72 @@ class SecretManager(Manager):
     def save(self, obj: Model, **_) -> str:
         if not self.readonly:
             response = self.client.put_parameter(**obj.render_for_create())
+            secret_store.invalidate([obj.pk])
             return response["Version"]
         raise self.model.ReadOnly("This Secret is read only.")
 
-    def delete_many_by_name(self, pks: builtins.list[str]) -> None:
-        if len(pks) <= 10:
-            self.client.delete_parameters(Names=pks)
-        else:
-            # delete_parameters() will only take 10 params at a time, so we have
-            # to split it up if we have more than 10
-            chunks = [pks[i * 10:(i + 1) * 10] for i in range((len(pks) + 9) // 10)]
-            for chunk in chunks:
-                self.client.delete_parameters(Names=chunk)
+    def save_many(self, objs: Sequence[Model], limiter: AdaptiveRateLimiter | None = None) -> builtins.list[str]:
+        """
+        Write all of ``objs`` to SSM Parameter Store concurrently.
+
+        ``put_parameter`` has a low TPS limit, so the calls are made through
+        an :py:class:`deployfish.core.utils.AdaptiveRateLimiter`, which backs
+        off and retries when AWS throttles us.
+
+        Args:
+            objs: the :py:class:`Secret` objects to save
+
+        Keyword Args:
+            limiter: the rate limiter to use.  If not provided, make a new one.
+
+        Raises:
+            self.model.ReadOnly: this manager is read only
+
+        Returns:
+            The new versions of the parameters, in the same order as ``objs``.
+
+        """
+        if self.readonly:
+            raise self.model.ReadOnly("This Secret is read only.")
+        if limiter is None:
+            limiter = AdaptiveRateLimiter()
+        client = self.client
+        responses = run_concurrently(
+            lambda obj: limiter.call(client.put_parameter, **obj.render_for_create()),
+            [(obj,) for obj in objs]
+        )
+        secret_store.invalidate([obj.pk for obj in objs])
+        return [response["Version"] for response in responses]
+
+    def delete_many_by_name(self, pks: builtins.list[str], limiter: AdaptiveRateLimiter | None = None) -> int:
+        """
+        Delete the parameters named in ``pks`` from SSM Parameter Store.
+        ``delete_parameters`` will only take 10 names at a time, so we split
+        ``pks`` into chunks of 10 and delete them concurrently.
+
+        Args:
+            pks: the fully qualified names of the parameters to delete
+
+        Keyword Args:
+            limiter: the rate limiter to use.  If not provided, make a new one.
+
+        Returns:
+            The number of parameters actually deleted.
+
+        """
+        if self.readonly:
+            raise self.model.ReadOnly("This Secret is read only.")
+        if limiter is None:
+            limiter = AdaptiveRateLimiter()
+        client = self.client
+        size = self.DELETE_PARAMETERS_MAX_NAMES
+        chunks = [pks[i:i + size] for i in range(0, len(pks), size)]
+        responses = run_concurrently(
+            lambda chunk: limiter.call(client.delete_parameters, Names=chunk),
+            [(chunk,) for chunk in chunks]
+        )
+        secret_store.invalidate(pks)
+        return sum(len(response.get("DeletedParameters", [])) for response in responses)
 
     def delete(self, obj: Model, **_) -> None:
         if self.readonly:
@@ -245,17 +511,21 @@ class SecretManager(Manager):
             self.client.delete_parameter(Name=obj.pk)
         except self.client.exceptions.ParameterNotFound:
             raise Secret.DoesNotExist
+        finally:
+            secret_store.invalidate([obj.pk])
 
 
 # ----------------------------------------
 # Models
 # ----------------------------------------
 
-class Secret(Model):
+class Secret(CompactModel):
     """
     An SSM Parameter Store Parameter.
     """
 
+    __slots__ = ("secret_name",)
+
     objects: SecretManager
 
     class DecryptionFailed(Exception):
@@ -365,8 +635,267 @@ class Secret(Model):
 
 class ExternalSecret(Secret):
 
+    __slots__ = ()
+
     objects: SecretManager
 
 
 Secret.objects = SecretManager(Secret)
 ExternalSecret.objects = SecretManager(ExternalSecret, readonly=True)
+
+
+# ----------------------------------------
+# Identity map
+# ----------------------------------------
+
+class SecretStore:
+    """
+    A process-wide cache of AWS SSM Parameter Store parameters, keyed by fully
+    qualified parameter name.
+
+    :py:class:`deployfish.core.models.ecs.ContainerDefinition`, the secrets
+    controllers, the ``deployfish.yml`` secrets adapter and
+    :py:class:`ServiceSecretLookupMixin` all get their live secrets through
+    :py:data:`secret_store`, so that within a single ``deploy`` invocation we
+    load any one parameter from AWS at most once, no matter how many models ask
+    for it.  Prefixes are loaded with a single :py:meth:`SecretManager.list`
+    scan; after that, we know everything under that prefix, including which
+    names do *not* exist.
+
+    We keep only the raw parameter data, and every caller gets its own model
+    instance built from a copy of it, so that changing one caller's
+    :py:class:`Secret` doesn't change anyone else's.  Decrypted and undecrypted
+    parameters are kept separately, since we may not be allowed to use the KMS
+    keys for some of them.
+
+    Anything that writes to or deletes from Parameter Store through
+    :py:class:`SecretManager` invalidates the affected names here, as does
+    :py:meth:`SecretsMixin.reload_secrets`.
+    """
+
+    #: :py:meth:`prefetch` replaces this many or more prefixes that share a
+    #: parent with a single scan of the parent.  The parent may hold many more
+    #: parameters than we want, so we only do this when it saves a lot of scans.
+    PREFETCH_WIDEN_THRESHOLD: int = 10
+
+    def __init__(self) -> None:
+        #: The parameter data we've loaded, keyed by ``(parameter name, decrypt)``
+        self.parameters: dict[tuple[str, bool], dict[str, Any]] = {}
+        #: The ``(prefix, decrypt)`` pairs we have fully scanned
+        self.prefixes: set[tuple[str, bool]] = set()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def normalize_prefix(prefix: str) -> str:
+        """
+        Normalize ``prefix`` the same way :py:meth:`SecretManager.list` does:
+        ``foo.bar*`` and ``foo.bar.*`` both mean ``foo.bar.``.
+        """
+        if prefix.endswith("*"):
+            prefix = prefix[:-1]
+            if not prefix.endswith("."):
+                prefix = prefix + "."
+        return prefix
+
+    def is_scanned(self, name: str, decrypt: bool = True) -> bool:
+        """
+        Return ``True`` if ``name`` falls under a prefix we have fully scanned.
+        """
+        with self._lock:
+            return any(name.startswith(prefix) for prefix, d in self.prefixes if d == decrypt)
+
+    def _add(self, secrets: Sequence[Secret], decrypt: bool) -> None:
+        with self._lock:
+            for secret in secrets:
+                self.parameters[(secret.pk, decrypt)] = deepcopy(secret.data)
+
+    def _object(self, name: str, model: type[Secret], decrypt: bool) -> Secret:
+        with self._lock:
+            return model.objects.convert(deepcopy(self.parameters[(name, decrypt)]))
+
+    def _scan(self, prefix: str, decrypt: bool, client=None) -> None:
+        secrets = Secret.objects.list(prefix, decrypt=decrypt, client=client)
+        with self._lock:
+            self._add(secrets, decrypt)
+            self.prefixes.add((prefix, decrypt))
+
+    def _unscanned(self, prefixes: Sequence[str], decrypt: bool) -> builtins.list[str]:
+        """
+        Return the prefixes in ``prefixes`` that we still need to scan: those
+        not already scanned, and not covered by another prefix in the list.
+        """
+        needed: builtins.list[str] = []
+        # Sorting puts each prefix before any longer prefixes it covers
+        for prefix in sorted(set(prefixes)):
+            if self.is_scanned(prefix, decrypt) or any(prefix.startswith(p) for p in needed):
+                continue
+            needed.append(prefix)
+        return needed
+
+    def _scan_widened(self, prefix: str, wanted: builtins.list[str], decrypt: bool, client=None) -> None:
+        """
+        Scan ``prefix``, which covers all the prefixes in ``wanted``.  If
+        ``prefix`` is wider than what we were asked for and we're not allowed
+        to read or decrypt everything under it, scan just ``wanted`` instead.
+        """
+        if wanted == [prefix]:
+            self._scan(prefix, decrypt, client=client)
+            return
+        try:
+            self._scan(prefix, decrypt, client=client)
+        except (ClientError, Secret.DecryptionFailed):
+            for member in self._unscanned(wanted, decrypt):
+                self._scan(member, decrypt, client=client)
+
+    def prefetch(self, prefixes: Sequence[str], decrypt: bool = True) -> None:
+        """
+        Scan all of ``prefixes`` in as few AWS calls as we can, so that later
+        :py:meth:`list` calls for them need no AWS calls at all.
+
+        When at least :py:attr:`PREFETCH_WIDEN_THRESHOLD` prefixes share a
+        parent (e.g. ``shared.db.HOST``, ``shared.db.PORT``, ``shared.db.*``
+        ...), they are loaded with a single scan of that parent; if that scan
+        fails, we fall back to scanning each of them separately.  Prefixes
+        covered by another scan are dropped, and the remaining scans are run
+        concurrently.
+
+        Args:
+            prefixes: the prefixes to load, in the same format as for
+                :py:meth:`list`
+
+        Keyword Args:
+            decrypt: if ``True``, decrypt ``SecureString`` parameters
+
+        """
+        wanted = builtins.list(dict.fromkeys(self.normalize_prefix(p) for p in prefixes))
+        groups: dict[str, builtins.list[str]] = {}
+        for prefix in wanted:
+            parent = prefix.rsplit(".", 1)[0] + "." if "." in prefix else prefix
+            groups.setdefault(parent, []).append(prefix)
+        scans: builtins.list[str] = []
+        for parent, members in groups.items():
+            scans.extend([parent] if len(members) >= self.PREFETCH_WIDEN_THRESHOLD else members)
+        needed = self._unscanned(scans, decrypt)
+        if needed:
+            client = Secret.objects.client
+            run_concurrently(
+                self._scan_widened,
+                [(prefix, [p for p in wanted if p.startswith(prefix)], decrypt, client) for prefix in needed]
+            )
+
+    def list(
+        self,
+        prefix: str,
+        model: type[Secret] | None = None,
+        decrypt: bool = True
+    ) -> builtins.list[Secret]:
+        """
+        Return all the parameters whose names start with ``prefix``, scanning
+        the prefix in AWS if we haven't already.
+
+        Args:
+            prefix: the parameter name prefix, e.g. ``cluster.service.``
+
+        Keyword Args:
+            model: the class to return the parameters as.  Defaults to
+                :py:class:`Secret`.
+            decrypt: if ``True``, decrypt ``SecureString`` parameters
+
+        Returns:
+            The parameters, sorted by name.
+
+        """
+        model = model if model else Secret
+        prefix = self.normalize_prefix(prefix)
+        if not self.is_scanned(prefix, decrypt):
+            self._scan(prefix, decrypt)
+        with self._lock:
+            names = sorted(name for name, d in self.parameters if d == decrypt and name.startswith(prefix))
+        return [self._object(name, model, decrypt) for name in names]
+
+    def get_many(
+        self,
+        names: Sequence[str],
+        model: type[Secret] | None = None,
+        decrypt: bool = True
+    ) -> builtins.list[Secret]:
+        """
+        The :py:class:`SecretStore` version of :py:meth:`SecretManager.get_many`:
+        only the parameters we haven't seen yet are loaded from AWS.  Parameters
+        that don't exist in AWS are returned as unsaved ``String`` parameters with
+        no value, after the ones that do exist.
+
+        Args:
+            names: the fully qualified names of the parameters we want
+
+        Keyword Args:
+            model: the class to return the parameters as.  Defaults to
+                :py:class:`Secret`.
+            decrypt: if ``True``, decrypt ``SecureString`` parameters
+
+        Returns:
+            A list of parameters.
+
+        """
+        model = model if model else Secret
+        names = builtins.list(dict.fromkeys(names))
+        with self._lock:
+            wanted = [
+                name for name in names
+                if (name, decrypt) not in self.parameters and not self.is_scanned(name, decrypt)
+            ]
+        if wanted:
+            # get_many fakes up parameters that don't exist; those have no ARN
+            self._add([s for s in Secret.objects.get_many(wanted, decrypt=decrypt) if s.arn], decrypt)
+        secrets = []
+        absent = []
+        with self._lock:
+            for name in names:
+                if (name, decrypt) in self.parameters:
+                    secrets.append(self._object(name, model, decrypt))
+                else:
+                    absent.append(name)
+        for name in absent:
+            secrets.append(model.objects.convert({"Name": name, "Type": "String", "Tier": "Standard"}))
+        return secrets
+
+    def get(self, name: str, model: type[Secret] | None = None, decrypt: bool = True) -> Secret:
+        """
+        Return the parameter named ``name``, loading it from AWS if need be.
+
+        Raises:
+            Secret.DoesNotExist: no parameter named ``name`` exists in AWS
+
+        """
+        model = model if model else Secret
+        secret = self.get_many([name], model=model, decrypt=decrypt)[0]
+        if not secret.arn:
+            raise model.DoesNotExist(f"No secret named {name} exists in AWS")
+        return secret
+
+    def invalidate(self, names: Sequence[str]) -> None:
+        """
+        Forget what we know about the parameters named in ``names``, and about
+        any prefix scans that included them, so the next lookup goes to AWS.
+
+        Args:
+            names: the fully qualified names of the parameters to forget
+
+        """
+        with self._lock:
+            for name in names:
+                self.parameters.pop((name, True), None)
+                self.parameters.pop((name, False), None)
+                self.prefixes = {(prefix, d) for prefix, d in self.prefixes if not name.startswith(prefix)}
+
+    def clear(self) -> None:
+        """
+        Forget everything.
+        """
+        with self._lock:
+            self.parameters.clear()
+            self.prefixes.clear()
+
+
+#: The process-wide :py:class:`SecretStore`
+secret_store: SecretStore = SecretStore()
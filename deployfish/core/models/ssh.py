@@ -5,7 +5,7 @@ from deployfish.config import get_config
 
 from .abstract import Manager, Model
 from .ec2 import Instance
-from .secrets import Secret
+from .secrets import Secret, ServiceSecretLookupMixin
 
 # ----------------------------------------
 # Managers
@@ -15,12 +15,13 @@ class SSHTunnelManager(Manager):
 
     def get(self, pk: str, **_) -> "SSHTunnel":
         config = get_config()
-        section = config.get_section("tunnels")
+        # Find our tunnel before interpolating, so we interpolate only it
         tunnels = {}
-        for tunnel in section:
+        for tunnel in config.get_section_for_lookup("tunnels", keys=("name",)):
             tunnels[tunnel["name"]] = tunnel
         if pk in tunnels:
-            return cast("SSHTunnel", SSHTunnel.new(tunnels[pk], "deployfish"))
+            data = config.interpolate_item("tunnels", tunnels[pk])
+            return cast("SSHTunnel", SSHTunnel.new(data, "deployfish"))
         raise SSHTunnel.DoesNotExist(
             f'Could not find an ssh tunnel config named "{pk}" indeployfish.yml:tunnels'
         )
@@ -40,7 +41,7 @@ class SSHTunnelManager(Manager):
 # Models
 # ----------------------------------------
 
-class SSHTunnel(Model):
+class SSHTunnel(ServiceSecretLookupMixin, Model):
     """
     self.data here has the following structure:
 
@@ -82,17 +83,6 @@ class SSHTunnel(Model):
     def local_port(self) -> int:
         return self.data["local_port"]
 
-    def secret(self, name: str) -> Secret:
-        if "secrets" not in self.cache:
-            self.cache["secrets"] = {}
-        if name not in self.cache["secrets"]:
-            if "." not in name:
-                full_name = f"{self.service.secrets_prefix}{name}"
-            else:
-                full_name = name
-            self.cache["secrets"][name] = Secret.objects.get(full_name)
-        return self.cache["secrets"][name]
-
     def parse(self, key: str) -> Any:
         """
         Deployfish supports putting 'config.KEY' as the value for the host and port keys in self.data
@@ -0,0 +1,64 @@
+"""
+Benchmark the ``describe_parameters`` strategies in
+:py:meth:`deployfish.core.models.secrets.SecretManager.get_many` against
+:py:class:`FakeSSMClient`, to calibrate
+:py:attr:`SecretManager.PREFIX_SCAN_THRESHOLD`.
+
+Run it like so::
+
+    python -m deployfish.core.models.test.bench_SecretManager
+
+For each prefix size (10, 100 and 1000 parameters) and each number of
+requested parameters, we time ``get_many`` when describing by name
+(``Equals``), when scanning the prefix (``BeginsWith``) and with the default
+threshold (``auto``).
+"""
+from testfixtures import Replacer
+
+from deployfish.core.models.secrets import Secret, SecretManager
+from deployfish.core.utils.test.benchmark import best_of, make_parser
+
+from .fake_ssm import FakeSSMClient
+
+STRATEGIES = {
+    "equals": 10 ** 9,
+    "scan": 0,
+    "auto": SecretManager.PREFIX_SCAN_THRESHOLD,
+}
+
+
+def run(size: int, wanted: int, threshold: int, latency: float, per_item_latency: float) -> tuple[float, int]:
+    prefix = "bench-cluster.bench-service."
+    client = FakeSSMClient(
+        {f"{prefix}KEY_{i:04d}": str(i) for i in range(size)},
+        latency=latency,
+        per_item_latency=per_item_latency
+    )
+    manager = SecretManager(Secret)
+    manager.PREFIX_SCAN_THRESHOLD = threshold
+    names = [f"{prefix}KEY_{i:04d}" for i in range(0, size, max(size // wanted, 1))][:wanted]
+    with Replacer() as r:
+        r("deployfish.core.models.secrets.SecretManager.client", property(lambda _: client), strict=False)
+        elapsed = best_of(lambda: manager.get_many(names))
+    return elapsed, client.calls["describe_parameters"]
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--latency", type=float, default=0.030, help="Seconds per API call")
+    parser.add_argument("--per-item-latency", type=float, default=0.0002, help="Seconds per item in a call")
+    args = parser.parse_args()
+    print(f"{'params':>7} {'wanted':>7} " + " ".join(f"{s + ' ms (calls)':>18}" for s in STRATEGIES))
+    for size in (10, 100, 1000):
+        for wanted in (1, 5, 10, 25, 50, 100, 250, 500, 1000):
+            if wanted > size:
+                continue
+            cells = []
+            for threshold in STRATEGIES.values():
+                elapsed, calls = run(size, wanted, threshold, args.latency, args.per_item_latency)
+                cells.append(f"{elapsed:>10.1f} ({calls:>4})")
+            print(f"{size:>7} {wanted:>7} " + " ".join(f"{c:>18}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark :py:func:`deployfish.core.utils.diff.diff` against the
+``json.loads(jsondiff.diff(..., syntax="explicit", dump=True))`` round trip
+that :py:meth:`Model.diff` and the ``plan`` commands used to do.
+
+Run it like so::
+
+    python -m deployfish.core.models.test.bench_diff
+
+For each size we build two synthetic task definitions with ``N`` containers
+of ``N * 10`` environment variables and secrets each, change the image and a
+few environment variables in one container, and time diffing their
+``render_for_diff()`` output.  We also time diffing two identical ones, which
+is what ``plan`` does for every unchanged service.
+"""
+import json
+
+from jsondiff import diff as jsondiff_diff
+
+from deployfish.core.models.ecs import ContainerDefinition, TaskDefinition
+from deployfish.core.utils.diff import diff
+from deployfish.core.utils.test.benchmark import best_of, make_parser
+
+
+def make_task_definition(containers: int, env: int) -> TaskDefinition:
+    return TaskDefinition(
+        {
+            "family": "bench",
+            "networkMode": "awsvpc",
+            "executionRoleArn": "arn:aws:iam::123456789012:role/bench-execution",
+            "requiresCompatibilities": ["FARGATE"],
+            "volumes": [{"name": f"vol-{i}", "host": {"sourcePath": f"/data/{i}"}} for i in range(10)],
+        },
+        containers=[
+            ContainerDefinition({
+                "name": f"container-{c:02d}",
+                "image": f"123456789012.dkr.ecr.us-west-2.amazonaws.com/bench-{c}:1.0.0",
+                "cpu": 64,
+                "memory": 128,
+                "environment": [{"name": f"VAR_{i:04d}", "value": f"value-{i}" * 4} for i in range(env)],
+                "secrets": [
+                    {"name": f"SECRET_{i:04d}", "valueFrom": f"arn:aws:ssm:us-west-2:123456789012:parameter/b.{i}"}
+                    for i in range(env)
+                ],
+                "portMappings": [{"containerPort": 8000 + i, "protocol": "tcp"} for i in range(10)],
+                "logConfiguration": {"logDriver": "awslogs", "options": {"awslogs-group": "bench"}},
+            })
+            for c in range(containers)
+        ]
+    )
+
+
+def main() -> None:
+    parser = make_parser(__doc__, repeat=5)
+    args = parser.parse_args()
+    print(f"{'containers':>10} {'env':>5} {'case':>9} {'jsondiff ms':>12} {'ours ms':>10} {'speedup':>8}")
+    for containers in (2, 5, 10, 20):
+        env = containers * 10
+        old = make_task_definition(containers, env)
+        new = make_task_definition(containers, env)
+        changed = new.containers[containers // 2].data
+        changed["image"] = changed["image"].replace("1.0.0", "1.0.1")
+        for var in changed["environment"][::7]:
+            var["value"] = "changed"
+        for case, other in (("changed", new), ("identical", make_task_definition(containers, env))):
+            a = old.render_for_diff()
+            b = other.render_for_diff()
+            assert diff(a, b) == json.loads(jsondiff_diff(a, b, syntax="explicit", dump=True))
+            before = best_of(lambda: json.loads(jsondiff_diff(a, b, syntax="explicit", dump=True)), args.repeat)
+            after = best_of(lambda: diff(a, b), args.repeat)
+            print(f"{containers:>10} {env:>5} {case:>9} {before:12.2f} {after:10.2f} {before / after:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Measure how much memory listing lots of
+:py:class:`deployfish.core.models.ecs.InvokedTask` and
+:py:class:`deployfish.core.models.cloudwatchlogs.CloudWatchLogStream` objects
+takes now that they are :py:class:`deployfish.core.models.abstract.CompactModel`
+subclasses, against what they took as ordinary models with a ``__dict__`` and
+an eagerly created ``cache``.
+
+Run it like so::
+
+    python -m deployfish.core.models.test.bench_memory
+
+We list ``--count`` tasks with ``InvokedTask.objects.list()`` and ``--count``
+log streams with ``CloudWatchLogStream.objects.list()`` against a fake AWS
+client, and report the memory tracemalloc sees allocated for the results.
+The API responses are built before we start measuring, so what we report is
+the cost of the model objects themselves, not of their data.
+"""
+from unittest.mock import Mock
+
+from testfixtures import Replacer
+
+from deployfish.core.models.abstract import LazyAttributeMixin
+from deployfish.core.models.cloudwatchlogs import CloudWatchLogStream
+from deployfish.core.models.ecs import InvokedTask
+from deployfish.core.utils.test.benchmark import make_parser, traced_memory
+
+CLUSTER_ARN = "arn:aws:ecs:us-west-2:123456789012:cluster/bench"
+
+
+def dict_backed(cls: type) -> type:
+    # What cls was before it was a CompactModel: a __dict__, and a cache dict
+    # created in __init__
+    return type(cls.__name__, (cls,), {"cache": None, "purge_cache": LazyAttributeMixin.purge_cache})
+
+
+def make_client(count: int) -> Mock:
+    tasks = {
+        f"arn:aws:ecs:us-west-2:123456789012:task/bench/{i:032x}": {
+            "taskArn": f"arn:aws:ecs:us-west-2:123456789012:task/bench/{i:032x}",
+            "clusterArn": CLUSTER_ARN,
+            "taskDefinitionArn": f"arn:aws:ecs:us-west-2:123456789012:task-definition/bench:{i % 10}",
+            "lastStatus": "RUNNING",
+            "launchType": "FARGATE",
+            "cpu": "256",
+            "memory": "512",
+        }
+        for i in range(count)
+    }
+    task_pages = [{"taskArns": list(tasks)[i:i + 100]} for i in range(0, count, 100)]
+    stream_pages = [
+        {"logStreams": [
+            {
+                "logStreamName": f"bench/web/{j:032x}",
+                "arn": f"arn:aws:logs:us-west-2:123456789012:log-group:bench:log-stream:bench/web/{j:032x}",
+                "creationTime": 1700000000000 + j,
+                "lastEventTimestamp": 1700000000000 + j,
+            }
+            for j in range(i, min(i + 50, count))
+        ]}
+        for i in range(0, count, 50)
+    ]
+    paginators = {
+        "list_tasks": Mock(**{"paginate.return_value": task_pages}),
+        "describe_log_streams": Mock(**{"paginate.return_value": stream_pages}),
+    }
+    client = Mock()
+    client.get_paginator.side_effect = paginators.get
+    by_arn = tasks
+    client.describe_tasks.side_effect = lambda cluster, tasks: {"tasks": [by_arn[arn] for arn in tasks]}
+    return client
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--count", type=int, default=10000, help="Tasks and log streams to list")
+    args = parser.parse_args()
+    client = make_client(args.count)
+    cases = {
+        "tasks": (lambda: InvokedTask.objects.list("bench"), "deployfish.core.models.ecs.InvokedTask", InvokedTask),
+        "log streams": (
+            lambda: CloudWatchLogStream.objects.list("bench"),
+            "deployfish.core.models.cloudwatchlogs.CloudWatchLogStream",
+            CloudWatchLogStream,
+        ),
+    }
+    print(f"{'':>12} {'dict KiB':>10} {'slots KiB':>10} {'bytes/obj saved':>16} {'saved':>7}")
+    with Replacer() as r:
+        r.replace("deployfish.core.models.abstract.get_boto3_session", Mock(return_value=Mock(
+            client=Mock(return_value=client)
+        )))
+        for name, (func, target, cls) in cases.items():
+            with Replacer() as r2:
+                r2.replace(target, dict_backed(cls))
+                before, result = traced_memory(func)
+            del result
+            after, result = traced_memory(func)
+            assert len(result) == args.count  # type: ignore[arg-type]
+            del result
+            print(
+                f"{name:>12} {before / 1024:10.0f} {after / 1024:10.0f} "
+                f"{(before - after) / args.count:16.0f} {1 - after / before:6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+A small in-memory stand-in for the AWS SSM Parameter Store API, good enough to
+exercise :py:class:`deployfish.core.models.secrets.SecretManager` in tests and
+benchmarks without talking to AWS.
+
+Each API call sleeps for ``latency`` seconds (plus ``per_item_latency`` for
+every parameter returned or filter value evaluated), and is counted in
+``calls``, so we can compare how many round trips different strategies make.
+"""
+import datetime
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+
+class FakeSSMClient:
+
+    class exceptions:  # noqa: N801
+
+        class InvalidKeyId(Exception):
+            pass
+
+        class ParameterNotFound(Exception):
+            pass
+
+    def __init__(
+        self,
+        parameters: dict[str, str] | None = None,
+        latency: float = 0.0,
+        per_item_latency: float = 0.0,
+        max_put_tps: int | None = None
+    ) -> None:
+        self.parameters: dict[str, dict[str, Any]] = {}
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.max_put_tps = max_put_tps
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._put_times: list[float] = []
+        for name, value in (parameters or {}).items():
+            self._store(name, {"Value": value, "Type": "String", "Tier": "Standard", "DataType": "text"})
+
+    # ------------------------
+    # Helpers
+    # ------------------------
+
+    def _store(self, name: str, kwargs: dict[str, Any]) -> int:
+        existing = self.parameters.get(name)
+        version = existing["Version"] + 1 if existing else 1
+        data = {
+            "Name": name,
+            "Type": kwargs.get("Type", "String"),
+            "Value": kwargs["Value"],
+            "Tier": kwargs.get("Tier", "Standard"),
+            "DataType": kwargs.get("DataType", "text"),
+            "Version": version,
+            "LastModifiedDate": datetime.datetime(2021, 1, 1),
+            "LastModifiedUser": "arn:aws:iam::123456789012:user/fake",
+            "Policies": [],
+        }
+        if kwargs.get("KeyId"):
+            data["KeyId"] = kwargs["KeyId"]
+        self.parameters[name] = data
+        return version
+
+    def _call(self, method: str, items: int = 0) -> None:
+        with self._lock:
+            self.calls[method] += 1
+        delay = self.latency + self.per_item_latency * items
+        if delay:
+            time.sleep(delay)
+
+    def _describe(self, data: dict[str, Any]) -> dict[str, Any]:
+        d = {k: v for k, v in data.items() if k != "Value"}
+        d.pop("ARN", None)
+        return d
+
+    # ------------------------
+    # boto3 API
+    # ------------------------
+
+    def get_paginator(self, method: str) -> "FakeSSMClient._Paginator":
+        assert method == "describe_parameters", f"FakeSSMClient does not paginate {method}"
+        return self._Paginator(self)
+
+    class _Paginator:
+
+        def __init__(self, client: "FakeSSMClient") -> None:
+            self.client = client
+
+        def paginate(self, ParameterFilters=None, PaginationConfig=None):  # noqa: N803
+            page_size = (PaginationConfig or {}).get("PageSize", 10)
+            return self.client._describe_pages(ParameterFilters or [], page_size)
+
+    def _describe_pages(self, filters: list[dict[str, Any]], page_size: int):
+        names = sorted(self.parameters)
+        for f in filters:
+            assert f["Key"] == "Name"
+            assert len(f["Values"]) <= 50, "describe_parameters accepts at most 50 filter values"
+            if f["Option"] == "BeginsWith":
+                names = [n for n in names if any(n.startswith(v) for v in f["Values"])]
+            else:
+                values = set(f["Values"])
+                names = [n for n in names if n in values]
+        n_values = sum(len(f["Values"]) for f in filters)
+        if not names:
+            self._call("describe_parameters", n_values)
+            yield {"Parameters": []}
+            return
+        for i in range(0, len(names), page_size):
+            chunk = names[i:i + page_size]
+            self._call("describe_parameters", n_values + len(chunk))
+            yield {"Parameters": [self._describe(self.parameters[n]) for n in chunk]}
+
+    def get_parameters(self, Names: list[str], WithDecryption: bool = True) -> dict[str, Any]:  # noqa: N803
+        assert len(Names) <= 10, "get_parameters accepts at most 10 names"
+        self._call("get_parameters", len(Names))
+        found = []
+        invalid = []
+        for name in Names:
+            if name in self.parameters:
+                data = dict(self.parameters[name])
+                data["ARN"] = f"arn:aws:ssm:us-west-2:123456789012:parameter/{name}"
+                found.append(data)
+            else:
+                invalid.append(name)
+        return {"Parameters": found, "InvalidParameters": invalid}
+
+    def put_parameter(self, **kwargs) -> dict[str, Any]:
+        self._call("put_parameter", 1)
+        if self.max_put_tps:
+            with self._lock:
+                now = time.monotonic()
+                self._put_times = [t for t in self._put_times if now - t < 1.0]
+                if len(self._put_times) >= self.max_put_tps:
+                    raise ClientError(
+                        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                        "PutParameter"
+                    )
+                self._put_times.append(now)
+        with self._lock:
+            version = self._store(kwargs["Name"], kwargs)
+        return {"Version": version, "Tier": kwargs.get("Tier", "Standard")}
+
+    def delete_parameter(self, Name: str) -> dict[str, Any]:  # noqa: N803
+        self._call("delete_parameter", 1)
+        if Name not in self.parameters:
+            raise self.exceptions.ParameterNotFound(Name)
+        del self.parameters[Name]
+        return {}
+
+    def delete_parameters(self, Names: list[str]) -> dict[str, Any]:  # noqa: N803
+        assert len(Names) <= 10, "delete_parameters accepts at most 10 names"
+        self._call("delete_parameters", len(Names))
+        deleted = []
+        invalid = []
+        with self._lock:
+            for name in Names:
+                if name in self.parameters:
+                    del self.parameters[name]
+                    deleted.append(name)
+                else:
+                    invalid.append(name)
+        return {"DeletedParameters": deleted, "InvalidParameters": invalid}
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import Mock
+
+from testfixtures import compare
+
+from deployfish.core.models.cloudwatchlogs import CloudWatchLogStream
+from deployfish.core.models.secrets import ExternalSecret, Secret
+
+
+class TestCompactModel(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = CloudWatchLogStream({"logGroupName": "group", "logStreamName": "stream"})
+
+    def test_no_dict(self):
+        self.assertFalse(hasattr(self.stream, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.stream.foo = "bar"  # type: ignore[attr-defined]
+
+    def test_cache_is_created_lazily(self):
+        self.assertIsNone(self.stream._cache)
+        populator = Mock(return_value="GROUP")
+        compare(self.stream.get_cached("log_group", populator, []), "GROUP")
+        compare(self.stream.get_cached("log_group", populator, []), "GROUP")
+        populator.assert_called_once_with()
+        compare(self.stream.cache, {"log_group": "GROUP"})
+        self.stream.purge_cache()
+        self.assertIsNone(self.stream._cache)
+
+    def test_subclass_slots(self):
+        secret = ExternalSecret({"Name": "foo.BAR", "Value": "baz", "Type": "String"}, name="BAR")
+        self.assertFalse(hasattr(secret, "__dict__"))
+        compare(secret.name, "BAR")
+        copy = secret.copy()
+        compare(copy.pk, "foo.BAR")
+        self.assertIsInstance(copy, Secret)
@@ -0,0 +1,126 @@
+import unittest
+from unittest.mock import Mock
+
+from testfixtures import compare
+
+from deployfish.core.models.abstract import IdentityMap, Manager, Model, identity_map
+
+
+class WidgetManager(Manager):
+
+    def __init__(self):
+        super().__init__()
+        self.describe = Mock(side_effect=lambda pks: [Widget({"name": pk.split("/")[-1]}) for pk in pks])
+
+    def get(self, pk: str, **kwargs) -> "Widget":
+        return self.get_many([pk])[0]
+
+    def get_many(self, pks: list[str], **kwargs) -> list["Widget"]:
+        return self.describe(pks)
+
+    def save(self, obj: Model, **_) -> str:
+        return obj.pk
+
+
+class Widget(Model):
+
+    objects = WidgetManager()
+
+    @property
+    def pk(self) -> str:
+        return self.data["name"]
+
+    @property
+    def arn(self) -> str:
+        return f"arn:widget/{self.data['name']}"
+
+
+def load(pk: str) -> Widget:
+    return identity_map.load(Widget, pk, Widget.objects.get)
+
+
+class TestIdentityMap(unittest.TestCase):
+
+    def setUp(self):
+        Widget.objects.describe.reset_mock()
+
+    def test_no_scope_no_sharing(self):
+        load("foo")
+        load("foo")
+        compare(Widget.objects.describe.call_count, 2)
+
+    def test_load_is_shared_within_scope(self):
+        with identity_map.scope():
+            compare(load("foo").data, {"name": "foo"})
+            compare(load("foo").data, {"name": "foo"})
+            compare(load("arn:widget/foo").data, {"name": "foo"})
+            compare(Widget.objects.describe.call_count, 1)
+            stats = identity_map.stats()
+            compare(stats["hits"], 2)
+            compare(stats["stores"], 1)
+            compare(stats["size"], 1)
+            compare(stats["models"]["Widget"]["hits"], 2)
+        # Leaving the scope forgets everything
+        compare(identity_map.stats()["size"], 0)
+
+    def test_callers_get_their_own_copies(self):
+        with identity_map.scope():
+            foo = load("foo")
+            foo.data["color"] = "red"
+            other = load("foo")
+            self.assertIsNot(other, foo)
+            compare(other.data, {"name": "foo"})
+
+    def test_managers_do_not_use_the_map(self):
+        with identity_map.scope():
+            load("foo")
+            Widget.objects.get("foo")
+            compare(Widget.objects.describe.call_count, 2)
+
+    def test_load_many(self):
+        with identity_map.scope():
+            load("foo")
+            objs = identity_map.load_many(Widget, ["foo", "bar", "foo"], Widget.objects.get_many)
+            compare(sorted(obj.pk for obj in objs), ["bar", "foo"])
+            Widget.objects.describe.assert_called_with(["bar"])
+            identity_map.load_many(Widget, ["bar", "foo"], Widget.objects.get_many)
+            compare(Widget.objects.describe.call_count, 2)
+
+    def test_save_and_reload_invalidate(self):
+        with identity_map.scope():
+            foo = load("foo")
+            foo.save()
+            load("foo")
+            compare(Widget.objects.describe.call_count, 2)
+            foo.reload_from_db()
+            load("arn:widget/foo")
+            compare(Widget.objects.describe.call_count, 4)
+            compare(identity_map.stats()["invalidations"], 2)
+
+    def test_nested_scopes(self):
+        with identity_map.scope():
+            load("foo")
+            with identity_map.scope():
+                load("foo")
+            load("foo")
+            compare(Widget.objects.describe.call_count, 1)
+
+    def test_suspended(self):
+        with identity_map.scope():
+            load("foo")
+            with identity_map.suspended():
+                load("foo")
+                load("bar")
+            load("foo")
+            compare(Widget.objects.describe.call_count, 3)
+            compare(identity_map.stats()["size"], 1)
+
+    def test_add_keeps_first_instance(self):
+        imap = IdentityMap()
+        first = Widget({"name": "foo"})
+        self.assertIs(imap.add(Widget, first, aliases=["family"]), first)
+        first.data["color"] = "red"
+        compare(imap.add(Widget, Widget({"name": "foo"})).data, {"name": "foo"})
+        compare(imap.get(Widget, "family").data, {"name": "foo"})
+        imap.invalidate(Widget, "foo")
+        self.assertIsNone(imap.get(Widget, "family"))
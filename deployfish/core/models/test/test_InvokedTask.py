@@ -0,0 +1,130 @@
+import gc
+import unittest
+import weakref
+from unittest.mock import Mock
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.models.abstract import batch_of, identity_map
+from deployfish.core.models.ecs import InvokedTask, TaskDefinition
+
+CLUSTER_ARN = "arn:aws:ecs:us-west-2:123456789012:cluster/prod"
+
+
+def task(n, container_instance=None, family="web"):
+    data = {
+        "taskArn": f"arn:aws:ecs:us-west-2:123456789012:task/prod/{n}",
+        "clusterArn": CLUSTER_ARN,
+        "taskDefinitionArn": f"arn:aws:ecs:us-west-2:123456789012:task-definition/{family}:1",
+    }
+    if container_instance:
+        data["containerInstanceArn"] = container_instance
+    return data
+
+
+class TestInvokedTask_batched_relations(unittest.TestCase):
+
+    def setUp(self):
+        tasks = [task(1, "ci-1"), task(2, "ci-1"), task(3, "ci-2", family="worker"), task(4)]
+        self.client = Mock()
+        self.client.exceptions.ClusterNotFoundException = type("ClusterNotFoundException", (Exception,), {})
+        self.client.exceptions.ServiceNotFoundException = type("ServiceNotFoundException", (Exception,), {})
+        self.paginators = {
+            "list_tasks": Mock(**{"paginate.return_value": [{"taskArns": [t["taskArn"] for t in tasks]}]}),
+            "describe_instances": Mock(**{"paginate.return_value": [
+                {"Reservations": [{"Instances": [{"InstanceId": i, "Tags": []} for i in ("i-1", "i-2")]}]}
+            ]}),
+        }
+        self.client.get_paginator.side_effect = self.paginators.get
+        self.client.describe_tasks.return_value = {"tasks": tasks}
+        self.client.describe_container_instances.return_value = {
+            "containerInstances": [
+                {"containerInstanceArn": "ci-1", "ec2InstanceId": "i-1"},
+                {"containerInstanceArn": "ci-2", "ec2InstanceId": "i-2"},
+            ]
+        }
+        self.client.describe_task_definition.side_effect = lambda taskDefinition, **_: {
+            "taskDefinition": {
+                "family": taskDefinition.rsplit("/", 1)[1].split(":")[0],
+                "taskDefinitionArn": taskDefinition,
+                "containerDefinitions": [],
+            }
+        }
+        self.r = Replacer()
+        self.r.replace("deployfish.core.models.abstract.get_boto3_session", Mock(return_value=Mock(
+            client=Mock(return_value=self.client)
+        )))
+
+    def tearDown(self):
+        self.r.restore()
+
+    def test_list_is_one_describe(self):
+        tasks = InvokedTask.objects.list("prod")
+        compare(len(tasks), 4)
+        self.client.describe_tasks.assert_called_once()
+
+    def test_iterator_is_lazy(self):
+        tasks = InvokedTask.objects.iterator("prod", service="web")
+        self.client.get_paginator.assert_not_called()
+        compare(next(tasks).arn, "arn:aws:ecs:us-west-2:123456789012:task/prod/1")
+        self.paginators["list_tasks"].paginate.assert_called_once_with(
+            cluster="prod", desiredStatus="RUNNING", serviceName="web"
+        )
+
+    def test_container_instances_and_instances_are_batched(self):
+        tasks = InvokedTask.objects.list("prod")
+        container_instances = [t.container_instance for t in tasks]
+        self.client.describe_container_instances.assert_called_once_with(
+            cluster="prod", containerInstances=["ci-1", "ci-2"]
+        )
+        self.assertIs(container_instances[0], container_instances[1])
+        self.assertIsNone(container_instances[3])
+        compare([t.instance.pk if t.instance else None for t in tasks], ["i-1", "i-1", "i-2", None])
+        self.paginators["describe_instances"].paginate.assert_called_once_with(InstanceIds=["i-1", "i-2"])
+
+    def test_task_definitions_are_loaded_once_each(self):
+        with identity_map.scope():
+            tasks = InvokedTask.objects.list("prod")
+            compare([t.task_definition.family for t in tasks], ["web", "web", "worker", "web"])
+            compare(self.client.describe_task_definition.call_count, 2)
+
+    def test_one_missing_task_definition_does_not_fail_the_batch(self):
+        self.client.exceptions.ClientException = type("ClientException", (Exception,), {})
+        describe = self.client.describe_task_definition.side_effect
+
+        def describe_task_definition(taskDefinition, **kwargs):  # noqa: N803
+            if "worker" in taskDefinition:
+                raise self.client.exceptions.ClientException()
+            return describe(taskDefinition, **kwargs)
+
+        self.client.describe_task_definition.side_effect = describe_task_definition
+        tasks = InvokedTask.objects.list("prod")
+        compare(tasks[0].task_definition.family, "web")
+        compare(tasks[3].task_definition.family, "web")
+        with self.assertRaises(TaskDefinition.DoesNotExist):
+            tasks[2].task_definition  # noqa: B018
+
+    def test_unexpected_errors_fail_the_batch(self):
+        self.client.exceptions.ClientException = type("ClientException", (Exception,), {})
+        self.client.describe_task_definition.side_effect = KeyError("containerDefinitions")
+        tasks = InvokedTask.objects.list("prod")
+        with self.assertRaises(KeyError):
+            InvokedTask.objects.prefetch_related(tasks, "task_definition")
+
+    def test_batch_does_not_keep_siblings_alive(self):
+        tasks = InvokedTask.objects.list("prod")
+        first = tasks[0]
+        compare(batch_of(first), tasks)
+        sibling = weakref.ref(tasks[1])
+        del tasks
+        gc.collect()
+        self.assertIsNone(sibling())
+        compare(batch_of(first), [first])
+
+    def test_single_task_is_not_batched(self):
+        single = InvokedTask.objects.get(f"prod:{task(1)['taskArn']}")
+        compare(batch_of(single), [])
+        self.assertIsNotNone(single.container_instance)
+        self.client.describe_container_instances.assert_called_once_with(
+            cluster="prod", containerInstances=["ci-1"]
+        )
@@ -0,0 +1,147 @@
+import unittest
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.models.secrets import Secret, SecretManager, SecretsMixin, secret_store
+from deployfish.core.utils import AdaptiveRateLimiter
+
+from .fake_ssm import FakeSSMClient
+
+
+def make_parameters(prefix, count):
+    return {f"{prefix}KEY_{i:04d}": f"value-{i}" for i in range(count)}
+
+
+class TestSecretManager_plan_describes(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = SecretManager(Secret)
+
+    def test_few_names_are_described_by_name(self):
+        names = ["cluster.foo.A", "cluster.foo.B", "cluster.bar.C"]
+        compare(self.manager._plan_describes(names), [(names, "equals")])
+
+    def test_equals_batches_hold_at_most_50_names(self):
+        names = [f"cluster.svc{i}.KEY" for i in range(120)]
+        plan = self.manager._plan_describes(names)
+        compare([len(key) for key, _ in plan], [50, 50, 20])
+        compare({option for _, option in plan}, {"equals"})
+
+    def test_many_names_from_one_prefix_scan_the_prefix(self):
+        names = [f"cluster.foo.KEY_{i}" for i in range(SecretManager.PREFIX_SCAN_THRESHOLD + 1)]
+        names.append("cluster.bar.OTHER")
+        compare(
+            self.manager._plan_describes(names),
+            [("cluster.foo.", "prefix"), (["cluster.bar.OTHER"], "equals")]
+        )
+
+
+class TestSecretManager_get_many(unittest.TestCase):
+
+    def setUp(self):
+        parameters = make_parameters("cluster.foo.", 100)
+        parameters.update(make_parameters("cluster.bar.", 5))
+        self.client = FakeSSMClient(parameters)
+        self.manager = SecretManager(Secret)
+
+    def get_many(self, names):
+        with Replacer() as r:
+            r("deployfish.core.models.secrets.SecretManager.client", property(lambda _: self.client), strict=False)
+            return self.manager.get_many(names)
+
+    def test_returns_only_the_requested_secrets(self):
+        names = ["cluster.foo.KEY_0001", "cluster.foo.KEY_0002", "cluster.bar.KEY_0003"]
+        secrets = self.get_many(names)
+        compare([s.pk for s in secrets], names)
+        compare([s.value for s in secrets], ["value-1", "value-2", "value-3"])
+        compare([s.arn is not None for s in secrets], [True, True, True])
+
+    def test_few_names_use_one_describe_call(self):
+        names = ["cluster.foo.KEY_0001", "cluster.foo.KEY_0002", "cluster.bar.KEY_0003"]
+        self.get_many(names)
+        compare(self.client.calls["describe_parameters"], 1)
+        compare(self.client.calls["get_parameters"], 1)
+
+    def test_many_names_scan_the_prefix(self):
+        self.manager.PREFIX_SCAN_THRESHOLD = 50
+        names = [f"cluster.foo.KEY_{i:04d}" for i in range(80)]
+        secrets = self.get_many(names)
+        compare(len(secrets), 80)
+        # 100 parameters under cluster.foo. in pages of 50
+        compare(self.client.calls["describe_parameters"], 2)
+        compare(self.client.calls["get_parameters"], 8)
+
+    def test_non_existant_parameters_are_faked(self):
+        secrets = self.get_many(["cluster.foo.KEY_0001", "cluster.foo.NOPE"])
+        compare([s.pk for s in secrets], ["cluster.foo.KEY_0001", "cluster.foo.NOPE"])
+        self.assertNotIn("Value", secrets[1].data)
+
+
+class FakeService(SecretsMixin):
+
+    def __init__(self, secrets):
+        self.cache = {"secrets": {s.secret_name: s for s in secrets}}
+
+    @property
+    def secrets_prefix(self):
+        return "cluster.foo."
+
+
+def new_secret(name, value):
+    return Secret(
+        {"Name": f"cluster.foo.{name}", "Value": value, "Type": "String", "Tier": "Standard", "DataType": "text"},
+        name=name
+    )
+
+
+class TestSecretsMixin_write_secrets(unittest.TestCase):
+
+    def setUp(self):
+        secret_store.clear()
+        self.client = FakeSSMClient({
+            "cluster.foo.UNCHANGED": "same",
+            "cluster.foo.CHANGED": "old",
+            "cluster.foo.GONE_1": "x",
+            "cluster.foo.GONE_2": "y",
+        })
+
+    def write(self, obj):
+        with Replacer() as r:
+            r("deployfish.core.models.secrets.SecretManager.client", property(lambda _: self.client), strict=False)
+            return obj.write_secrets()
+
+    def test_only_changed_secrets_are_written(self):
+        obj = FakeService([
+            new_secret("UNCHANGED", "same"),
+            new_secret("CHANGED", "new"),
+            new_secret("ADDED", "added"),
+        ])
+        counts = self.write(obj)
+        compare(counts, {"written": 2, "skipped": 1, "deleted": 2})
+        compare(self.client.calls["put_parameter"], 2)
+        compare(self.client.calls["delete_parameters"], 1)
+        compare(
+            {name: p["Value"] for name, p in self.client.parameters.items()},
+            {"cluster.foo.UNCHANGED": "same", "cluster.foo.CHANGED": "new", "cluster.foo.ADDED": "added"}
+        )
+        compare(self.client.parameters["cluster.foo.UNCHANGED"]["Version"], 1)
+
+    def test_deletes_are_batched_by_ten(self):
+        for i in range(25):
+            self.client.parameters[f"cluster.foo.EXTRA_{i}"] = dict(
+                self.client.parameters["cluster.foo.GONE_1"], Name=f"cluster.foo.EXTRA_{i}"
+            )
+        counts = self.write(FakeService([new_secret("UNCHANGED", "same")]))
+        compare(counts["deleted"], 28)
+        compare(self.client.calls["delete_parameters"], 3)
+
+    def test_throttled_writes_are_retried(self):
+        self.client.max_put_tps = 2
+        secrets = [new_secret(f"NEW_{i}", str(i)) for i in range(6)]
+        limiter = AdaptiveRateLimiter(rate=50.0, max_attempts=20, base_delay=0.01)
+        with Replacer() as r:
+            r("deployfish.core.models.secrets.SecretManager.client", property(lambda _: self.client), strict=False)
+            Secret.objects.save_many(secrets, limiter=limiter)
+        self.assertGreater(limiter.throttled, 0)
+        for i in range(6):
+            compare(self.client.parameters[f"cluster.foo.NEW_{i}"]["Value"], str(i))
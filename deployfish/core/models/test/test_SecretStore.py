@@ -0,0 +1,163 @@
+import unittest
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+from testfixtures import Replacer, compare
+
+from deployfish.core.models.secrets import ExternalSecret, Secret, SecretsMixin, SecretStore
+
+from .fake_ssm import FakeSSMClient
+
+
+class SecretStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeSSMClient({
+            "cluster.foo.A": "a",
+            "cluster.foo.B": "b",
+            "cluster.bar.C": "c",
+            "shared.D": "d",
+        })
+        self.store = SecretStore()
+        self.replacer = Replacer()
+        self.replacer(
+            "deployfish.core.models.secrets.SecretManager.client", property(lambda _: self.client), strict=False
+        )
+        self.replacer("deployfish.core.models.secrets.secret_store", self.store)
+
+    def tearDown(self):
+        self.replacer.restore()
+
+
+class TestSecretStore_list(SecretStoreTestCase):
+
+    def test_prefix_is_scanned_once(self):
+        compare([s.value for s in self.store.list("cluster.foo.")], ["a", "b"])
+        compare([s.value for s in self.store.list("cluster.foo.*")], ["a", "b"])
+        compare(self.client.calls["describe_parameters"], 1)
+        compare(self.client.calls["get_parameters"], 1)
+
+    def test_each_caller_gets_its_own_instance(self):
+        first = self.store.list("cluster.foo.")
+        second = self.store.list("cluster.foo.")
+        self.assertIsNot(first[0], second[0])
+        first[0].value = "changed"
+        compare(second[0].value, "a")
+        compare(self.store.get("cluster.foo.A").value, "a")
+
+    def test_instances_are_per_model(self):
+        secret = self.store.list("cluster.foo.")[0]
+        external = self.store.list("cluster.foo.", model=ExternalSecret)[0]
+        self.assertIsInstance(external, ExternalSecret)
+        self.assertIsNot(secret, external)
+        compare(external.value, secret.value)
+
+
+class TestSecretStore_get_many(SecretStoreTestCase):
+
+    def test_names_under_scanned_prefix_need_no_aws_calls(self):
+        self.store.list("cluster.foo.")
+        self.client.calls.clear()
+        secrets = self.store.get_many(["cluster.foo.B", "cluster.foo.MISSING", "cluster.foo.A"])
+        compare([s.pk for s in secrets], ["cluster.foo.B", "cluster.foo.A", "cluster.foo.MISSING"])
+        compare(secrets[2].arn, None)
+        compare(sum(self.client.calls.values()), 0)
+
+    def test_only_unseen_names_are_fetched(self):
+        self.store.get_many(["shared.D"])
+        self.client.calls.clear()
+        secrets = self.store.get_many(["shared.D", "cluster.bar.C"])
+        compare([s.value for s in secrets], ["d", "c"])
+        compare(self.client.calls["get_parameters"], 1)
+
+    def test_get_raises_for_missing_parameter(self):
+        with self.assertRaises(Secret.DoesNotExist):
+            self.store.get("shared.MISSING")
+
+
+class TestSecretStore_invalidation(SecretStoreTestCase):
+
+    def test_save_invalidates(self):
+        secret = self.store.list("cluster.foo.")[0]
+        secret.value = "new"
+        Secret.objects.save(secret)
+        self.client.calls.clear()
+        compare([s.value for s in self.store.list("cluster.foo.")], ["new", "b"])
+        compare(self.client.calls["describe_parameters"], 1)
+
+    def test_delete_many_invalidates(self):
+        self.store.list("cluster.foo.")
+        Secret.objects.delete_many_by_name(["cluster.foo.A"])
+        compare([s.pk for s in self.store.list("cluster.foo.")], ["cluster.foo.B"])
+
+    def test_reload_secrets_invalidates(self):
+        obj = SecretsMixin()
+        obj.cache = {"secrets": {s.secret_name: s for s in self.store.list("cluster.foo.")}}
+        self.client.parameters["cluster.foo.A"]["Value"] = "changed"
+        obj.reload_secrets()
+        compare(self.store.get("cluster.foo.A").value, "changed")
+
+
+class TestSecretStore_prefetch(SecretStoreTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ["shared.db.HOST", "shared.db.PORT", "shared.db.USER", "shared.cache.HOST", "other.KEY"]:
+            self.client.parameters[name] = dict(self.client.parameters["shared.D"], Name=name)
+
+    def test_a_few_specs_sharing_a_parent_are_scanned_separately(self):
+        self.store.prefetch(["shared.db.HOST", "shared.db.PORT", "shared.cache.HOST", "other.*"], decrypt=False)
+        compare(self.client.calls["describe_parameters"], 4)
+        compare(self.store.is_scanned("shared.db.USER", decrypt=False), False)
+
+    def test_many_specs_sharing_a_parent_are_scanned_together(self):
+        self.store.PREFETCH_WIDEN_THRESHOLD = 2
+        self.store.prefetch(["shared.db.HOST", "shared.db.PORT", "shared.cache.HOST", "other.*"], decrypt=False)
+        # one scan each for "shared.db.", "shared.cache.HOST" and "other."
+        compare(self.client.calls["describe_parameters"], 3)
+        self.client.calls.clear()
+        compare(
+            [s.pk for s in self.store.list("shared.db.PORT", decrypt=False)],
+            ["shared.db.PORT"]
+        )
+        compare([s.pk for s in self.store.list("other.*", decrypt=False)], ["other.KEY"])
+        compare(sum(self.client.calls.values()), 0)
+
+    def test_failed_parent_scan_falls_back_to_the_specs(self):
+        self.store.PREFETCH_WIDEN_THRESHOLD = 2
+        paginate = self.client.get_paginator("describe_parameters").paginate
+
+        def fake_paginate(ParameterFilters, **kwargs):  # noqa: N803
+            if ParameterFilters[0]["Values"] == ["shared.db."]:
+                raise ClientError(
+                    {"Error": {"Code": "AccessDeniedException", "Message": "Denied"}},
+                    "DescribeParameters"
+                )
+            return paginate(ParameterFilters=ParameterFilters, **kwargs)
+
+        self.client.get_paginator = Mock(return_value=Mock(paginate=fake_paginate))
+        self.store.prefetch(["shared.db.HOST", "shared.db.PORT"], decrypt=False)
+        del self.client.get_paginator
+        compare(self.store.is_scanned("shared.db.", decrypt=False), False)
+        self.client.calls.clear()
+        compare(
+            [s.pk for s in self.store.list("shared.db.HOST", decrypt=False)],
+            ["shared.db.HOST"]
+        )
+        compare([s.pk for s in self.store.list("shared.db.PORT", decrypt=False)], ["shared.db.PORT"])
+        compare(sum(self.client.calls.values()), 0)
+
+    def test_covered_and_scanned_prefixes_are_skipped(self):
+        self.store.list("shared.db.", decrypt=False)
+        self.client.calls.clear()
+        self.store.prefetch(["shared.*", "shared.db.HOST", "shared.cache.HOST"], decrypt=False)
+        compare(self.client.calls["describe_parameters"], 1)
+        self.client.calls.clear()
+        self.store.prefetch(["shared.db.USER"], decrypt=False)
+        compare(sum(self.client.calls.values()), 0)
+
+    def test_decrypted_and_undecrypted_are_kept_apart(self):
+        self.store.prefetch(["shared.db.*"], decrypt=False)
+        self.client.calls.clear()
+        self.store.list("shared.db.")
+        compare(self.client.calls["describe_parameters"], 1)
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import Mock
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.models.ecs import Service
+
+
+def service_arn(cluster, name):
+    return f"arn:aws:ecs:us-west-2:123456789012:service/{cluster}/{name}"
+
+
+class TestServiceManager_iterator(unittest.TestCase):
+
+    SERVICES = {
+        "prod": ["web", "worker", "web-admin"],
+        "test": ["web"],
+    }
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.exceptions.ClusterNotFoundException = type("ClusterNotFoundException", (Exception,), {})
+        self.paginators = {
+            "list_clusters": Mock(**{"paginate.return_value": [
+                {"clusterArns": [f"arn:aws:ecs:us-west-2:123456789012:cluster/{c}" for c in self.SERVICES]}
+            ]}),
+            "list_services": Mock(**{"paginate.side_effect": lambda cluster, **_: [
+                {"serviceArns": [service_arn(cluster, name) for name in self.SERVICES[cluster]]}
+            ]}),
+        }
+        self.client.get_paginator.side_effect = self.paginators.get
+        self.client.describe_services.side_effect = lambda cluster, services, **_: {"services": [
+            {
+                "serviceName": arn.rsplit("/", 1)[1],
+                "serviceArn": arn,
+                "clusterArn": f"arn:aws:ecs:us-west-2:123456789012:cluster/{cluster}",
+                "status": "ACTIVE",
+            }
+            for arn in services
+        ]}
+        self.r = Replacer()
+        self.r.replace("deployfish.core.ssh.get_config", Mock(return_value=Mock(ssh_provider_type="bastion")))
+        self.r.replace("deployfish.core.models.abstract.get_boto3_session", Mock(return_value=Mock(
+            client=Mock(return_value=self.client)
+        )))
+
+    def tearDown(self):
+        self.r.restore()
+
+    def test_literal_cluster_name_is_not_listed(self):
+        services = Service.objects.list(cluster_name="prod")
+        compare([s.pk for s in services], ["prod:web", "prod:worker", "prod:web-admin"])
+        self.paginators["list_clusters"].paginate.assert_not_called()
+
+    def test_service_name_is_filtered_before_describe(self):
+        services = Service.objects.list(cluster_name="*", service_name="web*")
+        compare([s.pk for s in services], ["prod:web", "prod:web-admin", "test:web"])
+        for call in self.client.describe_services.call_args_list:
+            self.assertTrue(all(arn.rsplit("/", 1)[1].startswith("web") for arn in call.kwargs["services"]))
+
+    def test_yields_before_listing_everything(self):
+        services = Service.objects.iterator()
+        compare(next(services).pk, "prod:web")
+        self.paginators["list_services"].paginate.assert_called_once()
+
+    def test_missing_literal_cluster_is_no_match(self):
+        def pages(**_):
+            # botocore raises when we iterate over the pages, not when we paginate()
+            raise self.client.exceptions.ClusterNotFoundException()
+            yield  # pylint: disable=unreachable
+
+        self.paginators["list_services"].paginate.side_effect = pages
+        compare(Service.objects.list(cluster_name="nope"), [])
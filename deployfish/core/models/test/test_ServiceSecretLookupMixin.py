@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import Mock
+
+from testfixtures import Replacer
+
+from deployfish.core.models.secrets import Secret, ServiceSecretLookupMixin, secret_store
+
+
+class FakeTunnel(ServiceSecretLookupMixin):
+
+    def __init__(self):
+        self.cache = {}
+        self._service = Mock()
+        self._service.secrets_prefix = "foobar-cluster.foobar."
+
+    @property
+    def service(self):
+        return self._service
+
+
+def make_secret(name, value):
+    return Secret(
+        {"Name": name, "Value": value, "Type": "String", "ARN": f"arn:aws:ssm:us-west-2:123456789012:parameter/{name}"},
+        name=name.rsplit(".", 1)[1]
+    )
+
+
+class TestServiceSecretLookupMixin(unittest.TestCase):
+
+    def setUp(self):
+        secret_store.clear()
+        self.secrets = [
+            make_secret("foobar-cluster.foobar.DB_HOST", "db.example.com"),
+            make_secret("foobar-cluster.foobar.DB_PORT", "3306"),
+            make_secret("foobar-cluster.foobar.DB_USER", "foobar_u"),
+        ]
+
+    def test_all_lookups_use_one_list_call(self):
+        obj = FakeTunnel()
+        with Replacer() as r:
+            list_mock = r("deployfish.core.models.secrets.SecretManager.list", Mock())
+            get_mock = r("deployfish.core.models.secrets.SecretManager.get_many", Mock())
+            list_mock.return_value = self.secrets
+            self.assertEqual(obj.secret("DB_HOST").value, "db.example.com")
+            self.assertEqual(obj.secret("DB_PORT").value, "3306")
+            self.assertEqual(obj.secret("DB_USER").value, "foobar_u")
+        list_mock.assert_called_once_with("foobar-cluster.foobar.", decrypt=True, client=None)
+        get_mock.assert_not_called()
+
+    def test_missing_secret_under_prefix_raises_without_aws_call(self):
+        obj = FakeTunnel()
+        with Replacer() as r:
+            list_mock = r("deployfish.core.models.secrets.SecretManager.list", Mock())
+            get_mock = r("deployfish.core.models.secrets.SecretManager.get_many", Mock())
+            list_mock.return_value = self.secrets
+            with self.assertRaises(Secret.DoesNotExist):
+                obj.secret("DB_PASSWORD")
+        get_mock.assert_not_called()
+
+    def test_fully_qualified_name_outside_prefix_is_fetched_once(self):
+        obj = FakeTunnel()
+        other = make_secret("shared.mysql.HOST", "shared.example.com")
+        with Replacer() as r:
+            list_mock = r("deployfish.core.models.secrets.SecretManager.list", Mock())
+            get_mock = r("deployfish.core.models.secrets.SecretManager.get_many", Mock())
+            list_mock.return_value = self.secrets
+            get_mock.return_value = [other]
+            self.assertEqual(obj.secret("shared.mysql.HOST").value, "shared.example.com")
+            self.assertEqual(obj.secret("shared.mysql.HOST").value, "shared.example.com")
+        get_mock.assert_called_once_with(["shared.mysql.HOST"], decrypt=True)
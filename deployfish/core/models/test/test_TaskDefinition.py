@@ -0,0 +1,95 @@
+import unittest
+from copy import deepcopy
+from unittest.mock import Mock
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.models.ecs import ContainerDefinition, TaskDefinition
+from deployfish.core.utils.cow import CopyOnWriteDict
+
+
+class TestTaskDefinition_render(unittest.TestCase):
+
+    TASK_DATA = {
+        "family": "foobar-test",
+        "networkMode": "awsvpc",
+        "executionRoleArn": "MY_EXECUTION_ROLE_ARN",
+        "requiresCompatibilities": ["FARGATE"],
+        "volumes": [
+            {"name": "efs", "efsVolumeConfiguration": {"fileSystemId": "fs-12345678"}},
+        ],
+    }
+
+    CONTAINER_DATA = {
+        "name": "foobar",
+        "image": "foobar/foobar:0.1.0",
+        "cpu": 256,
+        "memory": 512,
+        "environment": [
+            {"name": "ZZZ", "value": "last"},
+            {"name": "AAA", "value": "first"},
+        ],
+        "secrets": [
+            {"name": "DB_HOST", "valueFrom": "foobar-cluster.foobar.DB_HOST"},
+        ],
+        "portMappings": [{"containerPort": 8080, "protocol": "tcp"}],
+    }
+
+    def setUp(self):
+        self.task_data = deepcopy(self.TASK_DATA)
+        self.container_data = deepcopy(self.CONTAINER_DATA)
+        self.container = ContainerDefinition(self.container_data)
+        self.td = TaskDefinition(self.task_data, containers=[self.container])
+
+    def assertUnchanged(self):
+        compare(self.task_data, self.TASK_DATA)
+        compare(self.container_data, self.CONTAINER_DATA)
+
+    def test_render_for_diff_does_not_change_data(self):
+        data = self.td.render_for_diff()
+        self.assertUnchanged()
+        self.assertIsInstance(data, CopyOnWriteDict)
+        compare(data["containerDefinitions"][0]["environment"], {"AAA": "first", "ZZZ": "last"})
+        compare(data["containerDefinitions"][0]["secrets"], {"DB_HOST": "foobar-cluster.foobar.DB_HOST"})
+        compare(data["cpu"], "256")
+        compare(data["placementConstraints"], [])
+
+    def test_render_for_display_does_not_change_data(self):
+        with Replacer() as r:
+            r.replace("deployfish.core.models.ecs.EFSFileSystem.objects", Mock(get=Mock(return_value="FS")))
+            data = self.td.render_for_display()
+        self.assertUnchanged()
+        compare(data["volumes"][0]["efsVolumeConfiguration"]["FileSystem"], "FS")
+        compare(data["runtimePlatform"], {"cpuArchitecture": "X86_64", "operatingSystemFamily": "LINUX"})
+
+    def test_render_without_execution_role_drops_secrets(self):
+        del self.task_data["executionRoleArn"]
+        data = self.td.render()
+        self.assertNotIn("secrets", data["containerDefinitions"][0])
+        self.assertIn("secrets", self.container_data)
+        compare([e["name"] for e in data["containerDefinitions"][0]["environment"]], ["AAA", "ZZZ"])
+
+    def test_renders_are_independent(self):
+        first = self.td.render()
+        first["containerDefinitions"][0]["portMappings"][0]["containerPort"] = 9090
+        second = self.td.render()
+        compare(second["containerDefinitions"][0]["portMappings"][0]["containerPort"], 8080)
+        self.assertUnchanged()
+
+    def test_copy(self):
+        new = self.td.copy()
+        self.assertTrue(new == self.td)
+        self.assertIs(type(new.containers[0].data), dict)
+        new.containers[0].data["environment"][0]["value"] = "changed"
+        new.data["volumes"][0]["name"] = "changed"
+        self.assertFalse(new == self.td)
+        self.assertUnchanged()
+
+    def test_add(self):
+        other = TaskDefinition(
+            {"family": "foobar-test", "networkMode": "awsvpc"},
+            containers=[ContainerDefinition({"name": "foobar", "image": "foobar/foobar:0.2.0"})]
+        )
+        new = self.td + other
+        compare(new.containers[0].data["image"], "foobar/foobar:0.2.0")
+        self.assertUnchanged()
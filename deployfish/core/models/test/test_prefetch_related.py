@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import Mock
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.models.abstract import Manager, Model
+from deployfish.core.models.ecs import Service
+from deployfish.core.utils import run_concurrently
+
+
+class GadgetManager(Manager):
+
+    prefetch_dependencies = {"owner": ("parts",)}
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def prefetch_parts(self, objs):
+        self.calls.append(("parts", [obj.pk for obj in objs]))
+        for obj in objs:
+            obj.cache["parts"] = ["part"]
+
+    def prefetch_owner(self, objs):
+        self.calls.append(("owner", [obj.pk for obj in objs]))
+        for obj in objs:
+            assert "parts" in obj.cache
+            obj.cache["owner"] = "owner"
+
+
+class Gadget(Model):
+
+    objects = GadgetManager()
+
+    @property
+    def pk(self) -> str:
+        return self.data["name"]
+
+
+class TestManager_prefetch_related(unittest.TestCase):
+
+    def setUp(self):
+        Gadget.objects.calls = []
+
+    def test_unknown_relation(self):
+        with self.assertRaises(ValueError):
+            Gadget.objects.prefetch_related([Gadget({"name": "a"})], "nope")
+
+    def test_dependencies_first_and_cached_skipped(self):
+        a = Gadget({"name": "a"})
+        b = Gadget({"name": "b"})
+        b.cache["parts"] = ["already"]
+        compare(Gadget.objects.prefetch_related([a, b], "owner"), [a, b])
+        compare(Gadget.objects.calls, [("parts", ["a"]), ("owner", ["a", "b"])])
+        compare(b.cache["parts"], ["already"])
+
+    def test_client_is_created_once_per_session(self):
+        manager = GadgetManager()
+        manager.service = "ecs"
+        sessions = [Mock(), Mock()]
+        with Replacer() as r:
+            get_session = Mock(return_value=sessions[0])
+            r.replace("deployfish.core.models.abstract.get_boto3_session", get_session)
+            clients = run_concurrently(lambda: manager.client, [()] * 20)
+            self.assertTrue(all(client is clients[0] for client in clients))
+            sessions[0].client.assert_called_once_with("ecs")
+            get_session.return_value = sessions[1]
+            self.assertIs(manager.client, sessions[1].client.return_value)
+
+
+class TestServiceManager_prefetch_related(unittest.TestCase):
+
+    def setUp(self):
+        self.r = Replacer()
+        self.r.replace("deployfish.core.ssh.get_config", Mock(return_value=Mock(ssh_provider_type="bastion")))
+        self.services = [
+            Service({"serviceName": name, "cluster": cluster, "taskDefinition": f"{name}:1", "loadBalancers": []})
+            for name, cluster in (("web", "prod"), ("worker", "prod"), ("web2", "test"))
+        ]
+
+    def tearDown(self):
+        self.r.restore()
+
+    def test_cluster(self):
+        clusters = [Mock(), Mock()]
+        for cluster, name in zip(clusters, ("prod", "test")):
+            cluster.name = name
+        objects = Mock(get_many=Mock(return_value=clusters))
+        self.r.replace("deployfish.core.models.ecs.Cluster.objects", objects)
+        Service.objects.prefetch_related(self.services, "cluster")
+        objects.get_many.assert_called_once_with(["prod", "test"])
+        self.assertIs(self.services[1].cluster, clusters[0])
+        self.assertIs(self.services[2].cluster, clusters[1])
+        objects.get.assert_not_called()
+
+    def test_task_definition_and_helper_tasks(self):
+        task_definitions = {
+            "web:1": Mock(tags={"deployfish:command:migrate": "web-migrate:1"}),
+            "worker:1": Mock(tags={}),
+            "web2:1": Mock(tags={"deployfish:command:migrate": "web-migrate:1", "Name": "web2"}),
+        }
+        td_objects = Mock(get=Mock(side_effect=task_definitions.get))
+        self.r.replace("deployfish.core.models.ecs.TaskDefinition.objects", td_objects)
+        task_objects = Mock(get=Mock(return_value="MIGRATE"))
+        self.r.replace("deployfish.core.models.ecs.ServiceHelperTask.objects", task_objects)
+        Service.objects.prefetch_related(self.services, "helper_tasks")
+        compare(td_objects.get.call_count, 3)
+        task_objects.get.assert_called_once_with("web-migrate:1")
+        compare([s.helper_tasks for s in self.services], [["MIGRATE"], [], ["MIGRATE"]])
+        self.assertIs(self.services[0].task_definition, task_definitions["web:1"])
+
+    def test_appscaling(self):
+        target = Mock(pk="service/prod/web")
+        objects = Mock(get_many=Mock(return_value=[target]))
+        self.r.replace("deployfish.core.models.ecs.ScalableTarget.objects", objects)
+        Service.objects.prefetch_related(self.services, "appscaling")
+        objects.get_many.assert_called_once_with(["service/prod/web", "service/prod/worker", "service/test/web2"])
+        compare([s.appscaling for s in self.services], [target, None, None])
@@ -295,6 +295,8 @@ class BastionSSHProvider(AbstractSSHProvider):
 
 class SSHMixin(SupportsCache, SupportsModel):
 
+    __slots__ = ()
+
     providers: dict[str, type[AbstractSSHProvider]] = {
         "ssm": SSMSSHProvider,
         "bastion": BastionSSHProvider
@@ -523,6 +525,8 @@ class SSHMixin(SupportsCache, SupportsModel):
 
 class DockerMixin(SSHMixin, SupportsService):
 
+    __slots__ = ()
+
     class NoRunningTasks(Exception):
         pass
 
@@ -1,6 +1,14 @@
 import re
 from typing import Optional
 
+from .concurrency import (  # noqa: F401
+    MAX_WORKERS,
+    AdaptiveRateLimiter,
+    is_throttling_error,
+    run_concurrently,
+)
+from .config_files import clear_config_file_cache, file_digest, load_config_file  # noqa: F401
+
 
 def is_fnmatch_filter(f: str | None) -> bool:
     """
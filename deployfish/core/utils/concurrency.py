@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+#: The default number of worker threads to use when we fan out AWS API calls.
+#: boto3 clients are thread safe, so callers should create their client once
+#: and share it across the workers.
+MAX_WORKERS: int = 8
+
+
+def run_concurrently(
+    func: Callable[..., Any],
+    args_list: Iterable[tuple[Any, ...]],
+    max_workers: int = MAX_WORKERS
+) -> list[Any]:
+    """
+    Call ``func(*args)`` for each ``args`` in ``args_list`` in a thread pool,
+    and return the results in the same order as ``args_list``.
+
+    If any of the calls raises an exception, that exception is re-raised here.
+
+    Args:
+        func: the callable to run
+        args_list: an iterable of positional argument tuples for ``func``
+
+    Keyword Args:
+        max_workers: the maximum number of threads to use
+
+    Returns:
+        A list of the return values of ``func``, one per item in ``args_list``.
+
+    """
+    args_list = list(args_list)
+    if len(args_list) <= 1 or max_workers <= 1:
+        # Don't bother with threads if there's nothing to parallelize
+        return [func(*args) for args in args_list]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(args_list))) as executor:
+        return list(executor.map(lambda args: func(*args), args_list))
+
+
+#: The AWS error codes that mean "slow down"
+THROTTLING_ERROR_CODES: set[str] = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "TooManyUpdates",
+}
+
+
+def is_throttling_error(exc: Exception) -> bool:
+    """
+    Return ``True`` if ``exc`` is a boto3 ``ClientError`` that AWS raised
+    because we're calling it too fast.
+
+    Args:
+        exc: the exception to examine
+
+    Returns:
+        ``True`` if this was a throttling error, ``False`` otherwise.
+
+    """
+    response = getattr(exc, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class AdaptiveRateLimiter:
+    """
+    A thread safe rate limiter for AWS API calls that adapts to throttling.
+
+    Calls made through :py:meth:`call` are spaced out so that we make at most
+    ``rate`` calls per second across all threads.  Every successful call
+    nudges the rate up by ``increase``; every throttling error halves it, and
+    the call is retried after an exponential backoff.  This lets us run many
+    calls concurrently against APIs with low TPS limits (like SSM's
+    ``put_parameter``) without giving up on the first ``ThrottlingException``.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        min_rate: float = 1.0,
+        max_rate: float = 50.0,
+        increase: float = 0.5,
+        max_attempts: int = 8,
+        base_delay: float = 0.25
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        #: How many throttling errors we've seen
+        self.throttled: int = 0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self) -> None:
+        """
+        Block until we're allowed to make our next call.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + 1.0 / self.rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call ``func(*args, **kwargs)`` within our rate limit, retrying it if
+        AWS throttles us.
+
+        Raises:
+            Exception: whatever ``func`` raised, if it was not a throttling
+                error or if we ran out of attempts
+
+        Returns:
+            The return value of ``func``.
+
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_throttling_error(e):
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.throttled += 1
+                    self.rate = max(self.min_rate, self.rate / 2)
+                if attempt >= self.max_attempts:
+                    raise
+                time.sleep(self.base_delay * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0))  # noqa: S311
+            else:
+                with self._lock:
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+                return result
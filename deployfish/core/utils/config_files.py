@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any
+
+import yaml
+
+#: Use the libyaml backed loader if PyYAML was built with it; it is an order of
+#: magnitude faster than the pure Python loader on big ``deployfish.yml`` files.
+#: Either way it is a ``FullLoader``, as we have always used, so we accept the
+#: same YAML (e.g. ``!!python/tuple``) as before.
+YAML_LOADER: type = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+#: Bump this whenever the format of our on-disk cache files changes
+CONFIG_CACHE_VERSION: int = 2
+
+_parsed: dict[str, tuple[tuple[int, int], Any]] = {}
+_lock = threading.Lock()
+
+
+def config_cache_dir() -> str | None:
+    """
+    Return the directory in which we cache parsed ``deployfish.yml`` files, or
+    ``None`` if the on-disk cache is disabled.
+
+    The cache lives in ``$DEPLOYFISH_CONFIG_CACHE_DIR`` if that is set, else in
+    ``$XDG_CACHE_HOME/deployfish`` (``~/.cache/deployfish``).  Set
+    ``DEPLOYFISH_CONFIG_CACHE=false`` to disable it.
+
+    Returns:
+        The path to the cache directory, or ``None``.
+
+    """
+    if os.environ.get("DEPLOYFISH_CONFIG_CACHE", "true").lower() == "false":
+        return None
+    if os.environ.get("DEPLOYFISH_CONFIG_CACHE_DIR"):
+        return os.environ["DEPLOYFISH_CONFIG_CACHE_DIR"]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "deployfish")
+
+
+def _cache_path(cache_dir: str, path: str) -> str:
+    return os.path.join(cache_dir, hashlib.sha256(path.encode("utf-8")).hexdigest() + ".json")
+
+
+def _read_cache(cache_dir: str, path: str, stat: os.stat_result, digest: str) -> tuple[bool, Any]:
+    try:
+        with open(_cache_path(cache_dir, path), encoding="utf-8") as f:
+            entry = json.load(f)
+    except Exception:  # noqa: BLE001
+        # Missing, unreadable or corrupt; either way, we'll just parse the file
+        return False, None
+    key = [CONFIG_CACHE_VERSION, path, stat.st_mtime_ns, stat.st_size, digest]
+    if not isinstance(entry, dict) or entry.get("key") != key:
+        return False, None
+    return True, entry["data"]
+
+
+def _write_cache(cache_dir: str, path: str, stat: os.stat_result, digest: str, data: Any) -> None:
+    entry = {
+        "key": [CONFIG_CACHE_VERSION, path, stat.st_mtime_ns, stat.st_size, digest],
+        "data": data,
+    }
+    try:
+        contents = json.dumps(entry, separators=(",", ":"))
+        if json.loads(contents)["data"] != data:
+            # YAML gave us something JSON can't represent exactly, like dates
+            # or non-string keys; don't cache what we can't read back as is
+            return
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(contents)
+            os.replace(tmp, _cache_path(cache_dir, path))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception:  # noqa: BLE001,S110
+        # The cache is just an optimization; never fail a command over it
+        pass
+
+
+def load_config_file(filename: str) -> Any:
+    """
+    Parse the YAML file ``filename`` and return its contents.
+
+    Each file is parsed at most once per process: later calls return the same
+    object for as long as the file's mtime and size are unchanged, so callers
+    must treat the returned data as read-only.  Parsed files are also cached on
+    disk (see :py:func:`config_cache_dir`), keyed by path, mtime, size and the
+    SHA-256 of the file's contents, so unchanged files need not be re-parsed by
+    the next ``deploy`` invocation either.
+
+    Args:
+        filename: the path to the YAML file
+
+    Raises:
+        OSError: we could not read the file
+        yaml.YAMLError: the file is not valid YAML
+
+    Returns:
+        The parsed YAML.
+
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    with _lock:
+        if path in _parsed and _parsed[path][0] == (stat.st_mtime_ns, stat.st_size):
+            return _parsed[path][1]
+    with open(path, "rb") as f:
+        contents = f.read()
+    cache_dir = config_cache_dir()
+    found = False
+    data = None
+    if cache_dir:
+        digest = hashlib.sha256(contents).hexdigest()
+        found, data = _read_cache(cache_dir, path, stat, digest)
+    if not found:
+        data = yaml.load(contents.decode("utf-8"), Loader=YAML_LOADER)  # noqa: S506
+        if cache_dir:
+            _write_cache(cache_dir, path, stat, digest, data)
+    with _lock:
+        _parsed[path] = ((stat.st_mtime_ns, stat.st_size), data)
+    return data
+
+
+def file_digest(filename: str) -> str | None:
+    """
+    Return the SHA-256 hex digest of the contents of ``filename``.
+
+    Args:
+        filename: the path to the file
+
+    Returns:
+        The digest, or ``None`` if the file can't be read.
+
+    """
+    try:
+        with open(filename, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def clear_config_file_cache() -> None:
+    """
+    Forget all the files :py:func:`load_config_file` has parsed in this process.
+    The on-disk cache is left alone.
+    """
+    with _lock:
+        _parsed.clear()
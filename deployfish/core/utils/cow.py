@@ -0,0 +1,215 @@
+from collections.abc import ItemsView, Iterator, ValuesView
+from copy import deepcopy
+from typing import Any
+
+
+def cow(value: Any) -> Any:
+    """
+    Return a copy-on-write view of ``value`` if it is a ``dict`` or a
+    ``list``, else return ``value`` itself.
+
+    Making the view costs a shallow copy of the top level of ``value``; nested
+    ``dict`` and ``list`` values are shared with ``value`` until you reach
+    into them through the view, at which point just the containers on that
+    path are (shallowly) copied.  So you can add, change and delete things at
+    any depth of the view without ever changing ``value``, while the parts you
+    only read are never copied at all.
+
+    Args:
+        value: the value to wrap
+
+    Returns:
+        A :py:class:`CopyOnWriteDict`, a :py:class:`CopyOnWriteList` or ``value``.
+
+    """
+    if isinstance(value, dict):
+        return CopyOnWriteDict(value)
+    if isinstance(value, list):
+        return CopyOnWriteList(value)
+    return value
+
+
+class CopyOnWriteDict(dict):
+    """
+    A ``dict`` that shares its nested ``dict`` and ``list`` values with the
+    ``dict`` it was made from until someone reaches into them.  See
+    :py:func:`cow`.
+
+    Anything that goes through the ``dict`` API (``d[k]``, ``d.get(k)``,
+    ``d.items()``, ``d.values()``, ``d.pop(k)``, ``d.setdefault(k)``) gets a
+    private copy-on-write view of a nested container, so mutating it is safe.
+    Read-only consumers that go straight to the C level (``==``, ``json.dumps``,
+    ``**kwargs`` unpacking) see the shared values and copy nothing.
+
+    :py:func:`copy.deepcopy` of one of these returns plain ``dict`` and ``list``
+    objects.
+    """
+
+    __slots__ = ("_owned",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        #: The nested values that are ours to mutate, keyed by ``id()``: ones
+        #: we've already copied, and ones that were put here through us.  We
+        #: hold on to them so that their ``id()`` can't be reused by some other,
+        #: shared, value while they're in here.
+        self._owned: dict[int, Any] = {}
+
+    def _own(self, key: Any, value: Any) -> Any:
+        if self._owned.get(id(value)) is value or not isinstance(value, (dict, list)):
+            return value
+        value = cow(value)
+        dict.__setitem__(self, key, value)
+        self._owned[id(value)] = value
+        return value
+
+    def _forget(self, key: Any) -> None:
+        if key in self:
+            self._owned.pop(id(dict.__getitem__(self, key)), None)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._own(key, dict.__getitem__(self, key))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._forget(key)
+        dict.__setitem__(self, key, value)
+        self._owned[id(value)] = value
+
+    def __delitem__(self, key: Any) -> None:
+        self._forget(key)
+        dict.__delitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> tuple[Any, Any]:
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def items(self) -> ItemsView[Any, Any]:  # type: ignore[override]
+        # The abc views look values up with self[key], so they hand out
+        # copy-on-write views of nested containers like __getitem__ does
+        return ItemsView(self)
+
+    def values(self) -> ValuesView[Any]:  # type: ignore[override]
+        return ValuesView(self)
+
+    def copy(self) -> "CopyOnWriteDict":
+        return CopyOnWriteDict(self)
+
+    def __copy__(self) -> "CopyOnWriteDict":
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        result: dict[Any, Any] = {}
+        memo[id(self)] = result
+        for key, value in dict.items(self):
+            result[deepcopy(key, memo)] = deepcopy(value, memo)
+        return result
+
+    def __reduce__(self):
+        return (dict, (deepcopy(self),))
+
+
+class CopyOnWriteList(list):
+    """
+    The ``list`` counterpart of :py:class:`CopyOnWriteDict`: indexing,
+    iterating and popping give you private copy-on-write views of nested
+    containers.  See :py:func:`cow`.
+    """
+
+    __slots__ = ("_owned",)
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        #: As for :py:attr:`CopyOnWriteDict._owned`
+        self._owned: dict[int, Any] = {}
+
+    def _own(self, index: int, value: Any) -> Any:
+        if self._owned.get(id(value)) is value or not isinstance(value, (dict, list)):
+            return value
+        value = cow(value)
+        list.__setitem__(self, index, value)
+        self._owned[id(value)] = value
+        return value
+
+    def _mark(self, values) -> None:
+        self._owned.update((id(v), v) for v in values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CopyOnWriteList(list.__getitem__(self, index))
+        return self._own(index, list.__getitem__(self, index))
+
+    def __setitem__(self, index, value) -> None:
+        list.__setitem__(self, index, value)
+        if isinstance(index, slice):
+            self._mark(list.__getitem__(self, index))
+        else:
+            self._mark([value])
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self) -> Iterator[Any]:
+        for i in range(len(self) - 1, -1, -1):
+            yield self[i]
+
+    def __add__(self, other: list[Any]) -> "CopyOnWriteList":  # type: ignore[override]
+        return CopyOnWriteList(list.__add__(self, other))
+
+    def append(self, value: Any) -> None:
+        list.append(self, value)
+        self._mark([value])
+
+    def extend(self, values) -> None:
+        values = list(values)
+        list.extend(self, values)
+        self._mark(values)
+
+    def __iadd__(self, values) -> "CopyOnWriteList":  # type: ignore[override]
+        self.extend(values)
+        return self
+
+    def insert(self, index, value: Any) -> None:
+        list.insert(self, index, value)
+        self._mark([value])
+
+    def pop(self, index: int = -1) -> Any:
+        value = self[index]
+        list.pop(self, index)
+        return value
+
+    def copy(self) -> "CopyOnWriteList":
+        return CopyOnWriteList(self)
+
+    def __copy__(self) -> "CopyOnWriteList":
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        result: list[Any] = []
+        memo[id(self)] = result
+        result.extend(deepcopy(value, memo) for value in list.__iter__(self))
+        return result
+
+    def __reduce__(self):
+        return (list, (deepcopy(self),))
@@ -0,0 +1,276 @@
+import json
+from typing import Any
+
+#: Stands in for "no such key" in dict lookups
+_MISSING = object()
+
+#: What jsondiff's ``$``-symbols look like once marshaled
+INSERT = "$insert"
+UPDATE = "$update"
+DELETE = "$delete"
+
+
+def _escape(value: Any) -> Any:
+    # jsondiff escapes strings that start with "$" so they can't be mistaken for
+    # its symbols
+    if isinstance(value, str) and value.startswith("$"):
+        return "$" + value
+    return value
+
+
+def _key(key: Any) -> str:
+    # What json.dumps() would do to a dict key
+    key = _escape(key)
+    if isinstance(key, str):
+        return key
+    return json.dumps(key)
+
+
+def marshal(value: Any) -> Any:
+    """
+    Convert ``value`` into what it would look like after a round trip through
+    jsondiff's marshaling and ``json.dumps``/``json.loads``: plain ``dict`` and
+    ``list`` objects, string keys, and strings that start with ``$`` escaped
+    as ``$$``.
+
+    Args:
+        value: the value to convert
+
+    Returns:
+        The converted value.
+
+    """
+    if isinstance(value, dict):
+        return {_key(k): marshal(v) for k, v in dict.items(value)}
+    if isinstance(value, list):
+        return [marshal(v) for v in list.__iter__(value)]
+    if isinstance(value, tuple):
+        return [marshal(v) for v in value]
+    return _escape(value)
+
+
+class StructuralDiffer:
+    """
+    Compute the difference between two JSON-like structures, returning
+    exactly what ``json.loads(jsondiff.diff(a, b, syntax="explicit",
+    dump=True))`` returns, which is what our ``plan`` templates and
+    :py:meth:`deployfish.core.models.abstract.Model.diff` callers expect.
+
+    We use the same algorithm as ``jsondiff`` (including its similarity scores
+    and LCS list alignment), so the output is the same, but:
+
+    * identical subtrees (most of any real diff) are skipped without walking
+      them: values under the same key are checked with ``==`` first, which
+      runs at C speed, and the elements of lists being aligned get a subtree
+      hash computed once each, so each of the ``len(a) * len(b)`` element
+      comparisons the alignment makes costs a hash comparison, and elements
+      with different hashes are known to differ without looking inside them
+    * we remember the diff of each pair of list elements, so the LCS
+      backtrack doesn't diff them all over again
+    * we build the marshaled output directly, instead of dumping the diff to
+      JSON and loading it again
+
+    Use a new instance for each diff; the hashes are keyed by ``id()``.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[int, tuple[Any, int | None]] = {}
+
+    # ------------------------
+    # Subtree hashes
+    # ------------------------
+
+    def subtree_hash(self, obj: Any) -> int | None:
+        """
+        Return a hash of ``obj`` that is equal for any two objects that
+        compare equal, or ``None`` if ``obj`` contains something unhashable.
+
+        Args:
+            obj: the value to hash
+
+        Returns:
+            The hash, or ``None``.
+
+        """
+        if isinstance(obj, (dict, list, tuple)):
+            cached = self._hashes.get(id(obj))
+            if cached is not None:
+                return cached[1]
+            h: int | None
+            if isinstance(obj, dict):
+                pairs = []
+                for k, v in dict.items(obj):
+                    hv = self.subtree_hash(v)
+                    if hv is None:
+                        pairs = None
+                        break
+                    pairs.append((k, hv))
+                h = None if pairs is None else hash(("dict", frozenset(pairs)))
+            else:
+                hashes = []
+                for v in (list.__iter__(obj) if isinstance(obj, list) else obj):
+                    hv = self.subtree_hash(v)
+                    if hv is None:
+                        hashes = None
+                        break
+                    hashes.append(hv)
+                h = None if hashes is None else hash(("seq", tuple(hashes)))
+            # Hold on to obj so its id() can't be reused while we're alive
+            self._hashes[id(obj)] = (obj, h)
+            return h
+        try:
+            return hash(obj)
+        except TypeError:
+            return None
+
+    # ------------------------
+    # Diffing
+    # ------------------------
+
+    def _list_diff(self, a: Any, b: Any) -> tuple[Any, float]:
+        X = list(list.__iter__(a)) if isinstance(a, list) else list(a)  # noqa: N806
+        Y = list(list.__iter__(b)) if isinstance(b, list) else list(b)  # noqa: N806
+        m = len(X)
+        n = len(Y)
+        hx = [self.subtree_hash(x) for x in X]
+        hy = [self.subtree_hash(y) for y in Y]
+        memo: dict[tuple[int, int], tuple[Any, float]] = {}
+
+        def pair(i: int, j: int) -> tuple[Any, float]:
+            if (i, j) not in memo:
+                if hx[i] is None or hy[j] is None:
+                    memo[(i, j)] = self._obj_diff(X[i], Y[j])
+                elif hx[i] == hy[j] and X[i] == Y[j]:
+                    memo[(i, j)] = ({}, 1.0)
+                else:
+                    memo[(i, j)] = self._changed_diff(X[i], Y[j])
+            return memo[(i, j)]
+
+        # LCS, weighted by similarity
+        C = [[0.0] * (n + 1) for _ in range(m + 1)]  # noqa: N806
+        for i in range(1, m + 1):
+            for j in range(1, n + 1):
+                _, s = pair(i - 1, j - 1)
+                C[i][j] = max(C[i][j - 1], C[i - 1][j], C[i - 1][j - 1] + s)
+        # Backtrack
+        steps = []
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i > 0 and j > 0:
+                d, s = pair(i - 1, j - 1)
+                if s > 0 and C[i][j] == C[i - 1][j - 1] + s:
+                    steps.append((0, d, j - 1, s))
+                    i, j = i - 1, j - 1
+                    continue
+            if j > 0 and (i == 0 or C[i][j - 1] >= C[i - 1][j]):
+                steps.append((1, Y[j - 1], j - 1, 0.0))
+                j -= 1
+                continue
+            steps.append((-1, X[i - 1], i - 1, 0.0))
+            i -= 1
+        inserted = []
+        deleted = []
+        changed = {}
+        tot_s = 0.0
+        for sign, value, pos, s in reversed(steps):
+            if sign == 1:
+                inserted.append([pos, marshal(value)])
+            elif sign == -1:
+                deleted.insert(0, pos)
+            elif sign == 0 and s < 1:
+                changed[str(pos)] = value
+            tot_s += s
+        tot_n = len(X) + len(inserted)
+        s = 1.0 if tot_n == 0 else tot_s / tot_n
+        if s == 0.0:
+            return marshal(b), s
+        if s == 1.0:
+            return {}, s
+        result = changed
+        if inserted:
+            result[INSERT] = inserted
+        if deleted:
+            result[DELETE] = deleted
+        return result, s
+
+    def _dict_diff(self, a: dict[Any, Any], b: dict[Any, Any]) -> tuple[Any, float]:
+        removed = []
+        added = {}
+        changed = {}
+        nmatched = 0
+        smatched = 0.0
+        for k, v in dict.items(a):
+            w = dict.get(b, k, _MISSING)
+            if w is _MISSING:
+                removed.append(_escape(k))
+            else:
+                nmatched += 1
+                d, s = self._obj_diff(v, w)
+                if s < 1.0:
+                    changed[_key(k)] = d
+                smatched += 0.5 + 0.5 * s
+        for k, v in dict.items(b):
+            if k not in a:
+                added[_key(k)] = marshal(v)
+        n_tot = len(removed) + nmatched + len(added)
+        s = smatched / n_tot if n_tot != 0 else 1.0
+        if s == 0.0:
+            return marshal(b), s
+        if s == 1.0:
+            return {}, s
+        result: dict[str, Any] = {}
+        if added:
+            result[INSERT] = added
+        if changed:
+            result[UPDATE] = changed
+        if removed:
+            result[DELETE] = removed
+        return result, s
+
+    def _changed_diff(self, a: Any, b: Any) -> tuple[Any, float]:
+        # a and b are known to differ
+        if isinstance(a, dict) and isinstance(b, dict):
+            return self._dict_diff(a, b)
+        if (isinstance(a, tuple) and isinstance(b, tuple)) or (isinstance(a, list) and isinstance(b, list)):
+            return self._list_diff(a, b)
+        return marshal(b), 0.0
+
+    def _obj_diff(self, a: Any, b: Any) -> tuple[Any, float]:
+        # For values at the same key we can't do better than ==, which bails out
+        # at the first difference and runs at C speed when there is none
+        if a is b or a == b:
+            return {}, 1.0
+        return self._changed_diff(a, b)
+
+    def diff(self, a: Any, b: Any) -> Any:
+        """
+        Return the changes needed to turn ``a`` into ``b``, in jsondiff's
+        marshaled "explicit" syntax.
+
+        Args:
+            a: the old structure
+            b: the new structure
+
+        Returns:
+            The diff: ``{}`` if there are no differences.
+
+        """
+        d, _ = self._obj_diff(a, b)
+        return d
+
+
+def diff(a: Any, b: Any) -> Any:
+    """
+    Return the changes needed to turn ``a`` into ``b``.  This is a faster
+    drop-in replacement for ``json.loads(jsondiff.diff(a, b,
+    syntax="explicit", dump=True))``; see :py:class:`StructuralDiffer`.
+
+    Args:
+        a: the old structure
+        b: the new structure
+
+    Returns:
+        The diff: ``{}`` if there are no differences.
+
+    """
+    return StructuralDiffer().diff(a, b)
@@ -0,0 +1,215 @@
+import codecs
+import json
+import re
+from collections.abc import Iterator
+from typing import IO, Any
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONStreamReader:
+    """
+    Walk a JSON document in a binary file-like object (an open file, a boto3
+    ``StreamingBody``, a ``requests`` raw response) without loading the whole
+    thing into memory, materializing only the values you ask for.
+
+    Values you :py:meth:`skip` are still parsed, in bounded size pieces with
+    the C JSON decoder, but are thrown away as we go, so the memory we use is
+    proportional to the largest value you :py:meth:`read` plus ``chunk_size``,
+    not to the size of the document.
+
+    Example:
+        To get just ``doc["outputs"]`` out of a huge document::
+
+            reader = JSONStreamReader(f)
+            for key in reader.iter_object():
+                if key == "outputs":
+                    outputs = reader.read()
+                else:
+                    reader.skip()
+
+    Every key yielded by :py:meth:`iter_object` and every element position
+    yielded by :py:meth:`iter_array` must be consumed with either
+    :py:meth:`read`, :py:meth:`skip`, or a nested ``iter_*`` before asking for
+    the next one.
+
+    Args:
+        stream: a binary file-like object with a ``read(size)`` method
+
+    Keyword Args:
+        chunk_size: how many bytes to read from ``stream`` at a time
+
+    """
+
+    def __init__(self, stream: IO[bytes], chunk_size: int = 1 << 16) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+
+    # ------------------------
+    # Buffer management
+    # ------------------------
+
+    def _fill(self, size: int | None = None) -> bool:
+        """
+        Read another ``size`` bytes (default :py:attr:`chunk_size`) from our
+        stream into our buffer.
+
+        Returns:
+            ``False`` if we were already at the end of the stream.
+
+        """
+        if self._eof:
+            return False
+        if self._pos > len(self._buffer) // 2:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        data = self.stream.read(size or self.chunk_size)
+        if not data:
+            self._eof = True
+            self._buffer += self._utf8.decode(b"", final=True)
+            return False
+        self._buffer += self._utf8.decode(data)
+        return True
+
+    def _peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Raises:
+            ValueError: we hit the end of the stream
+
+        Returns:
+            The next non-whitespace character.
+
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def _expect(self, chars: str) -> str:
+        c = self._peek()
+        if c not in chars:
+            raise ValueError(f"Expected one of {chars!r} at character {self._pos}, got {c!r}")
+        self._pos += 1
+        return c
+
+    def _decode(self) -> tuple[Any, bool]:
+        """
+        Try to decode the value at our position from what's in our buffer.
+
+        Returns:
+            A tuple of ``(value, True)`` on success, in which case we advance past
+            the value, or ``(None, False)`` if we need more of the stream first.
+
+        """
+        try:
+            value, end = self.decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return None, False
+        if end == len(self._buffer) and not self._eof:
+            # A number or literal could continue past the end of our buffer
+            return None, False
+        self._pos = end
+        return value, True
+
+    # ------------------------
+    # Public API
+    # ------------------------
+
+    def read(self) -> Any:
+        """
+        Materialize and return the next value in the document.
+
+        Returns:
+            The decoded value.
+
+        """
+        self._peek()
+        size = self.chunk_size
+        while True:
+            value, ok = self._decode()
+            if ok:
+                return value
+            self._fill(size)
+            size *= 2
+
+    def skip(self) -> None:
+        """
+        Consume the next value in the document without materializing it.
+        """
+        c = self._peek()
+        # Small values: let the C decoder handle them in one go
+        if len(self._buffer) - self._pos < self.chunk_size:
+            self._fill()
+        _, ok = self._decode()
+        if ok:
+            return
+        if c == "{":
+            for _ in self.iter_object():
+                self.skip()
+        elif c == "[":
+            for _ in self.iter_array():
+                self.skip()
+        else:
+            # A scalar bigger than our buffer; just read it
+            self.read()
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Iterate through the next value in the document, which must be an
+        object, yielding each key.  The caller must consume the value for each
+        key before asking for the next one.
+
+        Raises:
+            ValueError: the next value is not an object
+
+        Yields:
+            Each key in the object.
+
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise ValueError(f"Expected an object key at character {self._pos}")
+            key = self.read()
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Iterate through the next value in the document, which must be an
+        array, yielding the index of each element.  The caller must consume
+        each element before asking for the next one.
+
+        Raises:
+            ValueError: the next value is not an array
+
+        Yields:
+            The index of each element in the array.
+
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        i = 0
+        while True:
+            yield i
+            i += 1
+            if self._expect(",]") == "]":
+                return
@@ -0,0 +1,114 @@
+"""
+Benchmark parsing a large ``deployfish.yml`` with
+:py:func:`deployfish.core.utils.load_config_file` against the old way of
+parsing it with ``yaml.FullLoader`` on every call.
+
+Run it like so::
+
+    python -m deployfish.core.utils.test.bench_config_files
+
+We generate a synthetic config of about ``--lines`` lines, and time:
+
+* ``FullLoader x2``: ``Config.load_config`` and
+  ``AWSSessionBuilder.load_config`` each parsing the file with ``yaml.FullLoader``,
+  as they used to
+* ``cold``: :py:func:`load_config_file` with empty in-memory and on-disk caches
+* ``disk``: a new process, with a warm on-disk cache
+* ``memory``: a second call in the same process
+"""
+import os
+import tempfile
+
+import yaml
+
+from deployfish.core.utils import clear_config_file_cache, load_config_file
+from deployfish.core.utils.config_files import YAML_LOADER
+
+from .benchmark import best_of, make_parser
+
+SERVICE = """\
+  - name: service-{i:04d}
+    cluster: cluster-{i:04d}
+    environment: env-{i:04d}
+    service_role_arn: arn:aws:iam::123456789012:role/ecsServiceRole
+    count: 2
+    family: service-{i:04d}
+    network_mode: awsvpc
+    task_role_arn: ${{terraform.task_role_arn_{i:04d}}}
+    execution_role: ${{terraform.execution_role_arn}}
+    vpc_configuration:
+      subnets:
+        - subnet-12345678
+        - subnet-87654321
+      security_groups:
+        - sg-12345678
+    containers:
+      - name: app
+        image: 123456789012.dkr.ecr.us-west-2.amazonaws.com/service-{i:04d}:1.0.{i}
+        cpu: 256
+        memory: 512
+        ports:
+          - "80"
+        environment:
+          - DEBUG=False
+          - SERVICE_NAME=service-{i:04d}
+        logging:
+          driver: awslogs
+          options:
+            awslogs-group: /service-{i:04d}
+            awslogs-region: us-west-2
+    config:
+      - DB_HOST=${{terraform.db_host_{i:04d}}}
+      - DB_PASSWORD:secure:arn:aws:kms:us-west-2:123456789012:key/abcd=${{env.DB_PASSWORD}}
+"""
+
+
+def make_config(lines: int) -> str:
+    per_service = SERVICE.count("\n")
+    parts = ["terraform:\n  statefile: s3://my-bucket/terraform.tfstate\n", "services:\n"]
+    for i in range(max(lines // per_service, 1)):
+        parts.append(SERVICE.format(i=i))
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = make_parser(__doc__, repeat=3)
+    parser.add_argument("--lines", type=int, default=5000, help="Approximate number of lines in the config")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "deployfish.yml")
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(make_config(args.lines))
+        os.environ["DEPLOYFISH_CONFIG_CACHE_DIR"] = os.path.join(tmpdir, "cache")
+        os.environ["DEPLOYFISH_CONFIG_CACHE"] = "true"
+
+        def full_loader():
+            with open(filename, encoding="utf-8") as f:
+                yaml.load(f, Loader=yaml.FullLoader)  # noqa: S506
+
+        def cold():
+            clear_config_file_cache()
+            for name in os.listdir(os.environ["DEPLOYFISH_CONFIG_CACHE_DIR"]):
+                os.unlink(os.path.join(os.environ["DEPLOYFISH_CONFIG_CACHE_DIR"], name))
+            load_config_file(filename)
+
+        def disk():
+            clear_config_file_cache()
+            load_config_file(filename)
+
+        load_config_file(filename)
+        with open(filename, encoding="utf-8") as f:
+            n_lines = sum(1 for _ in f)
+        print(f"{n_lines} lines, loader: {YAML_LOADER.__name__}")
+        results = {
+            "FullLoader x2": 2 * best_of(full_loader, args.repeat),
+            "cold": best_of(cold, args.repeat),
+            "disk": best_of(disk, args.repeat),
+            "memory": best_of(lambda: load_config_file(filename), args.repeat),
+        }
+        for label, elapsed in results.items():
+            print(f"{label:>14}: {elapsed:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+The timing harness shared by the ``bench_*.py`` benchmark scripts.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+
+def make_parser(description: str | None, repeat: int | None = None) -> argparse.ArgumentParser:
+    """
+    Return an argument parser for a benchmark script, which shows the script's
+    docstring as its help.
+
+    Args:
+        description: the benchmark's module docstring
+
+    Keyword Args:
+        repeat: if given, add a ``--repeat`` option with this as its default,
+            for passing to :py:func:`best_of`
+
+    Returns:
+        The parser, for the benchmark to add its own options to.
+
+    """
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    if repeat is not None:
+        parser.add_argument("--repeat", type=int, default=repeat, help="Take the best of this many runs")
+    return parser
+
+
+def best_of(
+    func: Callable[..., Any],
+    repeat: int = 1,
+    setup: Callable[[], tuple[Any, ...]] | None = None
+) -> float:
+    """
+    Time ``repeat`` calls of ``func`` and return the fastest one.
+
+    Args:
+        func: the code to time
+
+    Keyword Args:
+        repeat: how many times to call ``func``
+        setup: if given, call this before each call of ``func``, untimed, and
+            pass what it returns to ``func`` as positional arguments
+
+    Returns:
+        The fastest call, in milliseconds.
+
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def traced_memory(func: Callable[[], Any]) -> tuple[int, Any]:
+    """
+    Call ``func`` and measure the memory still allocated by it when it returns.
+
+    Args:
+        func: the code to measure
+
+    Returns:
+        A ``(bytes, result)`` tuple, where ``result`` is what ``func`` returned.
+        Keep ``result`` alive until you're done with it, or it may be freed
+        before we measure it.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+
+from testfixtures import Replacer, compare
+
+from deployfish.core.utils import clear_config_file_cache, load_config_file
+from deployfish.core.utils.config_files import _cache_path
+
+
+class TestLoadConfigFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+        self.filename = os.path.join(self.tmpdir.name, "deployfish.yml")
+        self.write("services:\n  - name: foo\n    count: 1\n")
+        self.replacer = Replacer()
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE_DIR", self.cache_dir)
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE", "true")
+        clear_config_file_cache()
+
+    def tearDown(self):
+        self.replacer.restore()
+        clear_config_file_cache()
+        self.tmpdir.cleanup()
+
+    def write(self, contents, mtime=None):
+        with open(self.filename, "w", encoding="utf-8") as f:
+            f.write(contents)
+        if mtime is not None:
+            os.utime(self.filename, ns=(mtime, mtime))
+
+    def test_parses_yaml(self):
+        compare(load_config_file(self.filename), {"services": [{"name": "foo", "count": 1}]})
+
+    def test_file_is_parsed_once_per_process(self):
+        first = load_config_file(self.filename)
+        self.assertIs(load_config_file(self.filename), first)
+
+    def test_changed_file_is_reparsed(self):
+        load_config_file(self.filename)
+        self.write("services:\n  - name: bar\n    count: 12\n", mtime=1_000_000_000_000_000_000)
+        compare(load_config_file(self.filename), {"services": [{"name": "bar", "count": 12}]})
+
+    def test_parsed_file_is_cached_on_disk(self):
+        load_config_file(self.filename)
+        clear_config_file_cache()
+        with Replacer() as r:
+            r("deployfish.core.utils.config_files.yaml.load", lambda *a, **kw: self.fail("file was re-parsed"))
+            compare(load_config_file(self.filename), {"services": [{"name": "foo", "count": 1}]})
+
+    def test_disk_cache_is_keyed_on_contents(self):
+        load_config_file(self.filename)
+        stat = os.stat(self.filename)
+        # Same size, same mtime, different contents
+        self.write("services:\n  - name: baz\n    count: 2\n", mtime=stat.st_mtime_ns)
+        clear_config_file_cache()
+        compare(load_config_file(self.filename), {"services": [{"name": "baz", "count": 2}]})
+
+    def test_corrupt_disk_cache_is_ignored(self):
+        load_config_file(self.filename)
+        with open(_cache_path(self.cache_dir, os.path.abspath(self.filename)), "wb") as f:
+            f.write(b"not json")
+        clear_config_file_cache()
+        compare(load_config_file(self.filename), {"services": [{"name": "foo", "count": 1}]})
+
+    def test_disk_cache_can_be_disabled(self):
+        self.replacer.in_environ("DEPLOYFISH_CONFIG_CACHE", "false")
+        load_config_file(self.filename)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_cache_entry_records_key(self):
+        load_config_file(self.filename)
+        with open(_cache_path(self.cache_dir, os.path.abspath(self.filename)), encoding="utf-8") as f:
+            entry = json.load(f)
+        compare(entry["key"][1], os.path.abspath(self.filename))
+
+    def test_data_json_cannot_represent_is_not_cached(self):
+        self.write("services:\n  - name: foo\n    since: 2024-01-02\n    ports:\n      80: 8080\n")
+        data = load_config_file(self.filename)
+        self.assertFalse(os.path.exists(_cache_path(self.cache_dir, os.path.abspath(self.filename))))
+        clear_config_file_cache()
+        compare(load_config_file(self.filename), data)
+
+    def test_full_loader_tags_are_accepted(self):
+        self.write("services:\n  - name: foo\n    ports: !!python/tuple [80, 443]\n")
+        compare(load_config_file(self.filename), {"services": [{"name": "foo", "ports": (80, 443)}]})
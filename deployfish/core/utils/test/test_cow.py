@@ -0,0 +1,150 @@
+import json
+import pickle
+import unittest
+from collections.abc import ItemsView, ValuesView
+from copy import copy, deepcopy
+
+from testfixtures import compare
+
+from deployfish.core.utils.cow import CopyOnWriteDict, CopyOnWriteList, cow
+
+
+def make_source():
+    return {
+        "family": "foobar",
+        "containerDefinitions": [
+            {"name": "web", "environment": [{"name": "A", "value": "1"}], "portMappings": []},
+            {"name": "worker", "environment": [{"name": "B", "value": "2"}]},
+        ],
+        "networkConfiguration": {"awsvpcConfiguration": {"subnets": ["b", "a"], "assignPublicIp": "DISABLED"}},
+        "tags": [],
+    }
+
+
+class TestCopyOnWriteDict(unittest.TestCase):
+
+    def setUp(self):
+        self.source = make_source()
+        self.pristine = deepcopy(self.source)
+        self.data = cow(self.source)
+
+    def test_equal_to_source(self):
+        self.assertIsInstance(self.data, CopyOnWriteDict)
+        self.assertTrue(self.data == self.source)
+        compare(json.loads(json.dumps(self.data)), self.pristine)
+
+    def test_reading_does_not_copy_untouched_values(self):
+        self.assertIs(dict.__getitem__(self.data, "containerDefinitions"), self.source["containerDefinitions"])
+        self.data["family"] = "barfoo"
+        self.assertIs(dict.__getitem__(self.data, "containerDefinitions"), self.source["containerDefinitions"])
+
+    def test_top_level_changes_do_not_touch_source(self):
+        self.data["family"] = "barfoo"
+        del self.data["tags"]
+        self.data["new"] = {"x": 1}
+        self.data.update({"networkMode": "awsvpc"})
+        compare(self.source, self.pristine)
+        compare(self.data["family"], "barfoo")
+        compare(self.data["new"], {"x": 1})
+        self.assertNotIn("tags", self.data)
+
+    def test_nested_changes_do_not_touch_source(self):
+        del self.data["networkConfiguration"]["awsvpcConfiguration"]["assignPublicIp"]
+        self.data["networkConfiguration"]["awsvpcConfiguration"]["subnets"].sort()
+        self.data["containerDefinitions"][0]["environment"].append({"name": "C", "value": "3"})
+        for container in self.data["containerDefinitions"]:
+            container["image"] = "foo:1.0"
+        self.data.get("tags").append({"key": "a", "value": "b"})
+        for _, value in self.data.items():
+            if isinstance(value, dict):
+                value["touched"] = True
+        compare(self.source, self.pristine)
+        compare(self.data["networkConfiguration"], {"awsvpcConfiguration": {"subnets": ["a", "b"]}, "touched": True})
+        compare(len(self.data["containerDefinitions"][0]["environment"]), 2)
+        compare([c["image"] for c in self.data["containerDefinitions"]], ["foo:1.0", "foo:1.0"])
+        compare(self.data["tags"], [{"key": "a", "value": "b"}])
+
+    def test_values_we_set_are_not_copied(self):
+        inner = {"a": 1}
+        self.data["inner"] = inner
+        self.data["inner"]["b"] = 2
+        self.assertIs(self.data["inner"], inner)
+        compare(inner, {"a": 1, "b": 2})
+
+    def test_views_of_views(self):
+        other = cow(self.data)
+        other["containerDefinitions"][0]["name"] = "changed"
+        self.data["containerDefinitions"][1]["name"] = "also-changed"
+        compare(self.source, self.pristine)
+        compare(self.data["containerDefinitions"][0]["name"], "web")
+        compare(other["containerDefinitions"][1]["name"], "worker")
+
+    def test_pop_and_setdefault(self):
+        env = self.data["containerDefinitions"].pop(0)["environment"]
+        env[0]["value"] = "changed"
+        self.data.setdefault("volumes", []).append({"name": "v"})
+        self.data.setdefault("family", "nope")
+        compare(self.source, self.pristine)
+        compare(self.data["volumes"], [{"name": "v"}])
+        compare(self.data["family"], "foobar")
+        compare(self.data.pop("missing", None), None)
+
+    def test_deepcopy_and_pickle_give_plain_containers(self):
+        self.data["containerDefinitions"][0]["name"] = "changed"
+        for result in (deepcopy(self.data), pickle.loads(pickle.dumps(self.data))):
+            self.assertIs(type(result), dict)
+            self.assertIs(type(result["containerDefinitions"]), list)
+            self.assertIs(type(result["containerDefinitions"][0]), dict)
+            compare(result["containerDefinitions"][0]["name"], "changed")
+            self.assertIsNot(result["networkConfiguration"], self.source["networkConfiguration"])
+
+    def test_items_and_values_are_views(self):
+        items = self.data.items()
+        values = self.data.values()
+        self.assertIsInstance(items, ItemsView)
+        self.assertIsInstance(values, ValuesView)
+        self.data["new"] = "value"
+        compare(len(items), 5)
+        self.assertIn(("new", "value"), items)
+        self.assertIn("value", values)
+        for value in values:
+            if isinstance(value, list):
+                value.append("touched")
+        compare(self.source, self.pristine)
+
+    def test_reused_ids_are_not_mistaken_for_owned_values(self):
+        self.data["tmp"] = {"x": 1}
+        # Remove it behind our back, as C level code would, so that nothing
+        # but our ownership records could keep it alive
+        dict.__delitem__(self.data, "tmp")
+        shared = {"x": 1}
+        dict.__setitem__(self.data, "shared", shared)
+        self.data["shared"]["y"] = 2
+        compare(shared, {"x": 1})
+
+    def test_shallow_copy_is_also_copy_on_write(self):
+        other = copy(self.data)
+        self.assertIsInstance(other, CopyOnWriteDict)
+        other["networkConfiguration"]["awsvpcConfiguration"]["subnets"] = []
+        compare(self.source, self.pristine)
+
+
+class TestCopyOnWriteList(unittest.TestCase):
+
+    def test_slices_and_concatenation(self):
+        source = [{"a": 1}, {"a": 2}]
+        data = cow(source)
+        self.assertIsInstance(data, CopyOnWriteList)
+        for item in data[:1] + [{"a": 3}]:
+            item["a"] = 0
+        for item in reversed(data):
+            item["b"] = True
+        compare(source, [{"a": 1}, {"a": 2}])
+        compare(data, [{"a": 1, "b": True}, {"a": 2, "b": True}])
+
+    def test_non_containers_are_returned_as_is(self):
+        value = object()
+        compare(cow(value), value)
+        compare(cow("foo"), "foo")
+        data = cow([1, "two", None])
+        compare(list(data), [1, "two", None])
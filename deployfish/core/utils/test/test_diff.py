@@ -0,0 +1,134 @@
+import json
+import random
+import unittest
+
+from jsondiff import diff as jsondiff_diff
+from testfixtures import compare
+
+from deployfish.core.utils.cow import cow
+from deployfish.core.utils.diff import StructuralDiffer, diff, marshal
+
+
+def expected(a, b):
+    return json.loads(jsondiff_diff(a, b, syntax="explicit", dump=True))
+
+
+def random_value(rng, depth=0):
+    r = rng.random()
+    if depth > 3 or r < 0.4:
+        return rng.choice([0, 1, 2, True, None, "a", "b", "$x", 1.5, ""])
+    if r < 0.7:
+        return {
+            rng.choice(["k1", "k2", "k3", "$k", "k5"]): random_value(rng, depth + 1)
+            for _ in range(rng.randint(0, 4))
+        }
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+
+
+def mutate(rng, value):
+    if isinstance(value, dict):
+        value = dict(value)
+        for k in list(value):
+            r = rng.random()
+            if r < 0.2:
+                del value[k]
+            elif r < 0.5:
+                value[k] = mutate(rng, value[k])
+        if rng.random() < 0.3:
+            value[rng.choice(["k1", "k6", "$z"])] = random_value(rng, 2)
+        return value
+    if isinstance(value, list):
+        value = [mutate(rng, v) if rng.random() < 0.3 else v for v in value]
+        if value and rng.random() < 0.3:
+            del value[rng.randrange(len(value))]
+        if rng.random() < 0.3:
+            value.insert(rng.randint(0, len(value)), random_value(rng, 2))
+        return value
+    return random_value(rng, 3) if rng.random() < 0.5 else value
+
+
+class TestStructuralDiffer(unittest.TestCase):
+
+    OLD = {
+        "family": "foobar",
+        "cpu": "256",
+        "containerDefinitions": [
+            {"name": "web", "image": "web:1.0", "environment": {"A": "1", "B": "2"}, "portMappings": [80]},
+            {"name": "worker", "image": "worker:1.0", "environment": {"C": "3"}},
+        ],
+        "tags": [{"key": "Environment", "value": "test"}],
+        "$escaped": "$value",
+    }
+
+    NEW = {
+        "family": "foobar",
+        "cpu": "512",
+        "containerDefinitions": [
+            {
+                "name": "web",
+                "image": "web:1.1",
+                "environment": {"A": "1", "B": "3", "D": "4"},
+                "portMappings": [80, 443],
+            },
+            {"name": "worker", "image": "worker:1.0", "environment": {"C": "3"}},
+            {"name": "sidecar", "image": "sidecar:1.0"},
+        ],
+        "tags": [],
+        "networkMode": "awsvpc",
+    }
+
+    def test_matches_jsondiff(self):
+        for a, b in [
+            (self.OLD, self.NEW),
+            (self.NEW, self.OLD),
+            (self.OLD, self.OLD),
+            ({}, {}),
+            ([], [1, 2]),
+            ([1, 2, 3], []),
+            ("a", "b"),
+            (1, True),
+            ({"a": [1]}, {"a": (1,)}),
+            ({"a": 1}, ["a"]),
+        ]:
+            compare(diff(a, b), expected(a, b))
+
+    def test_matches_jsondiff_on_random_structures(self):
+        rng = random.Random(42)
+        for _ in range(2000):
+            a = random_value(rng)
+            b = mutate(rng, a) if rng.random() < 0.8 else random_value(rng)
+            result = diff(a, b)
+            # compare() ignores key order, and the templates care about it
+            self.assertEqual(json.dumps(result), json.dumps(expected(a, b)), f"a={a!r} b={b!r}")
+
+    def test_copy_on_write_input(self):
+        compare(diff(cow(self.OLD), cow(self.NEW)), expected(self.OLD, self.NEW))
+
+    def test_identical_subtrees_are_not_walked(self):
+        differ = StructuralDiffer()
+        calls = []
+        original = differ._dict_diff
+
+        def counting(a, b):
+            calls.append((a.get("name"), b.get("name")))
+            return original(a, b)
+
+        differ._dict_diff = counting
+        differ.diff(self.OLD, self.NEW)
+        # The "web" containers differ, so we diff them; the "worker"
+        # containers are identical, so we never look inside them
+        self.assertIn(("web", "web"), calls)
+        self.assertNotIn(("worker", "worker"), calls)
+
+    def test_subtree_hash(self):
+        differ = StructuralDiffer()
+        compare(differ.subtree_hash({"a": [1, {"b": 2}]}), differ.subtree_hash({"a": [1, {"b": 2}]}))
+        compare(differ.subtree_hash({"a": 1, "b": 2}), differ.subtree_hash({"b": 2, "a": 1}))
+        self.assertNotEqual(differ.subtree_hash({"a": [1, 2]}), differ.subtree_hash({"a": [2, 1]}))
+        compare(differ.subtree_hash({"a": [set()]}), None)
+
+    def test_marshal(self):
+        compare(
+            marshal({"$a": ("$b", {1: None}), "c": cow({"d": ["$e"]})}),
+            {"$$a": ["$$b", {"1": None}], "c": {"d": ["$$e"]}}
+        )
@@ -0,0 +1,70 @@
+import io
+import json
+import unittest
+
+from testfixtures import compare
+
+from deployfish.core.utils.json_stream import JSONStreamReader
+
+DOCUMENT = {
+    "version": 4,
+    "name": "café ☃ \U0001f600",
+    "escaped": "quote \" brace { bracket ] backslash \\",
+    "numbers": [0, -12, 3.25e10, 123456789012345678901234567890],
+    "literals": [True, False, None],
+    "empty": [{}, [], ""],
+    "nested": {"a": {"b": [{"c": list(range(50))}, {"d": "x" * 300}]}},
+    "outputs": {"foo": {"value": "bar", "type": "string"}},
+}
+
+
+def reader(doc, chunk_size=7):
+    return JSONStreamReader(io.BytesIO(json.dumps(doc, ensure_ascii=False).encode("utf-8")), chunk_size=chunk_size)
+
+
+class TestJSONStreamReader(unittest.TestCase):
+
+    def test_read_whole_document(self):
+        for chunk_size in (1, 2, 7, 64, 1 << 16):
+            compare(reader(DOCUMENT, chunk_size).read(), DOCUMENT)
+
+    def test_iter_object_and_read_each_value(self):
+        for chunk_size in (1, 3, 7, 1 << 16):
+            r = reader(DOCUMENT, chunk_size)
+            result = {}
+            for key in r.iter_object():
+                result[key] = r.read()
+            compare(result, DOCUMENT)
+
+    def test_skip_everything_but_one_key(self):
+        for chunk_size in (1, 3, 7, 1 << 16):
+            r = reader(DOCUMENT, chunk_size)
+            outputs = None
+            for key in r.iter_object():
+                if key == "outputs":
+                    outputs = r.read()
+                else:
+                    r.skip()
+            compare(outputs, DOCUMENT["outputs"])
+
+    def test_iter_array(self):
+        r = reader([1, {"a": [2]}, "three", []], chunk_size=2)
+        values = []
+        for i in r.iter_array():
+            if i == 1:
+                r.skip()
+            else:
+                values.append(r.read())
+        compare(values, [1, "three", []])
+
+    def test_numbers_split_across_chunks_are_not_truncated(self):
+        r = JSONStreamReader(io.BytesIO(b"[1234567, 89]"), chunk_size=3)
+        compare([r.read() for _ in r.iter_array()], [1234567, 89])
+
+    def test_invalid_json_raises(self):
+        with self.assertRaises(ValueError):
+            JSONStreamReader(io.BytesIO(b'{"a": [1, 2'), chunk_size=4).read()
+        with self.assertRaises(ValueError):
+            r = JSONStreamReader(io.BytesIO(b'{"a" 1}'))
+            for _ in r.iter_object():
+                r.skip()
@@ -104,3 +104,9 @@ class SkipConfigProcessing(Exception):
     while processing variable substitutions in deployfish.yml.
     """
 
+
+class StaleCompiledConfig(Exception):
+    """
+    A compiled deployfish.yml artifact no longer matches the files and Terraform
+    state it was compiled from.
+    """
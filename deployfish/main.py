@@ -45,7 +45,8 @@ from .controllers import (
     Tunnels,
 )
 from .core.aws import build_boto3_session
-from .exceptions import DeployfishAppError
+from .core.models.abstract import identity_map
+from .exceptions import ConfigProcessingFailed, DeployfishAppError
 
 # configuration defaults
 CONFIG = init_defaults("deployfish")
@@ -181,8 +182,15 @@ class DeployfishApp(App):
         Lazy load the deployfish.yml file.  We only load it on request
         because most deployfish commands don't need it.
 
+        Items are interpolated lazily, as they are requested; use
+        :py:meth:`deployfish.config.Config.interpolate` if you need everything
+        interpolated up front.
+
+        If we were given ``--compiled-config``, and that compiled config (see
+        ``deploy config compile``) is still up to date, we use it instead.
+
         Returns:
-            The fully interpolated :py:class:`deployfish.config.Config` object.
+            The :py:class:`deployfish.config.Config` object.
 
         """
         # Allow our plugins to modify Config before our import
@@ -199,9 +207,17 @@ class DeployfishApp(App):
                 "filename": self.pargs.deployfish_filename,
                 "env_file": self.pargs.env_file,
                 "tfe_token": self.pargs.tfe_token,
-                "ignore_missing_environment": ignore_missing_environment
+                "ignore_missing_environment": ignore_missing_environment,
+                # Only interpolate the items our command actually asks for
+                "lazy": True
             }
-            self._deployfish_config = Config.new(**config_kwargs)
+            if self.pargs.compiled_config:
+                try:
+                    self._deployfish_config = Config.load_compiled(self.pargs.compiled_config, **config_kwargs)
+                except Config.StaleCompiledConfigError as e:
+                    self.log.warning(f"{e}; loading {self.pargs.deployfish_filename} instead")
+            if not self._deployfish_config:
+                self._deployfish_config = Config.new(**config_kwargs)
             if "proxy" not in self._deployfish_config.get_global_config("ssh"):
                 self._deployfish_config.ssh_provider_type = self.config.get("deployfish", "ssh_provider")
         return self._deployfish_config
@@ -238,7 +254,14 @@ def main():
     with DeployfishApp() as app:
         set_app(app)
         try:
-            app.run()
+            # Load the clusters, container instances etc. that many objects
+            # refer to once per command
+            with identity_map.scope():
+                try:
+                    app.run()
+                finally:
+                    if app.debug is True:
+                        app.log.debug(f"identity map: {identity_map.stats()}")
 
         except AssertionError as e:
             print("AssertionError > %s" % e.args[0])
@@ -252,6 +275,12 @@ def main():
             click.secho(str(ex), fg="red")
             app.exit_code = 1
 
+        except ConfigProcessingFailed as e:
+            # With a lazy config, interpolation errors show up while a command
+            # is running rather than when we load deployfish.yml
+            click.secho(str(e), fg="red")
+            app.exit_code = 1
+
         except DeployfishAppError as e:
             print("DeployfishAppError > %s" % e.args[0])
             app.exit_code = 1
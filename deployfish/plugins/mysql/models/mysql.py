@@ -4,7 +4,15 @@ from collections.abc import Sequence
 from typing import cast
 
 from deployfish.config import get_config
-from deployfish.core.models import Cluster, Instance, Manager, Model, Secret, Service
+from deployfish.core.models import (
+    Cluster,
+    Instance,
+    Manager,
+    Model,
+    Secret,
+    Service,
+    ServiceSecretLookupMixin,
+)
 
 # ----------------------------------------
 # Managers
@@ -29,12 +37,12 @@ class MySQLDatabaseManager(Manager):
         """
         # hint: (str["{name}"])
         config = get_config()
-        section = config.get_section("mysql")
+        # Find our database before interpolating, so we interpolate only it
         databases = {}
-        for data in section:
+        for data in config.get_section_for_lookup("mysql", keys=("name",)):
             databases[data["name"]] = data
         if pk in databases:
-            return MySQLDatabase.new(databases[pk], "deployfish")
+            return MySQLDatabase.new(config.interpolate_item("mysql", databases[pk]), "deployfish")
         raise MySQLDatabase.DoesNotExist(
             f'Could not find an MySQLDatabase config named "{pk}" in deployfish.yml:mysql'
         )
@@ -438,7 +446,7 @@ class MySQLDatabaseManager(Manager):
 # Models
 # ----------------------------------------
 
-class MySQLDatabase(Model):
+class MySQLDatabase(ServiceSecretLookupMixin, Model):
     """
     self.data here has the following structure:
 
@@ -466,17 +474,6 @@ class MySQLDatabase(Model):
     def name(self) -> str:
         return self.data["name"]
 
-    def secret(self, name: str) -> Secret:
-        if "secrets" not in self.cache:
-            self.cache["secrets"] = {}
-        if name not in self.cache["secrets"]:
-            if "." not in name:
-                full_name = f"{self.service.secrets_prefix}{name}"
-            else:
-                full_name = name
-            self.cache["secrets"][name] = Secret.objects.get(full_name)
-        return self.cache["secrets"][name]
-
     def parse(self, key: str) -> str:
         """
         Deployfish supports putting 'config.KEY' as the value for the host and port keys in self.data
@@ -1,5 +1,9 @@
+import csv
 import datetime
-from copy import deepcopy
+import io
+import itertools
+import json
+from collections.abc import Iterable, Iterator
 from textwrap import wrap
 from typing import Any, cast
 
@@ -25,6 +29,10 @@ class TableRenderer(AbstractRenderer):
     DEFAULT_DATE_FORMAT: str = "%Y-%m-%d"
     DEFAULT_FLOAT_PRECISION: int = 2
 
+    #: Honor the ``wrap`` column option.  Renderers whose output is meant for
+    #: other programs turn this off.
+    wrap_values: bool = True
+
     def __init__(
         self,
         columns: dict[str, Any],
@@ -70,6 +78,7 @@ class TableRenderer(AbstractRenderer):
             * ``datatype``:  Cast the value of this column to this datatype.  See "Manually specified datatypes", below.
             * ``wrap``: Wrap the value to the specified number of columns
             * ``length``: Just render the length of the value.  Useful for counting sub-objects
+            * ``width``: The width of the column in a :py:class:`StreamingTableRenderer`
 
 
         Automatcially detected data types:
@@ -115,6 +124,55 @@ class TableRenderer(AbstractRenderer):
         self.ordering: str | None = ordering
         self.tablefmt: str = tablefmt
         self.show_headers: bool = show_headers
+        # Per column: (column, key, render_{column}_value method, sub-columns for "__" keys)
+        self._column_specs: dict[Any, tuple[Any, str, Any, list[Any] | None]] = {}
+        # While we're in render(): id(obj) -> (obj, obj.render_for_display())
+        self._displays: dict[int, tuple[Any, dict[str, Any]]] | None = None
+
+    def column_spec(self, column: dict[str, str] | str) -> tuple[Any, str, Any, list[Any] | None]:
+        """
+        Work out once per column what :py:meth:`render_column` needs to render it: its key, the
+        ``render_{column}_value`` method to use instead, if we have one, and for keys with double underscores
+        in them, the column to use for each sub-object we traverse.
+
+        :param column: the column definition, one of the values of the ``columns`` dict we were constructed with
+
+        :rtype: tuple
+        """
+        spec_key = column if isinstance(column, str) else id(column)
+        spec = self._column_specs.get(spec_key)
+        if spec is not None and spec[0] is column:
+            return spec
+        key = column["key"] if isinstance(column, dict) else column
+        method = getattr(self, f"render_{column}_value", None)
+        hops: list[Any] | None = None
+        if method is None and "__" in key:
+            if isinstance(column, dict):
+                hops = [{**column, "key": ref} for ref in key.split("__")]
+            else:
+                hops = key.split("__")
+        spec = (column, key, method, hops)
+        self._column_specs[spec_key] = spec
+        return spec
+
+    def display_data(self, obj: Any) -> dict[str, Any]:
+        """
+        Return ``obj.render_for_display()``.  While we're rendering a table, we compute this only once per object
+        instead of once per cell, since models can do a fair amount of work to build it.
+
+        :param obj: the data object
+
+        :rtype: dict
+        """
+        if self._displays is None:
+            return obj.render_for_display()
+        try:
+            return self._displays[id(obj)][1]
+        except KeyError:
+            data = obj.render_for_display()
+            # Keep a reference to obj so that its id() can't be reused while we're rendering
+            self._displays[id(obj)] = (obj, data)
+            return data
 
     def get_value(self, obj: Any, column: dict[str, str] | str) -> Any:
         if isinstance(column, dict):
@@ -125,7 +183,7 @@ class TableRenderer(AbstractRenderer):
             return getattr(obj, data_key)
         except AttributeError:
             try:
-                return obj.render_for_display()[data_key]
+                return self.display_data(obj)[data_key]
             except KeyError:
                 pass
             except AttributeError:
@@ -147,7 +205,7 @@ class TableRenderer(AbstractRenderer):
             print("dir(obj):\n")
             pprint(dir(obj))
             print("\nobj.render_for_display():\n")
-            pprint(obj.render_for_display())
+            pprint(self.display_data(obj))
         raise RenderException(
             click.style(
                 f'\n\n{self.__class__.__name__}: Could not dereference "{data_key}"',
@@ -198,7 +256,7 @@ class TableRenderer(AbstractRenderer):
             elif column["datatype"] == "bytes":
                 value = int(value)
                 value = self.human_bytes(value)
-            if "wrap" in column:
+            if "wrap" in column and self.wrap_values:
                 value = str(value)
                 value = "\n".join(wrap(value, cast("int", column["wrap"])))
         return value
@@ -216,42 +274,36 @@ class TableRenderer(AbstractRenderer):
 
         :rtype: str
         """
-        if isinstance(column, dict):
-            key = column["key"]
-        else:
-            key = column
-        if hasattr(self, f"render_{column}_value"):
-            value = getattr(self, f"render_{column}_value")(obj, key, column)
-        else:
-            if "__" in key:
-                refs = key.split("__")
-                ref: str | None = refs.pop(0)
-                while ref:
-                    if isinstance(column, dict):
-                        sub_column = cast("dict[str, Any]", deepcopy(column))
-                        sub_column["key"] = ref
-                        obj = self.get_value(obj, sub_column)
-                    else:
-                        obj = self.get_value(obj, ref)
-                    try:
-                        ref = refs.pop(0)
-                    except IndexError:
-                        ref = None
-                value = obj  # the last one should be the value we're looking for
-                value = self.cast_column(obj, value, column)
-                return value
-            value = self.get_value(obj, column)
-            value = self.cast_column(obj, value, column)
-        return value
+        _, key, method, hops = self.column_spec(column)
+        if method is not None:
+            return method(obj, key, column)
+        if hops is not None:
+            for sub_column in hops:
+                obj = self.get_value(obj, sub_column)
+            # the last one should be the value we're looking for
+            return self.cast_column(obj, obj, column)
+        value = self.get_value(obj, column)
+        return self.cast_column(obj, value, column)
+
+    def render_row(self, obj: Any) -> list[Any]:
+        """
+        Return the values for all our columns for ``obj``, a data object.
+
+        :param obj: the data object
+
+        :rtype: list
+        """
+        return [self.render_column(obj, column) for column in self.columns]
 
     def render(self, data: Any, **_) -> str:
         data = cast("list[Any]", data)
         table = []
-        for obj in data:
-            row = []
-            for column in self.columns:
-                row.append(self.render_column(obj, column))
-            table.append(row)
+        self._displays = {}
+        try:
+            for obj in data:
+                table.append(self.render_row(obj))
+        finally:
+            self._displays = None
         if self.ordering:
             reverse = False
             order_column = self.ordering
@@ -334,3 +386,133 @@ class LBListenerTableRenderer(TableRenderer):
 
     def render_rules_value(self, obj: LoadBalancerListener, key: str, column: dict[str, str] | str) -> str:
         return str(len(obj.rules))
+
+
+# ========================
+# Streaming renderers
+# ========================
+
+class StreamingRenderer(TableRenderer):
+    """
+    Render an iterable of results one line at a time, as we get them, instead of all at once.  Use this for
+    results from :py:meth:`deployfish.core.models.abstract.Manager.iterator`, so that we can start printing before
+    we've loaded everything, and so that we don't need to hold everything in memory.
+
+    Columns are configured just as for :py:class:`TableRenderer`.  Since we never see all the rows at once,
+    ``ordering`` is ignored: rows come out in the order we get them.
+    """
+
+    def render_rows(self, data: Iterable[Any]) -> Iterator[list[Any]]:
+        """
+        Yield the column values for each object in ``data`` as we get it.  We memoize
+        ``render_for_display()`` only for the row we're working on, so our memory use doesn't grow with the number
+        of rows.
+
+        :param data: an iterable of data objects
+
+        :rtype: Iterator[list]
+        """
+        try:
+            for obj in data:
+                self._displays = {}
+                yield self.render_row(obj)
+        finally:
+            self._displays = None
+
+    def render_lines(self, data: Iterable[Any]) -> Iterator[str]:
+        """
+        Yield our output for ``data`` line by line.
+
+        :param data: an iterable of data objects
+
+        :rtype: Iterator[str]
+        """
+        raise NotImplementedError
+
+    def render(self, data: Any, **_) -> str:
+        return "\n".join(self.render_lines(data))
+
+
+class JSONLinesRenderer(StreamingRenderer):
+    """
+    Render each result as a JSON object on its own line, with our column headers as the keys.
+    """
+
+    wrap_values: bool = False
+
+    def render_lines(self, data: Iterable[Any]) -> Iterator[str]:
+        for row in self.render_rows(data):
+            yield json.dumps(dict(zip(self.headers, row)), default=str)
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    Render our results as CSV, with a header row first if ``show_headers`` is ``True``.
+    """
+
+    wrap_values: bool = False
+
+    def render_lines(self, data: Iterable[Any]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="")
+        rows: Iterable[list[Any]] = self.render_rows(data)
+        if self.show_headers:
+            rows = itertools.chain([self.headers], rows)
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+class StreamingTableRenderer(StreamingRenderer):
+    """
+    Render our results as a plain text table, like ``tabulate``'s "simple" format, but line by line.
+
+    Since we can't look at every row before we print the first one, column widths come either from the ``width``
+    option in the column definition::
+
+        {
+            'Name': {'key': 'name', 'width': 30}
+        }
+
+    or from the widest value in the first ``sample_size`` rows.  Values too wide for their column are truncated.
+    """
+
+    wrap_values: bool = False
+
+    def __init__(self, columns: dict[str, Any], sample_size: int = 50, **kwargs):
+        """
+        :param columns dict(str, str): a dict that determines the structure of the table.  See
+                                       :py:class:`TableRenderer`
+        :param sample_size int: work out the widths of columns without a ``width`` from this many rows
+        """
+        super().__init__(columns, **kwargs)
+        self.sample_size: int = sample_size
+
+    def format_row(self, row: list[Any], widths: list[int]) -> str:
+        cells = []
+        for value, width in zip(row, widths):
+            value = " ".join(str(value).splitlines())
+            if len(value) > width:
+                value = value[:width - 1] + "…"
+            cells.append(value.ljust(width))
+        return "  ".join(cells).rstrip()
+
+    def render_lines(self, data: Iterable[Any]) -> Iterator[str]:
+        rows = self.render_rows(data)
+        sample = [
+            [" ".join(str(value).splitlines()) for value in row]
+            for row in itertools.islice(rows, self.sample_size)
+        ]
+        widths = []
+        for i, column in enumerate(self.columns):
+            if isinstance(column, dict) and "width" in column:
+                widths.append(int(column["width"]))
+            else:
+                widths.append(max([len(self.headers[i])] + [len(row[i]) for row in sample]))
+        if self.show_headers:
+            yield self.format_row(self.headers, widths)
+            yield "  ".join("-" * width for width in widths)
+        for row in itertools.chain(sample, rows):
+            yield self.format_row(row, widths)
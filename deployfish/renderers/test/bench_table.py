@@ -0,0 +1,97 @@
+"""
+Benchmark :py:meth:`deployfish.renderers.table.TableRenderer.render` on large
+lists of :py:class:`deployfish.core.models.ecs.TaskDefinition` objects, with
+``render_for_display()`` computed once per object and each column's spec
+worked out once, against the old way of computing ``render_for_display()``
+for every cell that needs it and deep copying the column definition for every
+hop of a ``__`` key.
+
+Run it like so::
+
+    python -m deployfish.renderers.test.bench_table
+
+We render ``--count`` task definitions with ``--containers`` containers each
+through a table whose columns mix attributes, ``render_for_display()`` keys
+and ``__`` keys into nested data, the way our list commands do.
+"""
+from copy import deepcopy
+from typing import Any
+
+from deployfish.core.models.ecs import ContainerDefinition, TaskDefinition
+from deployfish.core.utils.test.benchmark import best_of, make_parser
+from deployfish.renderers.table import TableRenderer
+
+COLUMNS: dict[str, Any] = {
+    "Family": "family",
+    "Revision": "revision",
+    "Network": "networkMode",
+    "CPU": {"key": "cpu", "default": ""},
+    "Memory": {"key": "memory", "default": ""},
+    "Arch": {"key": "runtimePlatform__cpuArchitecture", "default": ""},
+    "OS": {"key": "runtimePlatform__operatingSystemFamily", "default": ""},
+    "Role": {"key": "executionRoleArn", "wrap": 40},
+    "Containers": {"key": "containers", "length": True},
+}
+
+
+class UncachedTableRenderer(TableRenderer):
+    """
+    The old behaviour: no memoized ``render_for_display()``, and the column
+    spec worked out, with a deep copy per ``__`` hop, for every cell.
+    """
+
+    def column_spec(self, column):
+        spec = super().column_spec(column)
+        self._column_specs.clear()
+        if spec[3] is not None and isinstance(column, dict):
+            return (spec[0], spec[1], spec[2], [deepcopy(hop) for hop in spec[3]])
+        return spec
+
+    def display_data(self, obj):
+        return obj.render_for_display()
+
+
+def make_task_definitions(count: int, containers: int) -> list[TaskDefinition]:
+    return [
+        TaskDefinition(
+            {
+                "family": f"bench-{i}",
+                "revision": i % 20 + 1,
+                "networkMode": "awsvpc",
+                "cpu": "256",
+                "memory": "512",
+                "runtimePlatform": {"cpuArchitecture": "ARM64", "operatingSystemFamily": "LINUX"},
+                "executionRoleArn": "arn:aws:iam::123456789012:role/bench-execution",
+                "requiresCompatibilities": ["FARGATE"],
+            },
+            containers=[
+                ContainerDefinition({
+                    "name": f"container-{c}",
+                    "image": f"123456789012.dkr.ecr.us-west-2.amazonaws.com/bench-{c}:1.0.0",
+                    "environment": [{"name": f"VAR_{e}", "value": str(e)} for e in range(20)],
+                    "portMappings": [{"containerPort": 8000, "protocol": "tcp"}],
+                })
+                for c in range(containers)
+            ]
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = make_parser(__doc__, repeat=3)
+    parser.add_argument("--count", type=int, default=2000, help="Task definitions to render")
+    parser.add_argument("--containers", type=int, default=3, help="Containers per task definition")
+    args = parser.parse_args()
+    data = make_task_definitions(args.count, args.containers)
+    old_renderer = UncachedTableRenderer(COLUMNS)
+    new_renderer = TableRenderer(COLUMNS)
+    assert old_renderer.render(data) == new_renderer.render(data)
+    old = best_of(lambda: old_renderer.render(data), args.repeat)
+    new = best_of(lambda: new_renderer.render(data), args.repeat)
+    print(f"{'':>8} {'uncached ms':>12} {'memoized ms':>12} {'speedup':>8}")
+    print(f"{args.count:>8} {old:12.1f} {new:12.1f} {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import Mock
+
+from testfixtures import compare
+
+from deployfish.renderers.table import (
+    CSVRenderer,
+    JSONLinesRenderer,
+    StreamingTableRenderer,
+    TableRenderer,
+)
+
+
+class Thing:
+
+    def __init__(self, name, data, owner=None):
+        self.name = name
+        self.owner = owner
+        self.render_for_display = Mock(return_value=data)
+
+
+class TestTableRenderer_render(unittest.TestCase):
+
+    def setUp(self):
+        self.owner = Thing("owner", {"Email": "owner@example.com"})
+        self.things = [
+            Thing("a", {"Status": "ACTIVE", "Count": 1.5}, owner=self.owner),
+            Thing("b", {"Status": "DRAINING", "Count": 2.0}, owner=self.owner),
+        ]
+        self.renderer = TableRenderer({
+            "Name": "name",
+            "Status": "Status",
+            "Count": {"key": "Count"},
+            "Owner": "owner__Email",
+            "Missing": {"key": "owner__Nope", "default": "-"},
+        }, show_headers=False, tablefmt="plain")
+
+    def test_values(self):
+        compare(
+            [[self.renderer.render_column(t, c) for c in self.renderer.columns] for t in self.things],
+            [
+                ["a", "ACTIVE", "1.50", "owner@example.com", "-"],
+                ["b", "DRAINING", "2.00", "owner@example.com", "-"],
+            ]
+        )
+
+    def test_render_for_display_once_per_object(self):
+        self.renderer.render(self.things)
+        for obj in self.things + [self.owner]:
+            obj.render_for_display.assert_called_once_with()
+        # ... and only for the duration of the render
+        self.renderer.render(self.things)
+        compare(self.owner.render_for_display.call_count, 2)
+        self.assertIsNone(self.renderer._displays)
+
+    def test_render_value_method(self):
+        class Renderer(TableRenderer):
+            def render_name_value(self, obj, key, column):
+                return obj.name.upper()
+
+        compare(Renderer({"Name": "name"}, show_headers=False, tablefmt="plain").render(self.things), "A\nB")
+
+
+class TestStreamingRenderers(unittest.TestCase):
+
+    COLUMNS = {
+        "Name": "name",
+        "Status": {"key": "Status", "wrap": 4},
+    }
+
+    def things(self, count):
+        for i in range(count):
+            yield Thing(f"thing-{i}", {"Status": "ACTIVE" if i % 2 else "DRAINING"})
+
+    def test_jsonl_is_lazy(self):
+        data = self.things(1000)
+        lines = JSONLinesRenderer(self.COLUMNS).render_lines(data)
+        compare(next(lines), '{"Name": "thing-0", "Status": "DRAINING"}')
+        compare(len(list(data)), 999)
+
+    def test_csv(self):
+        compare(
+            CSVRenderer(self.COLUMNS).render(self.things(2)),
+            "Name,Status\nthing-0,DRAINING\nthing-1,ACTIVE"
+        )
+
+    def test_table_stream_sampled_widths(self):
+        lines = list(StreamingTableRenderer(self.COLUMNS, sample_size=2).render_lines(self.things(11)))
+        compare(lines[:4], [
+            "Name     Status",
+            "-------  --------",
+            "thing-0  DRAINING",
+            "thing-1  ACTIVE",
+        ])
+        compare(lines[-1], "thing-…  DRAINING")
+
+    def test_table_stream_fixed_widths(self):
+        columns = {"Name": {"key": "name", "width": 3}, "Status": {"key": "Status", "width": 10}}
+        renderer = StreamingTableRenderer(columns, show_headers=False)
+        compare(list(renderer.render_lines(self.things(1))), ["th…  DRAINING"])
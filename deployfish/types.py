@@ -28,6 +28,8 @@ if TYPE_CHECKING:
 
 class SupportsSSH(Protocol):
 
+    __slots__ = ()
+
     @property
     def ssh_targets(self) -> Sequence["Instance"]:
         ...
@@ -42,6 +44,8 @@ class SupportsSSH(Protocol):
 
 class SupportsTunnel(Protocol):
 
+    __slots__ = ()
+
     @property
     def tunnel_targets(self) -> Sequence["Instance"]:
         ...
@@ -70,6 +74,8 @@ class SupportsNetworking(SupportsSSH, SupportsTunnel, Protocol):
 
 class SupportsCache(Protocol):
 
+    __slots__ = ()
+
     cache: dict[str, Any]
 
     def get_cached(
@@ -83,6 +89,8 @@ class SupportsCache(Protocol):
 
 class SupportsSecrets(Protocol):
 
+    __slots__ = ()
+
     @property
     def secrets(self) -> dict[str, "Secret"]:
         ...
@@ -94,7 +102,7 @@ class SupportsSecrets(Protocol):
     def reload_secrets(self) -> None:
         ...
 
-    def write_secrets(self) -> None:
+    def write_secrets(self, live: Sequence["Secret"] | None = None) -> dict[str, int]:
         ...
 
     def diff_secrets(self, other: Sequence["Secret"], ignore_external: bool = False) -> dict[str, Any]:
@@ -103,6 +111,8 @@ class SupportsSecrets(Protocol):
 
 class SupportsModel(Protocol):
 
+    __slots__ = ()
+
     objects: "Manager"
     config_section: str
     data: dict[str, Any]
@@ -147,6 +157,8 @@ class SupportsService(
     Protocol
 ):
 
+    __slots__ = ()
+
     @property
     def exec_enabled(self) -> bool:
         ...